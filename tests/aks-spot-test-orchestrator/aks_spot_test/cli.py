@@ -16,25 +16,47 @@ DEFAULT_CONFIG = {
         "terratest": {
             "enabled": True,
             "timeout_minutes": 10,
-            "working_dir": "../"
+            "working_dir": "../",
+            "resources": ["terraform-modules"]
         },
         "bash": {
             "enabled": True,
             "timeout_minutes": 20,
-            "working_dir": "../spot-behavior"
+            "working_dir": "../spot-behavior",
+            "max_parallel_categories": 3,
+            "resources": ["cluster-workloads"]
         },
         "python": {
             "enabled": True,
             "timeout_minutes": 20,
             "working_dir": "../spot-behavior-python",
-            "venv_path": "venv"
+            "mode": "worker",
+            "venv_path": "venv",
+            "venv_cache_dir": "~/.cache/aks-spot-test/venvs",
+            "venv_cache_size": 3,
+            "resources": ["cluster-workloads"]
         }
     },
+    "execution": {
+        "parallel_suites": True,
+        "max_parallel_suites": 3
+    },
     "remediation": {
         "enabled": True,
+        "dry_run": False,
+        "max_workers": 4,
+        "rate_per_second": 2.0,
+        "burst": 5,
+        "retries": 2,
+        "continuous": {
+            "enabled": False,
+            "vmss_interval_seconds": 300
+        },
         "vmss_ghosts": {
             "enabled": True,
-            "min_age_minutes": 5
+            "min_age_minutes": 5,
+            "batch_size": 20,
+            "max_unregistered_fraction": 0.5
         },
         "stuck_nodes": {
             "enabled": True,
@@ -44,13 +66,32 @@ DEFAULT_CONFIG = {
     "monitoring": {
         "eviction_rate": {
             "enabled": True,
+            "mode": "watch",
             "poll_interval_seconds": 30
+        },
+        "snapshots": {
+            "enabled": True,
+            "interval_seconds": 15,
+            "sync_timeout_seconds": 60
         }
     },
     "reports": {
         "output_dir": "./reports",
         "formats": ["json", "html", "markdown"],
-        "retention_days": 30
+        "json_mode": "pretty",
+        "retention_days": 30,
+        "trends": {
+            "enabled": True,
+            "window_runs": 30
+        }
+    },
+    "tracing": {
+        "enabled": False
+    },
+    "metrics": {
+        "enabled": False,
+        "host": "127.0.0.1",
+        "port": 9464
     }
 }
 
@@ -68,7 +109,10 @@ def cli():
 @click.option('--skip-terratest', is_flag=True, help='Skip Terratest suite')
 @click.option('--skip-bash', is_flag=True, help='Skip Bash test suite')
 @click.option('--skip-python', is_flag=True, help='Skip Python test suite')
-def run(config, no_remediate, skip_terratest, skip_bash, skip_python):
+@click.option('--trace', is_flag=True, help='Record a Chrome/Perfetto trace of the run')
+@click.option('--sequential', is_flag=True, help='Run test suites one after another')
+@click.option('--metrics-port', type=int, help='Serve Prometheus metrics on this port during the run')
+def run(config, no_remediate, skip_terratest, skip_bash, skip_python, trace, sequential, metrics_port):
     """Run all tests and generate reports."""
     # Load config
     cfg = DEFAULT_CONFIG.copy()
@@ -86,6 +130,12 @@ def run(config, no_remediate, skip_terratest, skip_bash, skip_python):
         cfg['test_suites']['bash']['enabled'] = False
     if skip_python:
         cfg['test_suites']['python']['enabled'] = False
+    if trace:
+        cfg['tracing']['enabled'] = True
+    if sequential:
+        cfg['execution']['parallel_suites'] = False
+    if metrics_port:
+        cfg['metrics'].update(enabled=True, port=metrics_port)
 
     # Run orchestrator
     orchestrator = TestOrchestrator(cfg)
@@ -96,81 +146,162 @@ def run(config, no_remediate, skip_terratest, skip_bash, skip_python):
 
 
 @cli.command()
-@click.argument('json_file', type=click.Path(exists=True))
-def report(json_file):
-    """Regenerate report from existing JSON file."""
-    import json
-    from .models import TestReport
-    from .reporters import html_reporter, markdown_reporter
-
-    # Load JSON report
-    with open(json_file) as f:
-        data = json.load(f)
-
-    # Reconstruct report (simplified - just regenerate formats)
-    print(f"Regenerating reports from {json_file}...")
-
-    # Generate HTML
-    html_path = json_file.replace('.json', '.html')
-    # Note: This would need proper deserialization, skipping for now
-    print(f"✅ HTML report: {html_path}")
-
-    # Generate Markdown
-    md_path = json_file.replace('.json', '.md')
-    print(f"✅ Markdown report: {md_path}")
+@click.argument('json_files', nargs=-1, required=True, type=click.Path(exists=True))
+@click.option('--merge', is_flag=True, help='Merge all given reports into one (e.g. one run per cluster)')
+@click.option('--output-dir', type=click.Path(), help='Directory for regenerated reports (default: next to each input)')
+@click.option('--format', 'formats', multiple=True, type=click.Choice(['html', 'markdown', 'json']),
+              help='Formats to write (default: html and markdown; merged reports also get json)')
+def report(json_files, merge, output_dir, formats):
+    """Regenerate reports from existing JSON/NDJSON report files."""
+    from datetime import datetime
+    from .loader import load_report, merge_reports
+    from .reporters import html_reporter, json_reporter, markdown_reporter
+    from .reporters import view as report_view
+
+    generators = {"json": (json_reporter.generate_report, "json", "JSON"),
+                  "html": (html_reporter.generate_report, "html", "HTML"),
+                  "markdown": (markdown_reporter.generate_report, "md", "Markdown")}
+
+    def render(rep, stem: str, wanted):
+        outputs = {name: (generators[name][0], f"{stem}.{generators[name][1]}") for name in wanted}
+        view = report_view.build_view(rep)
+        for name, path in report_view.write_reports(view, outputs).items():
+            print(f"✅ {generators[name][2]} report: {path}")
+
+    if merge:
+        print(f"Merging {len(json_files)} reports...")
+        merged = merge_reports([load_report(path) for path in json_files])
+        directory = output_dir or os.path.dirname(os.path.abspath(json_files[0]))
+        os.makedirs(directory, exist_ok=True)
+        stem = os.path.join(directory, f"test-report-merged-{datetime.now().strftime('%Y-%m-%d-%H%M%S')}")
+        print(f"  {merged.total_tests} tests from {merged.cluster_name}")
+        render(merged, stem, formats or ("json", "html", "markdown"))
+        return
+
+    for json_file in json_files:
+        print(f"Regenerating reports from {json_file}...")
+        rep = load_report(json_file)
+        stem = os.path.splitext(json_file)[0]
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            stem = os.path.join(output_dir, os.path.basename(stem))
+        # Never overwrite the input with a re-encoded copy
+        wanted = [name for name in formats or ("html", "markdown")
+                  if os.path.abspath(f"{stem}.{generators[name][1]}") != os.path.abspath(json_file)]
+        render(rep, stem, wanted)
 
 
 @cli.command()
-def remediate():
+@click.option('--plan', 'plan_only', is_flag=True, help='Print the remediation plan without executing it')
+@click.option('--min-age-minutes', default=5, help='Only act on ghosts/orphans/stuck nodes older than this')
+@click.option('--max-workers', default=4, help='Actions executed concurrently')
+@click.option('--rate', default=2.0, help='Commands started per second (token bucket rate)')
+@click.option('--burst', default=5, help='Commands that may start at once before the rate applies')
+@click.option('--retries', default=2, help='Retries per action after a failure')
+@click.option('--watch', is_flag=True, help='Run continuously: watch nodes, remediate as they pass the minimum age')
+@click.option('--vmss-interval', default=300, help='Seconds between VMSS reconciles in --watch mode')
+def remediate(plan_only, min_age_minutes, max_workers, rate, burst, retries, watch, vmss_interval):
     """Run auto-remediation only (no tests)."""
-    from .remediators import vmss_ghost, stuck_nodes
-
-    print("Running auto-remediation...")
+    from . import metrics
+    from .remediators import planner, vmss_ghost, stuck_nodes
 
     # Get cluster config from environment
     resource_group = os.environ.get("RESOURCE_GROUP", "rg-aks-spot")
     cluster_name = os.environ.get("CLUSTER_NAME", "aks-spot-prod")
     location = os.environ.get("LOCATION", "australiaeast")
 
+    if watch:
+        from .remediators.controller import RemediationController
+
+        def report_action(action):
+            metrics.record_remediation(action)
+            status = "📝" if action.dry_run else ("✅" if action.success else "❌")
+            print(f"  {status} {action.timestamp.strftime('%H:%M:%S')} {action.action_type} {action.target} "
+                  f"({action.duration_seconds:.1f}s, {action.attempts} attempt(s)) {action.details}")
+
+        print(f"Remediation controller running (min age {min_age_minutes}m, "
+              f"VMSS reconcile every {vmss_interval}s{', plan only' if plan_only else ''})")
+        print("Press Ctrl+C to stop\n")
+        ctl = RemediationController(
+            resource_group, cluster_name, location,
+            min_age_minutes=min_age_minutes, vmss_min_age_minutes=min_age_minutes,
+            vmss_interval=vmss_interval, max_workers=max_workers, rate_per_second=rate,
+            burst=burst, retries=retries, dry_run=plan_only, on_action=report_action
+        )
+        ctl.run()
+        print(f"\nStopping controller ({ctl.total_actions} action(s), {ctl.stats['timers_fired']} timer(s) fired, "
+              f"{ctl.stats['vmss_reconciles']} VMSS reconcile(s))")
+        return
+
+    print("Planning auto-remediation...")
+
     # VMSS ghosts
-    print("  Detecting VMSS ghost instances...")
-    ghost_actions = vmss_ghost.detect_and_remediate(resource_group, cluster_name, location, 5)
-    print(f"  ✅ VMSS ghosts: {len(ghost_actions)} instances processed")
+    print("  Detecting VMSS ghost and orphan instances...")
+    ghost_plan = vmss_ghost.plan_actions(resource_group, cluster_name, location, min_age_minutes)
 
     # Stuck nodes
     print("  Detecting stuck nodes...")
-    node_actions = stuck_nodes.detect_and_remediate(5)
-    print(f"  ✅ Stuck nodes: {len(node_actions)} nodes processed")
+    node_plan = stuck_nodes.plan_actions(min_age_minutes)
 
-    total_success = sum(1 for a in ghost_actions + node_actions if a.success)
-    total_actions = len(ghost_actions + node_actions)
-    print(f"\n✅ Remediation complete: {total_success}/{total_actions} actions successful")
+    plan = planner.build_plan(ghost_plan, node_plan)
+    print(planner.format_plan(plan))
+    if plan_only or not plan:
+        return
+
+    print(f"\nExecuting {len(plan)} action(s) ({max_workers} workers, {rate}/s)...")
+    actions = planner.execute(plan, max_workers=max_workers, rate_per_second=rate, burst=burst, retries=retries)
+    for action in actions:
+        metrics.record_remediation(action)
+        status = "✅" if action.success else "❌"
+        print(f"  {status} {action.action_type} {action.target} "
+              f"({action.duration_seconds:.1f}s, {action.attempts} attempt(s)) {action.details}")
+
+    total_success = sum(1 for a in actions if a.success)
+    print(f"\n✅ Remediation complete: {total_success}/{len(actions)} actions successful")
 
 
 @cli.command()
-@click.option('--interval', default=60, help='Poll interval in seconds')
-def monitor(interval):
+@click.option('--reports-dir', default='./reports', type=click.Path(), help='Directory with test-report-* files')
+@click.option('--retention-days', default=0, help='Compact runs older than this into the index (0 = keep all)')
+@click.option('--window', default=30, help='Runs covered by the trend report')
+@click.option('--output', type=click.Path(), help='Trend report path (default: <reports-dir>/trends.md)')
+def trends(reports_dir, retention_days, window, output):
+    """Update the cross-run trend index and write the trend report."""
+    from . import trends as trend_index
+
+    if not os.path.isdir(reports_dir):
+        print(f"❌ Reports directory not found: {reports_dir}")
+        sys.exit(2)
+    stats = trend_index.refresh(reports_dir, retention_days, window, output)
+    print(f"✅ {stats['runs']} runs, {stats['tests']} tests indexed "
+          f"({stats['added']} new, {stats['compacted']} compacted)")
+    print(f"✅ Trend report: {output or os.path.join(reports_dir, 'trends.md')}")
+
+
+@cli.command()
+@click.option('--interval', default=60, help='Report interval in seconds (also the poll interval in poll mode)')
+@click.option('--mode', type=click.Choice(['watch', 'poll']), default='watch',
+              help='Follow a watch on Node events, or poll all events')
+@click.option('--status-file', default='', help='Write rates, stats and recent events as JSON every interval')
+@click.option('--max-events', default=1000, help='Recent eviction events kept in memory')
+@click.option('--metrics-port', type=int, help='Serve Prometheus metrics on this port')
+@click.option('--metrics-host', default='127.0.0.1', help='Address for the metrics endpoint')
+def monitor(interval, mode, status_file, max_events, metrics_port, metrics_host):
     """Monitor eviction rate continuously (Ctrl+C to stop)."""
+    from . import metrics
+    from .monitors.daemon import MonitorDaemon
     from .monitors.eviction_rate import EvictionMonitor
-    import time
 
-    print(f"Monitoring spot evictions (polling every {interval}s)...")
-    print("Press Ctrl+C to stop\n")
+    if metrics_port:
+        metrics.serve(metrics_port, metrics_host)
+        print(f"Metrics on http://{metrics_host}:{metrics_port}/metrics")
 
-    mon = EvictionMonitor(poll_interval=interval)
-    mon.start()
-
-    try:
-        while True:
-            time.sleep(interval)
-            events, rate = mon.stop()
-            mon = EvictionMonitor(poll_interval=interval)
-            mon.start()
+    print(f"Monitoring spot evictions ({mode} mode, reporting every {interval}s)...")
+    print("Press Ctrl+C to stop\n")
 
-            print(f"Eviction rate: {rate:.1f}/hour ({len(events)} events)")
-    except KeyboardInterrupt:
-        print("\nStopping monitor...")
-        mon.stop()
+    mon = EvictionMonitor(poll_interval=interval, mode=mode, max_events=max_events)
+    MonitorDaemon(mon, interval, status_file, capture_snapshots=bool(metrics_port)).run()
+    print("\nStopping monitor...")
 
 
 def _deep_merge(base: dict, update: dict):
@@ -0,0 +1,280 @@
+"""Typed loading of JSON/NDJSON reports back into the models.
+
+``load_report`` rebuilds a TestReport, with its TestResult, ClusterSnapshot
+and RemediationAction objects, from either layout json_reporter writes:
+
+    .json     one document (pretty or compact), parsed whole with json.load
+    .ndjson   a report header line, then one test_result line per result,
+              read line by line
+
+Only NDJSON is memory-bounded, and only through ``iter_results``: it keeps
+one result's dict alive at a time however large the run. A .json report is
+always parsed in full, and ``load_report`` holds every TestResult of either
+layout in memory.
+
+Unknown keys are ignored, and missing ones fall back to the dataclass
+defaults. Reports written by older versions therefore still load.
+``merge_reports`` combines several runs, e.g. one per cluster, into one
+report that the reporters can render like any other.
+"""
+
+import bisect
+import dataclasses
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+from .models import Assertion, ClusterSnapshot, RemediationAction, TestReport, TestResult
+from .monitors.snapshot_recorder import FIELDS as TIMELINE_FIELDS
+
+_ASSERTION_KEYS = {"description", "expected", "actual", "passed"}
+
+
+def _datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def result_from_dict(data: Dict[str, Any]) -> TestResult:
+    return TestResult(
+        test_id=data.get("test_id", ""),
+        name=data.get("name", ""),
+        category=data.get("category", ""),
+        framework=data.get("framework", ""),
+        status=data.get("status", ""),
+        duration_seconds=data.get("duration_seconds", 0.0),
+        error_message=data.get("error_message"),
+        assertions=[Assertion(**a) if isinstance(a, dict) and set(a) == _ASSERTION_KEYS else a
+                    for a in data.get("assertions") or []],
+        evidence=data.get("evidence") or {},
+        reproduce_commands=data.get("reproduce_commands") or []
+    )
+
+
+def snapshot_from_dict(data: Optional[Dict[str, Any]]) -> Optional[ClusterSnapshot]:
+    if not data:
+        return None
+    return ClusterSnapshot(
+        timestamp=_datetime(data.get("timestamp")),
+        total_nodes=data.get("total_nodes", 0),
+        ready_nodes=data.get("ready_nodes", 0),
+        spot_nodes=data.get("spot_nodes", 0),
+        total_pods=data.get("total_pods", 0),
+        pending_pods=data.get("pending_pods", 0),
+        node_pool_counts=data.get("node_pool_counts") or {}
+    )
+
+
+def action_from_dict(data: Dict[str, Any]) -> RemediationAction:
+    return RemediationAction(
+        timestamp=_datetime(data.get("timestamp")),
+        action_type=data.get("action_type", ""),
+        target=data.get("target", ""),
+        success=data.get("success", False),
+        details=data.get("details", ""),
+        duration_seconds=data.get("duration_seconds", 0.0),
+        attempts=data.get("attempts", 0),
+        dry_run=data.get("dry_run", False)
+    )
+
+
+def report_from_dict(data: Dict[str, Any], results: Optional[List[TestResult]] = None) -> TestReport:
+    """Build a TestReport; results, if given, replace data["test_results"]."""
+    report = TestReport(
+        run_id=data.get("run_id") or str(uuid.uuid4()),
+        timestamp=_datetime(data.get("timestamp")) or datetime.now(),
+        cluster_name=data.get("cluster_name", ""),
+        duration_seconds=data.get("duration_seconds", 0.0),
+        total_tests=data.get("total_tests", 0),
+        passed=data.get("passed", 0),
+        failed=data.get("failed", 0),
+        skipped=data.get("skipped", 0),
+        pass_rate=data.get("pass_rate", 0.0),
+        framework_summary=data.get("framework_summary") or {},
+        category_summary=data.get("category_summary") or {},
+        suite_stats=data.get("suite_stats") or {},
+        initial_state=snapshot_from_dict(data.get("initial_state")),
+        final_state=snapshot_from_dict(data.get("final_state")),
+        eviction_events=data.get("eviction_events") or [],
+        eviction_rate_per_hour=data.get("eviction_rate_per_hour", 0.0),
+        monitor_stats=data.get("monitor_stats") or {},
+        cluster_timeline=data.get("cluster_timeline") or {},
+        remediation_actions=[action_from_dict(a) for a in data.get("remediation_actions") or []],
+        top_failures=[result_from_dict(r) for r in data.get("top_failures") or []],
+        failure_patterns=data.get("failure_patterns") or {}
+    )
+    if results is None:
+        results = [result_from_dict(r) for r in data.get("test_results") or []]
+    report.test_results = results
+    return report
+
+
+def is_ndjson(path: str) -> bool:
+    if path.endswith(".ndjson"):
+        return True
+    with open(path) as f:
+        first = f.readline()
+    # A document's first line is "{" (pretty) or the whole report (compact)
+    return first.startswith('{"record":')
+
+
+def iter_ndjson(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield each record of an NDJSON report."""
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_report(path: str) -> TestReport:
+    """Load a JSON or NDJSON report written by json_reporter."""
+    if not is_ndjson(path):
+        with open(path) as f:
+            return report_from_dict(json.load(f))
+
+    header: Dict[str, Any] = {}
+    results: List[TestResult] = []
+    for record in iter_ndjson(path):
+        kind = record.pop("record", "")
+        if kind == "report":
+            header = record
+        elif kind == "test_result":
+            results.append(result_from_dict(record))
+    return report_from_dict(header, results)
+
+
+def iter_results(path: str) -> Iterator[TestResult]:
+    """Yield a report's test results.
+
+    NDJSON reports are streamed; a .json report is loaded whole first.
+    """
+    if is_ndjson(path):
+        for record in iter_ndjson(path):
+            if record.pop("record", "") == "test_result":
+                yield result_from_dict(record)
+    else:
+        yield from load_report(path).test_results
+
+
+def _sum_snapshots(snapshots: List[ClusterSnapshot]) -> Optional[ClusterSnapshot]:
+    if not snapshots:
+        return None
+    pools: Dict[str, int] = {}
+    for snapshot in snapshots:
+        for pool, count in snapshot.node_pool_counts.items():
+            pools[pool] = pools.get(pool, 0) + count
+    return ClusterSnapshot(
+        timestamp=min(s.timestamp for s in snapshots),
+        total_nodes=sum(s.total_nodes for s in snapshots),
+        ready_nodes=sum(s.ready_nodes for s in snapshots),
+        spot_nodes=sum(s.spot_nodes for s in snapshots),
+        total_pods=sum(s.total_pods for s in snapshots),
+        pending_pods=sum(s.pending_pods for s in snapshots),
+        node_pool_counts=pools
+    )
+
+
+# Monitor counters that add up across runs
+_MONITOR_COUNTERS = ("api_requests", "objects_received", "missed_updates", "evictions",
+                     "list_pages", "watch_connections", "relists", "bookmarks", "errors")
+
+
+def _merge_monitor_stats(reports: List[TestReport]) -> Dict:
+    """Sum the monitors' counters; lags are the worst run's, per-run stats are kept."""
+    per_run = {f"{r.cluster_name}/{r.run_id}": r.monitor_stats for r in reports if r.monitor_stats}
+    if not per_run:
+        return {}
+    stats_list = list(per_run.values())
+    merged: Dict[str, Any] = {
+        "mode": ", ".join(dict.fromkeys(s.get("mode", "?") for s in stats_list)),
+        "median_lag_seconds": max(s.get("median_lag_seconds", 0.0) for s in stats_list),
+        "max_lag_seconds": max(s.get("max_lag_seconds", 0.0) for s in stats_list),
+    }
+    for key in _MONITOR_COUNTERS:
+        if any(key in s for s in stats_list):
+            merged[key] = sum(s.get(key, 0) for s in stats_list)
+    merged["runs"] = per_run
+    return merged
+
+
+def _value_at(times: List[float], values: List[int], ts: float) -> int:
+    """Step-function value of a series at ts (0 before its first sample)."""
+    i = bisect.bisect_right(times, ts)
+    return values[i - 1] if i else 0
+
+
+def _merge_timelines(reports: List[TestReport], start: datetime) -> Dict:
+    """Sum the runs' timelines on a common clock starting at start.
+
+    Each run's series is aligned by its report timestamp and held at its last
+    sample between samples, so the merged series at any time is the sum of
+    every cluster's latest known value.
+    """
+    sources = []
+    for report in reports:
+        timeline = report.cluster_timeline
+        if timeline.get("t"):
+            offset = report.timestamp.timestamp() - start.timestamp()
+            sources.append(([offset + t for t in timeline["t"]], timeline))
+    if not sources:
+        return {}
+    if len(sources) == 1:
+        return sources[0][1]
+
+    times = sorted({t for ts, _ in sources for t in ts})
+    merged: Dict[str, Any] = {"t": [round(t) for t in times], "pools": {}}
+    for key in TIMELINE_FIELDS:
+        if not any(tl.get(key) for _, tl in sources):
+            continue
+        merged[key] = [sum(_value_at(ts, tl[key], t) for ts, tl in sources if tl.get(key))
+                       for t in times]
+    pools = {pool for _, tl in sources for pool in tl.get("pools", {})}
+    for pool in sorted(pools):
+        merged["pools"][pool] = [
+            sum(_value_at(ts, tl["pools"][pool], t) for ts, tl in sources
+                if pool in tl.get("pools", {}))
+            for t in times]
+    return merged
+
+
+def merge_reports(reports: List[TestReport]) -> TestReport:
+    """Combine several runs into one report.
+
+    Results, events and actions are concatenated. Each result's evidence
+    records its source cluster and run. The input results are copied, not
+    tagged in place. Snapshots are summed, and suite stats are keyed
+    "<cluster>/<suite>". Monitor counters are summed, lags are the worst
+    run's, and per-run monitor stats are kept under "runs". Timelines are
+    summed on the merged clock. The eviction rate is weighted by run duration.
+    The time span runs from the first start to the last end.
+    """
+    if len(reports) == 1:
+        return reports[0]
+    reports = sorted(reports, key=lambda r: r.timestamp)
+    start = reports[0].timestamp
+    end = max(r.timestamp.timestamp() + r.duration_seconds for r in reports)
+    clusters = list(dict.fromkeys(r.cluster_name for r in reports))
+
+    merged = TestReport(
+        timestamp=start,
+        cluster_name=", ".join(clusters),
+        duration_seconds=end - start.timestamp()
+    )
+    total_duration = sum(r.duration_seconds for r in reports)
+    for report in reports:
+        for result in report.test_results:
+            evidence = {"cluster": report.cluster_name, "run_id": report.run_id, **result.evidence}
+            merged.test_results.append(dataclasses.replace(result, evidence=evidence))
+        merged.eviction_events.extend(report.eviction_events)
+        merged.remediation_actions.extend(report.remediation_actions)
+        for suite, stats in report.suite_stats.items():
+            merged.suite_stats[f"{report.cluster_name}/{suite}"] = stats
+    merged.remediation_actions.sort(key=lambda a: a.timestamp)
+    if total_duration:
+        merged.eviction_rate_per_hour = sum(
+            r.eviction_rate_per_hour * r.duration_seconds for r in reports) / total_duration
+    merged.initial_state = _sum_snapshots([r.initial_state for r in reports if r.initial_state])
+    merged.final_state = _sum_snapshots([r.final_state for r in reports if r.final_state])
+    merged.monitor_stats = _merge_monitor_stats(reports)
+    merged.cluster_timeline = _merge_timelines(reports, start)
+    merged.calculate_summary()
+    return merged
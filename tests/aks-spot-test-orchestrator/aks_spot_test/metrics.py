@@ -0,0 +1,265 @@
+"""In-process metrics with a Prometheus text exposition endpoint.
+
+Producers update pre-aggregated counters, gauges and histograms as things
+happen (a command returns, a test finishes, an eviction arrives, a snapshot
+is captured). A scrape only renders what is already in memory and never
+calls the cluster. The exporter is optional: ``serve(port)`` starts a
+ThreadingHTTPServer on a daemon thread that answers ``GET /metrics``.
+Recording is always on and costs a dict update under a lock.
+
+Metric names are prefixed ``aks_spot_`` so they sit alongside the
+kube-state-metrics series used by monitoring/dashboards.
+"""
+
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; kubectl/az calls range from tens of milliseconds to minutes
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# aks-<pool>-<id>-vmss<instance>, the AKS node naming scheme
+_AKS_NODE_RE = re.compile(r"^aks-(?P<pool>[a-z0-9]+)-\d+-vmss[0-9a-z]+$")
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelKey, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, registry: "Registry", name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = registry.lock
+        registry.register(self)
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+                for k, v in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str):
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def clear(self):
+        """Drop all label sets (for gauges describing a replaced snapshot)."""
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # key -> [bucket counts..., sum, count]
+        self._values: Dict[LabelKey, List[float]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, row in sorted(self._values.items()):
+            for bound, count in zip(self.buckets, row):
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(count)}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(row[-2])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(row[-1])}")
+        return lines
+
+
+class Registry:
+    """A set of metrics rendered together; one lock guards all updates."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric):
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        with self.lock:
+            lines = []
+            for metric in self._metrics:
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+EVICTIONS = Counter(REGISTRY, "aks_spot_evictions_total",
+                    "Spot eviction events observed, by node pool and zone", ("pool", "zone"))
+CLUSTER_NODES = Gauge(REGISTRY, "aks_spot_cluster_nodes",
+                      "Nodes in the last cluster snapshot", ("state",))
+CLUSTER_PODS = Gauge(REGISTRY, "aks_spot_cluster_pods",
+                     "Pods in the last cluster snapshot", ("phase",))
+POOL_NODES = Gauge(REGISTRY, "aks_spot_pool_nodes",
+                   "Nodes per node pool in the last cluster snapshot", ("pool",))
+SNAPSHOT_TIME = Gauge(REGISTRY, "aks_spot_snapshot_timestamp_seconds",
+                      "When the last cluster snapshot was captured")
+TEST_DURATION = Gauge(REGISTRY, "aks_spot_test_duration_seconds",
+                      "Duration of each test in the current run",
+                      ("test_id", "framework", "category", "status"))
+TESTS = Counter(REGISTRY, "aks_spot_tests_total",
+                "Tests completed, by framework and status", ("framework", "status"))
+COMMAND_DURATION = Histogram(REGISTRY, "aks_spot_command_duration_seconds",
+                             "Latency of kubectl and az CLI calls", ("command", "verb", "returncode"))
+REMEDIATIONS = Counter(REGISTRY, "aks_spot_remediation_actions_total",
+                       "Remediation actions taken", ("action_type", "success"))
+
+# node name -> (pool, zone), filled from snapshots so evictions can be
+# attributed without a lookup call
+_node_index: Dict[str, Tuple[str, str]] = {}
+
+
+def remember_nodes(nodes: List[dict]):
+    """Record pool and zone for each node (from a `kubectl get nodes` list)."""
+    index = {}
+    for node in nodes:
+        meta = node.get("metadata", {})
+        labels = meta.get("labels", {})
+        pool = labels.get("kubernetes.azure.com/agentpool") or labels.get("agentpool", "unknown")
+        index[meta.get("name", "")] = (pool, labels.get("topology.kubernetes.io/zone", "unknown"))
+    with REGISTRY.lock:
+        _node_index.update(index)
+
+
+def node_pool_zone(node_name: str) -> Tuple[str, str]:
+    """Pool and zone of a node; falls back to parsing the AKS node name."""
+    with REGISTRY.lock:
+        known = _node_index.get(node_name)
+    if known:
+        return known
+    match = _AKS_NODE_RE.match(node_name)
+    return (match["pool"] if match else "unknown"), "unknown"
+
+
+def record_eviction(node_name: str):
+    pool, zone = node_pool_zone(node_name)
+    EVICTIONS.inc(pool=pool, zone=zone)
+
+
+def record_snapshot(snapshot):
+    """Replace the cluster gauges with a ClusterSnapshot's values."""
+    CLUSTER_NODES.set(snapshot.total_nodes, state="total")
+    CLUSTER_NODES.set(snapshot.ready_nodes, state="ready")
+    CLUSTER_NODES.set(snapshot.spot_nodes, state="spot")
+    CLUSTER_PODS.set(snapshot.total_pods, phase="total")
+    CLUSTER_PODS.set(snapshot.pending_pods, phase="pending")
+    POOL_NODES.clear()
+    for pool, count in snapshot.node_pool_counts.items():
+        POOL_NODES.set(count, pool=pool)
+    SNAPSHOT_TIME.set(snapshot.timestamp.timestamp())
+
+
+def record_test(result):
+    TEST_DURATION.set(result.duration_seconds, test_id=result.test_id, framework=result.framework,
+                      category=result.category, status=result.status)
+    TESTS.inc(framework=result.framework, status=result.status)
+
+
+def record_command(cmd: List[str], seconds: float, returncode: int):
+    """Observe a kubectl/az call; other commands are not recorded."""
+    if not cmd or cmd[0] not in ("kubectl", "az"):
+        return
+    verb = next((arg for arg in cmd[1:] if not arg.startswith("-")), "")
+    COMMAND_DURATION.observe(seconds, command=cmd[0], verb=verb, returncode=str(returncode))
+
+
+def record_remediation(action):
+    if action.dry_run:
+        return
+    REMEDIATIONS.inc(action_type=action.action_type, success=str(action.success).lower())
+
+
+class _Handler(BaseHTTPRequestHandler):
+    registry: Registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port: int, host: str = "127.0.0.1", registry: Optional[Registry] = None) -> ThreadingHTTPServer:
+    """Start the /metrics endpoint on a daemon thread; returns the server."""
+    handler = type("MetricsHandler", (_Handler,), {"registry": registry or REGISTRY})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -38,6 +38,9 @@ class RemediationAction:
     target: str
     success: bool
     details: str
+    duration_seconds: float = 0.0  # Wall time of the command (all attempts, shared by a batch)
+    attempts: int = 0
+    dry_run: bool = False  # Planned but not executed
 
 
 @dataclass
@@ -71,12 +74,16 @@ class TestReport:
     test_results: List[TestResult] = field(default_factory=list)
     framework_summary: Dict[str, Dict] = field(default_factory=dict)
     category_summary: Dict[str, Dict] = field(default_factory=dict)
+    suite_stats: Dict[str, Dict] = field(default_factory=dict)
 
     # Diagnostics
     initial_state: Optional[ClusterSnapshot] = None
     final_state: Optional[ClusterSnapshot] = None
     eviction_events: List[Dict] = field(default_factory=list)
     eviction_rate_per_hour: float = 0.0
+    monitor_stats: Dict = field(default_factory=dict)
+    # Absolute series from the snapshot recorder: t, node/pod counts, pools
+    cluster_timeline: Dict = field(default_factory=dict)
     remediation_actions: List[RemediationAction] = field(default_factory=list)
 
     # Failure analysis
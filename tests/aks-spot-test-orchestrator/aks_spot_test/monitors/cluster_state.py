@@ -1,9 +1,12 @@
 """Cluster state snapshot utilities."""
 
+import threading
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional, Tuple
+from .. import metrics
 from ..models import ClusterSnapshot
 from ..utils import run_kubectl
+from .watch import ResourceWatcher
 
 
 def capture_snapshot() -> ClusterSnapshot:
@@ -23,6 +26,7 @@ def capture_snapshot() -> ClusterSnapshot:
 
     node_items = nodes.get("items", [])
     pod_items = pods.get("items", [])
+    metrics.remember_nodes(node_items)
 
     # Count nodes
     total_nodes = len(node_items)
@@ -39,7 +43,7 @@ def capture_snapshot() -> ClusterSnapshot:
         pool = node.get("metadata", {}).get("labels", {}).get("agentpool", "unknown")
         pool_counts[pool] = pool_counts.get(pool, 0) + 1
 
-    return ClusterSnapshot(
+    snapshot = ClusterSnapshot(
         timestamp=datetime.now(),
         total_nodes=total_nodes,
         ready_nodes=ready_nodes,
@@ -48,6 +52,8 @@ def capture_snapshot() -> ClusterSnapshot:
         pending_pods=pending_pods,
         node_pool_counts=pool_counts
     )
+    metrics.record_snapshot(snapshot)
+    return snapshot
 
 
 def is_node_ready(node: dict) -> bool:
@@ -62,3 +68,74 @@ def is_spot_node(node: dict) -> bool:
     """Check if node is a spot VM."""
     labels = node.get("metadata", {}).get("labels", {})
     return labels.get("kubernetes.azure.com/scalesetpriority") == "spot"
+
+
+class ClusterStateCache:
+    """Node and pod state kept current by two watches.
+
+    Only what a ClusterSnapshot needs is stored (per node: ready, spot,
+    pool; per pod: phase), so ``snapshot()`` is a count over in-memory state
+    and costs no API calls however often it is taken.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # uid -> (ready, spot, pool)
+        self._nodes: Dict[str, Tuple[bool, bool, str]] = {}
+        # uid -> phase
+        self._pods: Dict[str, str] = {}
+        self._node_watcher = ResourceWatcher("/api/v1/nodes", self._on_node, emit_initial=True)
+        self._pod_watcher = ResourceWatcher("/api/v1/pods", self._on_pod, emit_initial=True)
+
+    def start(self):
+        self._node_watcher.start()
+        self._pod_watcher.start()
+
+    def stop(self):
+        self._node_watcher.stop()
+        self._pod_watcher.stop()
+
+    def wait_synced(self, timeout: float) -> bool:
+        """Wait until both initial lists have been loaded."""
+        return self._node_watcher.synced.wait(timeout) and self._pod_watcher.synced.wait(timeout)
+
+    @property
+    def stats(self) -> Dict[str, Dict]:
+        return {"nodes": dict(self._node_watcher.stats), "pods": dict(self._pod_watcher.stats)}
+
+    def _on_node(self, event_type: str, node: Dict, observed_at: float):
+        uid = node.get("metadata", {}).get("uid", "")
+        with self._lock:
+            if event_type == "DELETED":
+                self._nodes.pop(uid, None)
+                return
+            pool = node.get("metadata", {}).get("labels", {}).get("agentpool", "unknown")
+            self._nodes[uid] = (is_node_ready(node), is_spot_node(node), pool)
+        metrics.remember_nodes([node])
+
+    def _on_pod(self, event_type: str, pod: Dict, observed_at: float):
+        uid = pod.get("metadata", {}).get("uid", "")
+        with self._lock:
+            if event_type == "DELETED":
+                self._pods.pop(uid, None)
+            else:
+                self._pods[uid] = pod.get("status", {}).get("phase", "")
+
+    def snapshot(self, timestamp: Optional[datetime] = None) -> ClusterSnapshot:
+        with self._lock:
+            nodes = list(self._nodes.values())
+            phases = list(self._pods.values())
+        pool_counts: Dict[str, int] = {}
+        for _, _, pool in nodes:
+            pool_counts[pool] = pool_counts.get(pool, 0) + 1
+        snapshot = ClusterSnapshot(
+            timestamp=timestamp or datetime.now(),
+            total_nodes=len(nodes),
+            ready_nodes=sum(1 for ready, _, _ in nodes if ready),
+            spot_nodes=sum(1 for _, spot, _ in nodes if spot),
+            total_pods=len(phases),
+            pending_pods=sum(1 for phase in phases if phase == "Pending"),
+            node_pool_counts=pool_counts
+        )
+        metrics.record_snapshot(snapshot)
+        return snapshot
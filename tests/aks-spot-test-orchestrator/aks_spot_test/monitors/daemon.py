@@ -0,0 +1,102 @@
+"""Long-running eviction monitor behind ``aks-spot-test monitor``.
+
+One EvictionMonitor (and so one watch) lives for the whole process. Every
+interval the daemon prints the events that arrived since the last report and
+the rolling 5m/1h/24h rates, and optionally writes the same data as JSON to
+a status file for dashboards or health checks. With capture_snapshots the
+daemon also takes a cluster snapshot per interval, which feeds the
+snapshot gauges on /metrics and the node -> pool/zone attribution of
+evictions. Snapshots come from a ClusterStateCache started once, so they
+cost no API calls; only if its watches do not sync does the daemon list
+nodes and pods every interval instead. SIGTERM and Ctrl+C stop it cleanly.
+"""
+
+import json
+import os
+import signal
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+from . import cluster_state
+from .eviction_rate import EvictionMonitor
+
+# Time the state cache's watches get to load their initial lists
+SNAPSHOT_SYNC_TIMEOUT_SECONDS = 60
+
+
+class MonitorDaemon:
+    """Report on a persistent EvictionMonitor at a fixed interval."""
+
+    def __init__(self, monitor: EvictionMonitor, interval: int = 60, status_file: str = "",
+                 capture_snapshots: bool = False):
+        self.monitor = monitor
+        self.interval = interval
+        self.status_file = status_file
+        self.capture_snapshots = capture_snapshots
+        self.state_cache: Optional[cluster_state.ClusterStateCache] = None
+        self._stop = threading.Event()
+        self._reported = 0
+
+    def stop(self, *_):
+        self._stop.set()
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        if self.capture_snapshots:
+            self._start_state_cache()
+            self._snapshot()
+        self.monitor.start()
+        try:
+            while not self._stop.wait(self.interval):
+                if self.capture_snapshots:
+                    self._snapshot()
+                self.report()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.monitor.stop()
+            if self.state_cache:
+                self.state_cache.stop()
+
+    def _start_state_cache(self):
+        cache = cluster_state.ClusterStateCache()
+        cache.start()
+        if cache.wait_synced(SNAPSHOT_SYNC_TIMEOUT_SECONDS):
+            self.state_cache = cache
+            return
+        print("⚠️  Cluster watches did not sync, listing nodes and pods every interval instead")
+        cache.stop()
+
+    def _snapshot(self):
+        if self.state_cache:
+            self.state_cache.snapshot()
+        else:
+            cluster_state.capture_snapshot()
+
+    def report(self):
+        # Events the bounded buffer already dropped are counted, not listed
+        new = self.monitor.total_evictions - self._reported
+        self._reported = self.monitor.total_evictions
+        recent = list(self.monitor.eviction_events)[-new:] if new else []
+        for event in recent:
+            print(f"  {event['observed_at']}  {event['node']}  {event['reason']}: {event['message']}")
+
+        rates = self.monitor.rates_per_hour()
+        stats = self.monitor.stats
+        print(f"Eviction rate: 5m {rates['5m']:.1f}/h, 1h {rates['1h']:.1f}/h, 24h {rates['24h']:.1f}/h "
+              f"({new} new, {stats['evictions']} total, {stats['api_requests']} API requests)")
+
+        if self.status_file:
+            self._write_status(rates, stats)
+
+    def _write_status(self, rates: dict, stats: dict):
+        status = {
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "rates_per_hour": rates,
+            "stats": stats,
+            "recent_events": list(self.monitor.eviction_events)[-20:],
+        }
+        tmp_path = f"{self.status_file}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(status, f, indent=2)
+        os.replace(tmp_path, self.status_file)
@@ -2,62 +2,252 @@
 
 import threading
 import time
-from datetime import datetime
-from typing import List, Dict
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional, Tuple
+from .. import metrics
 from ..utils import run_kubectl
+from .watch import ResourceWatcher
+
+# Only Node events can be spot evictions; filtered by the API server
+NODE_EVENTS_SELECTOR = "involvedObject.kind=Node"
+MODES = ("watch", "poll")
+
+# Rolling rate windows (label, seconds)
+RATE_WINDOWS = (("5m", 300), ("1h", 3600), ("24h", 86400))
+
+DEFAULT_MAX_EVENTS = 1000
+DEFAULT_DEDUPE_SIZE = 10000
+DEFAULT_DEDUPE_WINDOW = 86400
+LAG_SAMPLES = 1000
+
+
+class RollingRate:
+    """Event counts over sliding windows, in per-minute buckets.
+
+    A ring of buckets covers the longest window. Each window keeps a running
+    total that is updated when an event arrives and when a bucket falls out
+    of the window, so reads are O(1) and memory is fixed however long the
+    process runs.
+    """
+
+    def __init__(self, windows: Tuple[Tuple[str, int], ...] = RATE_WINDOWS, bucket_seconds: int = 60):
+        self.windows = windows
+        self.bucket_seconds = bucket_seconds
+        self._spans = {label: max(1, seconds // bucket_seconds) for label, seconds in windows}
+        self._size = max(self._spans.values())
+        self._ring = [0] * self._size
+        self._totals = {label: 0 for label, _ in windows}
+        self._current: Optional[int] = None
+
+    def _advance(self, bucket: int):
+        if self._current is None or bucket - self._current >= self._size:
+            # First event, or idle longer than the longest window: start over
+            self._ring = [0] * self._size
+            self._totals = {label: 0 for label in self._totals}
+            self._current = bucket
+            return
+        while self._current < bucket:
+            self._current += 1
+            for label, span in self._spans.items():
+                self._totals[label] -= self._ring[(self._current - span) % self._size]
+            self._ring[self._current % self._size] = 0
+
+    def add(self, timestamp: float, count: int = 1):
+        bucket = int(timestamp // self.bucket_seconds)
+        self._advance(max(bucket, self._current or bucket))
+        self._ring[self._current % self._size] += count
+        for label in self._totals:
+            self._totals[label] += count
+
+    def counts(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Events in each window ending now."""
+        bucket = int((now if now is not None else time.time()) // self.bucket_seconds)
+        if self._current is not None and bucket > self._current:
+            self._advance(bucket)
+        return dict(self._totals)
+
+    def rates_per_hour(self, now: Optional[float] = None) -> Dict[str, float]:
+        return {label: round(self.counts(now)[label] * 3600 / seconds, 1)
+                for label, seconds in self.windows}
+
+
+class TimeWindowLRU:
+    """Bounded key -> value map whose entries expire after window seconds.
+
+    Used to deduplicate events: at most max_entries keys are kept, least
+    recently updated first out.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_DEDUPE_SIZE, window: int = DEFAULT_DEDUPE_WINDOW):
+        self.max_entries = max_entries
+        self.window = window
+        self._entries: "OrderedDict[str, Tuple[float, object]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, now: float):
+        entry = self._entries.get(key)
+        if entry is None or now - entry[0] > self.window:
+            return None
+        return entry[1]
+
+    def put(self, key: str, value, now: float):
+        self._entries[key] = (now, value)
+        self._entries.move_to_end(key)
+        while self._entries:
+            oldest_key, (ts, _) = next(iter(self._entries.items()))
+            if len(self._entries) <= self.max_entries and now - ts <= self.window:
+                break
+            del self._entries[oldest_key]
+
+
+def is_eviction(event: dict) -> bool:
+    reason = event.get("reason", "") or ""
+    message = event.get("message", "") or ""
+    return "evict" in reason.lower() or "evict" in message.lower()
 
 
 class EvictionMonitor:
-    """Background monitor for spot eviction events."""
+    """Background monitor for spot eviction events.
+
+    mode "watch" (default) follows a watch on Node events from the time the
+    monitor starts. mode "poll" lists every event in the cluster each
+    poll_interval, as earlier versions did, and is kept for comparison.
+
+    ``stats`` counts the API load (requests, objects received) and
+    missed_updates: occurrences of an event that were folded into a later
+    count and never observed on their own. It also records the arrival lag
+    (observed_at minus the event's lastTimestamp), which makes the two modes
+    directly comparable.
+
+    Memory is bounded for long-running use: only the last max_events events
+    are kept (``total_evictions`` counts all of them), dedupe state is a
+    TimeWindowLRU, and ``rates`` holds rolling 5m/1h/24h counts.
+    """
 
-    def __init__(self, poll_interval: int = 30):
+    def __init__(self, poll_interval: int = 30, mode: str = "watch",
+                 max_events: int = DEFAULT_MAX_EVENTS, dedupe_size: int = DEFAULT_DEDUPE_SIZE,
+                 dedupe_window: int = DEFAULT_DEDUPE_WINDOW):
+        if mode not in MODES:
+            raise ValueError(f"Unknown eviction monitor mode '{mode}', expected one of {', '.join(MODES)}")
         self.poll_interval = poll_interval
+        self.mode = mode
         self.running = False
         self.thread = None
-        self.eviction_events: List[Dict] = []
+        self.watcher = None
+        self.eviction_events: Deque[Dict] = deque(maxlen=max_events)
+        self.total_evictions = 0
+        self.rates = RollingRate()
         self.start_time = None
+        self._lock = threading.Lock()
+        self._counts = TimeWindowLRU(dedupe_size, dedupe_window)
+        self._lags: Deque[float] = deque(maxlen=LAG_SAMPLES)
+        self._poll_stats = {"api_requests": 0, "objects_received": 0}
+        self._missed_updates = 0
 
     def start(self):
         """Start monitoring eviction events in background thread."""
         self.running = True
         self.start_time = datetime.now()
-        self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.thread.start()
+        if self.mode == "watch":
+            self.watcher = ResourceWatcher("/api/v1/events", self._on_watch_event,
+                                           field_selector=NODE_EVENTS_SELECTOR)
+            self.watcher.start()
+        else:
+            self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
+            self.thread.start()
 
     def stop(self) -> tuple[List[Dict], float]:
         """Stop monitoring and return events + rate."""
         self.running = False
+        if self.watcher:
+            self.watcher.stop()
         if self.thread:
             self.thread.join(timeout=5)
 
         # Calculate eviction rate
         duration_hours = (datetime.now() - self.start_time).total_seconds() / 3600
-        rate = len(self.eviction_events) / duration_hours if duration_hours > 0 else 0.0
+        rate = self.total_evictions / duration_hours if duration_hours > 0 else 0.0
 
-        return self.eviction_events, rate
+        return list(self.eviction_events), rate
+
+    @property
+    def stats(self) -> Dict:
+        """API load, missed updates and arrival lag for this monitor."""
+        with self._lock:
+            base = dict(self.watcher.stats) if self.watcher else dict(self._poll_stats)
+            lags = sorted(self._lags)
+            base.update(
+                mode=self.mode,
+                evictions=self.total_evictions,
+                dedupe_entries=len(self._counts),
+                missed_updates=self._missed_updates,
+                max_lag_seconds=round(lags[-1], 1) if lags else 0.0,
+                median_lag_seconds=round(lags[len(lags) // 2], 1) if lags else 0.0,
+            )
+        return base
+
+    def rates_per_hour(self) -> Dict[str, float]:
+        with self._lock:
+            return self.rates.rates_per_hour()
+
+    def _on_watch_event(self, event_type: str, event: Dict, observed_at: float):
+        if event_type != "DELETED" and is_eviction(event):
+            self._record(event, observed_at)
+
+    def _record(self, event: Dict, observed_at: float):
+        """Record one observation of an eviction event (new or with a higher count)."""
+        uid = event.get("metadata", {}).get("uid", "")
+        count = event.get("count") or 1
+        with self._lock:
+            previous = self._counts.get(uid, observed_at)
+            if previous is not None and count <= previous:
+                return
+            if previous is not None:
+                self._missed_updates += count - previous - 1
+            self._counts.put(uid, count, observed_at)
+            last_seen = event.get("lastTimestamp") or event.get("eventTime") or ""
+            lag = _lag_seconds(last_seen, observed_at)
+            if lag is not None:
+                self._lags.append(lag)
+            if previous is not None:
+                return
+            self.total_evictions += 1
+            self.rates.add(observed_at)
+            involved_obj = event.get("involvedObject", {})
+            metrics.record_eviction(involved_obj.get("name", ""))
+            self.eviction_events.append({
+                "timestamp": event.get("metadata", {}).get("creationTimestamp", ""),
+                "observed_at": datetime.fromtimestamp(observed_at, timezone.utc).isoformat(),
+                "node": involved_obj.get("name", ""),
+                "reason": event.get("reason", ""),
+                "message": event.get("message", "")
+            })
 
     def _monitor_loop(self):
         """Background loop to poll for eviction events."""
-        seen_events = set()
-
         while self.running:
             events = run_kubectl(["get", "events", "--all-namespaces"], output_json=True)
+            self._poll_stats["api_requests"] += 1
+            observed_at = time.time()
             if events:
-                for event in events.get("items", []):
-                    reason = event.get("reason", "")
-                    message = event.get("message", "")
-                    uid = event.get("metadata", {}).get("uid", "")
-
-                    # Look for spot eviction events
-                    if ("evict" in reason.lower() or "evict" in message.lower()) and uid not in seen_events:
-                        involved_obj = event.get("involvedObject", {})
-                        if involved_obj.get("kind") == "Node":
-                            self.eviction_events.append({
-                                "timestamp": event.get("metadata", {}).get("creationTimestamp", ""),
-                                "node": involved_obj.get("name", ""),
-                                "reason": reason,
-                                "message": message
-                            })
-                            seen_events.add(uid)
+                items = events.get("items", [])
+                self._poll_stats["objects_received"] += len(items)
+                for event in items:
+                    if is_eviction(event) and event.get("involvedObject", {}).get("kind") == "Node":
+                        self._record(event, observed_at)
 
             time.sleep(self.poll_interval)
+
+
+def _lag_seconds(timestamp: str, observed_at: float):
+    """Seconds between an RFC 3339 event timestamp and its arrival."""
+    if not timestamp:
+        return None
+    try:
+        ts = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return max(0.0, observed_at - ts.timestamp())
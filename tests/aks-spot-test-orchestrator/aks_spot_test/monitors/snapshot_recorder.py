@@ -0,0 +1,137 @@
+"""Periodic ClusterSnapshot sampling into a delta-encoded columnar timeline.
+
+The recorder samples a snapshot source (normally ClusterStateCache.snapshot,
+which reads watch state and makes no API calls) every ``interval`` seconds.
+Each field is one column. A column stores its first value and then only the
+change from the previous sample, so a cluster that sits at 12 nodes for an
+hour becomes a run of zeros that gzip reduces to almost nothing::
+
+    {"format": "aks-spot-timeline", "version": 1, "start_epoch": ...,
+     "interval": 15, "samples": 240,
+     "columns": {"t": [0, 15, 15, ...], "total_nodes": [12, 0, 0, 1, ...],
+                 "pool:spotpool1": [3, 0, -1, ...], ...}}
+
+``t`` is seconds since start_epoch. Pool columns that appear mid-run are
+back-filled with zeros. The file is rewritten atomically every
+``flush_every`` samples and on stop.
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from ..models import ClusterSnapshot
+
+FORMAT = "aks-spot-timeline"
+FIELDS = ("total_nodes", "ready_nodes", "spot_nodes", "total_pods", "pending_pods")
+POOL_PREFIX = "pool:"
+
+
+class SnapshotRecorder:
+    """Sample snapshots in a background thread and keep them delta-encoded."""
+
+    def __init__(self, source: Callable[[], Optional[ClusterSnapshot]], path: str,
+                 interval: int = 15, flush_every: int = 20):
+        self.source = source
+        self.path = path
+        self.interval = interval
+        self.flush_every = flush_every
+        self.start_epoch = 0.0
+        self.samples = 0
+        self._columns: Dict[str, List[int]] = {}
+        self._last: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self.start_epoch = time.time()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Take a final sample and write the file."""
+        self._stop.set()
+        if self.thread:
+            self.thread.join(timeout=10)
+        self.sample()
+        self.save()
+
+    def _run(self):
+        while True:
+            self.sample()
+            if self.samples and self.samples % self.flush_every == 0:
+                self.save()
+            if self._stop.wait(self.interval):
+                return
+
+    def sample(self):
+        snapshot = self.source()
+        if snapshot is None:
+            return
+        values = {"t": int(round(snapshot.timestamp.timestamp() - self.start_epoch))}
+        values.update({name: getattr(snapshot, name) for name in FIELDS})
+        for pool, count in snapshot.node_pool_counts.items():
+            values[POOL_PREFIX + pool] = count
+
+        with self._lock:
+            for name in sorted(set(self._columns) | set(values)):
+                value = values.get(name, 0)
+                column = self._columns.get(name)
+                if column is None:
+                    # New column: earlier samples had nothing in it
+                    column = self._columns[name] = [0] * self.samples
+                    self._last[name] = 0
+                column.append(value - self._last[name])
+                self._last[name] = value
+            self.samples += 1
+
+    def document(self) -> Dict:
+        with self._lock:
+            return {
+                "format": FORMAT,
+                "version": 1,
+                "start_epoch": self.start_epoch,
+                "started_at": datetime.fromtimestamp(self.start_epoch).isoformat() if self.start_epoch else "",
+                "interval": self.interval,
+                "samples": self.samples,
+                "columns": {name: list(column) for name, column in self._columns.items()},
+            }
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        data = json.dumps(self.document(), separators=(",", ":")).encode()
+        tmp_path = f"{self.path}.tmp"
+        with gzip.open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+    def timeline(self) -> Dict:
+        return decode(self.document())
+
+
+def decode(document: Dict) -> Dict:
+    """Expand a timeline document into absolute series.
+
+    Returns {"t": [...], "<field>": [...], "pools": {name: [...]}} with
+    one entry per sample.
+    """
+    series: Dict = {"pools": {}}
+    for name, deltas in document.get("columns", {}).items():
+        values, total = [], 0
+        for delta in deltas:
+            total += delta
+            values.append(total)
+        if name.startswith(POOL_PREFIX):
+            series["pools"][name[len(POOL_PREFIX):]] = values
+        else:
+            series[name] = values
+    return series
+
+
+def load_timeline(path: str) -> Dict:
+    with gzip.open(path, "rt") as f:
+        return decode(json.load(f))
@@ -0,0 +1,186 @@
+"""List+watch of Kubernetes resources through ``kubectl get --raw``.
+
+Instead of re-listing a whole resource every poll interval, ResourceWatcher
+lists once (paginated), then follows a watch from the list's resourceVersion:
+
+    GET <path>?watch=1&resourceVersion=<rv>&allowWatchBookmarks=true&...
+
+Field and label selectors are applied by the API server, so only matching
+objects are sent. Each event is timestamped on arrival (``observed_at``).
+When the watch times out it resumes from the last resourceVersion seen
+(bookmarks keep that current). When the server answers 410 Gone because the
+version was compacted, the watcher re-lists and reports every object it had
+not seen yet (and, as DELETED, every known object that is gone), so nothing
+is lost across the gap.
+"""
+
+import json
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlencode
+from ..utils import StreamingCommand, run_command
+
+# Seconds the API server keeps one watch open before we reconnect
+DEFAULT_WATCH_TIMEOUT = 300
+LIST_PAGE_SIZE = 500
+ERROR_BACKOFF_SECONDS = 5
+
+
+class ResourceWatcher:
+    """Follow changes to one resource collection in a background thread.
+
+    on_event(event_type, obj, observed_at) is called for ADDED, MODIFIED and
+    DELETED events. Objects present in the initial list are not reported
+    unless emit_initial is set.
+    """
+
+    def __init__(self, path: str, on_event: Callable[[str, Dict, float], None],
+                 field_selector: str = "", label_selector: str = "",
+                 watch_timeout: int = DEFAULT_WATCH_TIMEOUT, emit_initial: bool = False):
+        self.path = path
+        self.on_event = on_event
+        self.field_selector = field_selector
+        self.label_selector = label_selector
+        self.watch_timeout = watch_timeout
+        self.emit_initial = emit_initial
+        self.resource_version = ""
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        # Set once the initial list has been processed
+        self.synced = threading.Event()
+        self._stream: Optional[StreamingCommand] = None
+        # uid -> resourceVersion of every object currently known
+        self._known: Dict[str, str] = {}
+        self.stats = {
+            "api_requests": 0,
+            "list_pages": 0,
+            "watch_connections": 0,
+            "relists": 0,
+            "objects_received": 0,
+            "events": 0,
+            "bookmarks": 0,
+            "errors": 0,
+        }
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self._stream:
+            self._stream.terminate()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    def _query(self, **params) -> str:
+        if self.field_selector:
+            params["fieldSelector"] = self.field_selector
+        if self.label_selector:
+            params["labelSelector"] = self.label_selector
+        return f"{self.path}?{urlencode(params)}"
+
+    def _run(self):
+        initial = True
+        while self.running:
+            if not self.resource_version:
+                if not self._list(emit=self.emit_initial or not initial):
+                    self.stats["errors"] += 1
+                    time.sleep(ERROR_BACKOFF_SECONDS)
+                    continue
+                initial = False
+                self.synced.set()
+            self._watch()
+
+    def _list(self, emit: bool) -> bool:
+        """Paginated list; records the collection resourceVersion to watch from."""
+        items: List[Dict] = []
+        params = {"limit": LIST_PAGE_SIZE}
+        while True:
+            self.stats["api_requests"] += 1
+            self.stats["list_pages"] += 1
+            result = run_command(["kubectl", "get", "--raw", self._query(**params)], timeout=120)
+            if result.returncode != 0:
+                return False
+            try:
+                page = json.loads(result.stdout)
+            except json.JSONDecodeError:
+                return False
+            items.extend(page.get("items", []))
+            token = page.get("metadata", {}).get("continue")
+            if not token:
+                break
+            params["continue"] = token
+
+        self.stats["objects_received"] += len(items)
+        observed_at = time.time()
+        current = {}
+        for obj in items:
+            meta = obj.get("metadata", {})
+            uid, rv = meta.get("uid", ""), meta.get("resourceVersion", "")
+            current[uid] = rv
+            if emit and uid in self._known:
+                if self._known[uid] != rv:
+                    self._dispatch("MODIFIED", obj, observed_at)
+            elif emit:
+                self._dispatch("ADDED", obj, observed_at)
+        if emit:
+            for uid in set(self._known) - set(current):
+                self._dispatch("DELETED", {"metadata": {"uid": uid}}, observed_at)
+        self._known = current
+        self.resource_version = page.get("metadata", {}).get("resourceVersion", "")
+        return bool(self.resource_version)
+
+    def _watch(self):
+        self.stats["api_requests"] += 1
+        self.stats["watch_connections"] += 1
+        query = self._query(watch=1, resourceVersion=self.resource_version,
+                            allowWatchBookmarks="true", timeoutSeconds=self.watch_timeout)
+        self._stream = StreamingCommand(["kubectl", "get", "--raw", query],
+                                        timeout=self.watch_timeout + 30)
+        for stream, line in self._stream:
+            if stream != "stdout" or not line.strip():
+                continue
+            observed_at = time.time()
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            event_type, obj = event.get("type", ""), event.get("object", {})
+
+            if event_type == "ERROR":
+                # 410 Gone: our resourceVersion was compacted away, re-list
+                if obj.get("code") == 410:
+                    self.stats["relists"] += 1
+                else:
+                    self.stats["errors"] += 1
+                self.resource_version = ""
+                self._stream.terminate()
+                continue
+
+            rv = obj.get("metadata", {}).get("resourceVersion", "")
+            if rv:
+                self.resource_version = rv
+            if event_type == "BOOKMARK":
+                self.stats["bookmarks"] += 1
+                continue
+
+            self.stats["objects_received"] += 1
+            uid = obj.get("metadata", {}).get("uid", "")
+            if event_type == "DELETED":
+                self._known.pop(uid, None)
+            else:
+                self._known[uid] = rv
+            self._dispatch(event_type, obj, observed_at)
+
+        result = self._stream.result
+        if self.running and result and result.returncode not in (0, 124) and self.resource_version:
+            # kubectl itself failed (auth, connectivity): back off, then resume
+            self.stats["errors"] += 1
+            time.sleep(ERROR_BACKOFF_SECONDS)
+
+    def _dispatch(self, event_type: str, obj: Dict, observed_at: float):
+        self.stats["events"] += 1
+        self.on_event(event_type, obj, observed_at)
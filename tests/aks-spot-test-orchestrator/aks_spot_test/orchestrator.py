@@ -1,22 +1,59 @@
 """Main test orchestrator - coordinates all test execution."""
 
+import functools
 import os
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
-from .models import TestReport
-from .monitors import cluster_state, eviction_rate
+from typing import List, Optional
+from . import metrics, tracing, trends
+from .models import TestReport, TestResult
+from .monitors import cluster_state, eviction_rate, snapshot_recorder
 from .runners import terratest_runner, bash_runner, python_runner
-from .remediators import vmss_ghost, stuck_nodes
+from .remediators import controller, planner, vmss_ghost, stuck_nodes
 from .reporters import json_reporter, markdown_reporter, html_reporter
+from .reporters import view as report_view
 from .utils import get_cluster_name
 
 
+SUITE_ORDER = ["terratest", "bash", "python"]
+
+SUITE_LABELS = {
+    "terratest": "Terratest (Go)",
+    "bash": "Bash Spot Tests",
+    "python": "Python Spot Tests",
+}
+
+DEFAULT_SUITE_TIMEOUTS = {"terratest": 10, "bash": 20, "python": 20}
+
+# Suites that declare a common resource never run at the same time.
+# Terratest only plans/validates the Terraform modules; the bash and python
+# suites both drain and scale the live cluster.
+DEFAULT_SUITE_RESOURCES = {
+    "terratest": ["terraform-modules"],
+    "bash": ["cluster-workloads"],
+    "python": ["cluster-workloads"],
+}
+
+# Extra time past timeout_minutes before the orchestrator gives up on a suite:
+# the runner's own overhead (deadline slack, cleanup, summary) plus this grace
+SUITE_TIMEOUT_GRACE_SECONDS = 30
+RUNNER_OVERHEAD_SECONDS = {
+    "terratest": terratest_runner.OVERHEAD_SECONDS,
+    "bash": bash_runner.OVERHEAD_SECONDS,
+    "python": python_runner.OVERHEAD_SECONDS,
+}
+
+
 class TestOrchestrator:
     """Orchestrates test execution, monitoring, and reporting."""
 
     def __init__(self, config: dict):
         self.config = config
         self.report = TestReport()
+        self.state_cache = None
+        self.snapshot_recorder = None
+        self.remediation_controller = None
 
         # Load .env file from orchestrator directory
         self._load_environment()
@@ -57,30 +94,45 @@ class TestOrchestrator:
         print("AKS Spot Test Orchestrator")
         print("="*70 + "\n")
 
+        trace_root = self._start_tracing()
+        self._start_metrics()
+
         # Phase 1: Pre-flight checks
         print("Phase 1: Pre-flight Checks")
         print("-" * 70)
-        if not self._preflight_checks():
+        with tracing.span("preflight", "phase"):
+            preflight_ok = self._preflight_checks()
+        if not preflight_ok:
             print("❌ Pre-flight checks failed. Aborting.")
+            if trace_root:
+                self._finish_tracing(trace_root)
             return self.report
 
         # Phase 2: Test Execution
         print("\nPhase 2: Test Execution")
         print("-" * 70)
-        self._run_test_suites()
+        self._suites_started = time.time()
+        with tracing.span("test_execution", "phase"):
+            self._run_test_suites()
 
         # Phase 3: Auto-Remediation
         if self.config.get("remediation", {}).get("enabled", True):
             print("\nPhase 3: Auto-Remediation")
             print("-" * 70)
-            self._run_remediation()
+            with tracing.span("remediation", "phase"):
+                self._run_remediation()
 
         # Phase 4: Report Generation
         print("\nPhase 4: Report Generation")
         print("-" * 70)
         self.report.duration_seconds = time.time() - start_time
         self.report.calculate_summary()
-        self._generate_reports()
+        with tracing.span("reports", "phase"):
+            self._generate_reports()
+            self._update_trends()
+
+        if trace_root:
+            self._finish_tracing(trace_root)
 
         print("\n" + "="*70)
         print(f"✅ Test run complete! Duration: {self.report.duration_seconds/60:.1f} minutes")
@@ -89,6 +141,38 @@ class TestOrchestrator:
 
         return self.report
 
+    def _start_tracing(self) -> str:
+        """Point TRACE_DIR at a per-run span directory if tracing is enabled.
+
+        Child processes (bash and python suites) inherit TRACE_DIR and write
+        their own span files next to the orchestrator's.
+        """
+        if not self.config.get("tracing", {}).get("enabled", False):
+            return ""
+        output_dir = self.config.get("reports", {}).get("output_dir", "./reports")
+        timestamp_str = self.report.timestamp.strftime("%Y-%m-%d-%H%M%S")
+        trace_root = os.path.abspath(os.path.join(output_dir, f"trace-{timestamp_str}"))
+        os.makedirs(trace_root, exist_ok=True)
+        os.environ["TRACE_DIR"] = trace_root
+        print(f"Tracing enabled, spans in {trace_root}\n")
+        return trace_root
+
+    def _start_metrics(self):
+        """Serve /metrics for the duration of the run if enabled."""
+        metrics_cfg = self.config.get("metrics", {})
+        if not metrics_cfg.get("enabled", False):
+            return
+        host, port = metrics_cfg.get("host", "127.0.0.1"), metrics_cfg.get("port", 9464)
+        metrics.serve(port, host)
+        print(f"Metrics on http://{host}:{port}/metrics\n")
+
+    def _finish_tracing(self, trace_root: str):
+        """Merge all span files of this run into one Chrome trace."""
+        os.environ.pop("TRACE_DIR", None)
+        trace_path = f"{trace_root}.json"
+        count = tracing.merge_traces(trace_root, trace_path)
+        print(f"  ✅ Trace ({count} spans): {trace_path}")
+
     def _preflight_checks(self) -> bool:
         """Run pre-flight checks before test execution."""
         print("  Checking cluster connectivity...")
@@ -101,93 +185,325 @@ class TestOrchestrator:
         print(f"  ✅ Connected to cluster: {cluster_name}")
 
         print("  Capturing initial cluster state...")
-        self.report.initial_state = cluster_state.capture_snapshot()
+        self.report.initial_state = self._start_snapshots() or cluster_state.capture_snapshot()
         print(f"  ✅ Snapshot: {self.report.initial_state.total_nodes} nodes, {self.report.initial_state.total_pods} pods")
 
         print("  Starting eviction monitor...")
+        monitor_cfg = self.config.get("monitoring", {}).get("eviction_rate", {})
         self.eviction_monitor = eviction_rate.EvictionMonitor(
-            poll_interval=self.config.get("monitoring", {}).get("eviction_rate", {}).get("poll_interval_seconds", 30)
+            poll_interval=monitor_cfg.get("poll_interval_seconds", 30),
+            mode=monitor_cfg.get("mode", "watch")
         )
         self.eviction_monitor.start()
         print("  ✅ Eviction monitor started")
 
+        self._start_controller()
+
         return True
 
+    def _start_controller(self):
+        """Remediate stuck nodes and VMSS orphans during the tests, not only after them."""
+        remediation_cfg = self.config.get("remediation", {})
+        continuous = remediation_cfg.get("continuous", {})
+        if not remediation_cfg.get("enabled", True) or not continuous.get("enabled", False):
+            return
+        print("  Starting remediation controller...")
+        self.remediation_controller = controller.RemediationController(
+            os.environ.get("RESOURCE_GROUP", "rg-aks-spot"),
+            self.report.cluster_name,
+            os.environ.get("LOCATION", "australiaeast"),
+            min_age_minutes=remediation_cfg.get("stuck_nodes", {}).get("min_age_minutes", 5),
+            vmss_min_age_minutes=remediation_cfg.get("vmss_ghosts", {}).get("min_age_minutes", 5),
+            vmss_interval=continuous.get("vmss_interval_seconds", controller.DEFAULT_VMSS_INTERVAL_SECONDS),
+            batch_size=remediation_cfg.get("vmss_ghosts", {}).get("batch_size", vmss_ghost.DEFAULT_BATCH_SIZE),
+            max_unregistered_fraction=remediation_cfg.get("vmss_ghosts", {}).get(
+                "max_unregistered_fraction", vmss_ghost.DEFAULT_MAX_UNREGISTERED_FRACTION),
+            stuck_nodes_enabled=remediation_cfg.get("stuck_nodes", {}).get("enabled", True),
+            vmss_enabled=remediation_cfg.get("vmss_ghosts", {}).get("enabled", True),
+            max_workers=remediation_cfg.get("max_workers", planner.DEFAULT_MAX_WORKERS),
+            rate_per_second=remediation_cfg.get("rate_per_second", planner.DEFAULT_RATE_PER_SECOND),
+            burst=remediation_cfg.get("burst", planner.DEFAULT_BURST),
+            retries=remediation_cfg.get("retries", planner.DEFAULT_RETRIES),
+            dry_run=remediation_cfg.get("dry_run", False),
+            on_action=metrics.record_remediation
+        )
+        self.remediation_controller.start()
+        print("  ✅ Remediation controller started")
+
     def _run_test_suites(self):
-        """Run all test suites sequentially."""
-        # Terratest
-        if self.config.get("test_suites", {}).get("terratest", {}).get("enabled", True):
-            print("\n  Running Terratest (Go)...")
-            working_dir = self.config.get("test_suites", {}).get("terratest", {}).get("working_dir", "../../")
-            timeout = self.config.get("test_suites", {}).get("terratest", {}).get("timeout_minutes", 10)
-
-            results, success = terratest_runner.run_tests(working_dir, timeout)
-            self.report.test_results.extend(results)
-            status = "✅ PASS" if success else "⚠️ FAIL"
-            print(f"  {status} Terratest completed ({len(results)} tests)")
-
-        # Bash tests
-        if self.config.get("test_suites", {}).get("bash", {}).get("enabled", True):
-            print("\n  Running Bash Spot Tests...")
-            working_dir = self.config.get("test_suites", {}).get("bash", {}).get("working_dir", "../../spot-behavior")
-            timeout = self.config.get("test_suites", {}).get("bash", {}).get("timeout_minutes", 20)
-
-            results, success = bash_runner.run_tests(working_dir, timeout)
-            self.report.test_results.extend(results)
-            status = "✅ PASS" if success else "⚠️ FAIL"
-            print(f"  {status} Bash tests completed ({len(results)} tests)")
-
-        # Python tests
-        if self.config.get("test_suites", {}).get("python", {}).get("enabled", True):
-            print("\n  Running Python Spot Tests...")
-            working_dir = self.config.get("test_suites", {}).get("python", {}).get("working_dir", "../../spot-behavior-python")
-            venv_path = self.config.get("test_suites", {}).get("python", {}).get("venv_path", "venv")
-            timeout = self.config.get("test_suites", {}).get("python", {}).get("timeout_minutes", 20)
-
-            results, success = python_runner.run_tests(working_dir, venv_path, timeout)
-            self.report.test_results.extend(results)
-            status = "✅ PASS" if success else "⚠️ FAIL"
-            print(f"  {status} Python tests completed ({len(results)} tests)")
+        """Run enabled test suites, concurrently where their resources allow."""
+        suites = [name for name in SUITE_ORDER
+                  if self.config.get("test_suites", {}).get(name, {}).get("enabled", True)]
+        execution = self.config.get("execution", {})
+
+        if execution.get("parallel_suites", True) and len(suites) > 1:
+            self._run_suites_concurrently(suites, max(1, execution.get("max_parallel_suites", len(suites))))
+        else:
+            for name in suites:
+                print(f"\n  Running {SUITE_LABELS[name]}...")
+                started = time.time()
+                results, success, extra = self._run_suite(name)
+                self._merge_suite(name, results, success, started, time.time(), extra=extra)
 
         # Stop eviction monitor
         print("\n  Stopping eviction monitor...")
         events, rate = self.eviction_monitor.stop()
         self.report.eviction_events = events
         self.report.eviction_rate_per_hour = rate
+        self.report.monitor_stats = self.eviction_monitor.stats
         print(f"  ✅ Eviction rate: {rate:.1f} evictions/hour ({len(events)} total)")
 
         # Capture final state
         print("  Capturing final cluster state...")
-        self.report.final_state = cluster_state.capture_snapshot()
+        self.report.final_state = self._stop_snapshots() or cluster_state.capture_snapshot()
         print(f"  ✅ Final state: {self.report.final_state.total_nodes} nodes, {self.report.final_state.total_pods} pods")
 
+    def _start_snapshots(self):
+        """Start the watch-backed state cache and the timeline recorder.
+
+        Returns the initial snapshot, or None if snapshots are disabled or
+        the watches did not sync in time (callers then list the cluster).
+        """
+        snap_cfg = self.config.get("monitoring", {}).get("snapshots", {})
+        if not snap_cfg.get("enabled", True):
+            return None
+        self.state_cache = cluster_state.ClusterStateCache()
+        self.state_cache.start()
+        if not self.state_cache.wait_synced(snap_cfg.get("sync_timeout_seconds", 60)):
+            print("  ⚠️  Cluster watches did not sync, falling back to one-off snapshots")
+            self.state_cache.stop()
+            self.state_cache = None
+            return None
+
+        output_dir = self.config.get("reports", {}).get("output_dir", "./reports")
+        timestamp_str = self.report.timestamp.strftime("%Y-%m-%d-%H%M%S")
+        self.snapshot_recorder = snapshot_recorder.SnapshotRecorder(
+            self.state_cache.snapshot,
+            os.path.join(output_dir, f"timeline-{timestamp_str}.json.gz"),
+            interval=snap_cfg.get("interval_seconds", 15)
+        )
+        self.snapshot_recorder.start()
+        return self.state_cache.snapshot()
+
+    def _stop_snapshots(self):
+        """Stop sampling, keep the timeline in the report, return the final snapshot."""
+        if not self.state_cache:
+            return None
+        final = self.state_cache.snapshot()
+        self.snapshot_recorder.stop()
+        self.state_cache.stop()
+        self.report.cluster_timeline = self.snapshot_recorder.timeline()
+        print(f"  ✅ Timeline ({self.snapshot_recorder.samples} samples): {self.snapshot_recorder.path}")
+        return final
+
+    def _suite_config(self, name: str) -> dict:
+        return self.config.get("test_suites", {}).get(name, {})
+
+    def _suite_resources(self, name: str) -> set:
+        """Resources a suite touches; suites sharing one never overlap."""
+        return set(self._suite_config(name).get("resources", DEFAULT_SUITE_RESOURCES[name]))
+
+    def _suite_timeout(self, name: str) -> int:
+        return self._suite_config(name).get("timeout_minutes", DEFAULT_SUITE_TIMEOUTS[name])
+
+    def _run_suite(self, name: str) -> tuple:
+        """Run one suite and return (results, success, extra suite stats)."""
+        suite_cfg = self._suite_config(name)
+        timeout = self._suite_timeout(name)
+        idle_timeout = suite_cfg.get("idle_timeout_minutes", 0)
+        extra = {}
+
+        with tracing.span(name, "suite") as attrs:
+            if name == "terratest":
+                working_dir = suite_cfg.get("working_dir", "../../")
+                results, success = terratest_runner.run_tests(working_dir, timeout, idle_timeout)
+            elif name == "bash":
+                working_dir = suite_cfg.get("working_dir", "../../spot-behavior")
+                results, success = bash_runner.run_tests(
+                    working_dir, timeout, idle_timeout,
+                    max_parallel_categories=suite_cfg.get("max_parallel_categories", 3)
+                )
+            else:
+                working_dir = suite_cfg.get("working_dir", "../../spot-behavior-python")
+                venv_path = suite_cfg.get("venv_path", "venv")
+                results, success = python_runner.run_tests(
+                    working_dir, venv_path, timeout, idle_timeout,
+                    venv_cache_dir=suite_cfg.get("venv_cache_dir", python_runner.venv_cache.DEFAULT_CACHE_DIR),
+                    venv_cache_size=suite_cfg.get("venv_cache_size", python_runner.venv_cache.DEFAULT_CACHE_SIZE),
+                    stats=extra,
+                    mode=suite_cfg.get("mode", "worker")
+                )
+            attrs.update(tests=len(results), success=success)
+        return results, success, extra
+
+    def _run_suites_concurrently(self, suites: List[str], max_parallel: int):
+        """Start each suite as soon as no running suite holds one of its resources.
+
+        Results are merged as suites finish. A suite that outlives its own
+        timeout_minutes (plus a grace period for the runner's cleanup) is
+        recorded as failed and its late results are discarded. Its thread
+        (and subprocess) may still be running, so it keeps its resources and
+        its slot until it exits; suites waiting on them more than a further
+        grace period are recorded as not started.
+        """
+        max_parallel = max(1, max_parallel)
+        pending = list(suites)
+        running = {}  # future -> (name, started, deadline)
+        abandoned = {}  # timed-out future -> (name, timed out at)
+        executor = ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="suite")
+
+        try:
+            while pending or running:
+                for future in [f for f in abandoned if f.done()]:
+                    name, _ = abandoned.pop(future)
+                    print(f"  [{name}] timed-out suite exited; its resources are free")
+
+                busy = set()
+                for name in [n for n, _, _ in running.values()] + [n for n, _ in abandoned.values()]:
+                    busy |= self._suite_resources(name)
+                for name in list(pending):
+                    if len(running) + len(abandoned) >= max_parallel:
+                        break
+                    if self._suite_resources(name) & busy:
+                        continue
+                    pending.remove(name)
+                    busy |= self._suite_resources(name)
+                    started = time.time()
+                    deadline = (started + self._suite_timeout(name) * 60
+                                + RUNNER_OVERHEAD_SECONDS[name] + SUITE_TIMEOUT_GRACE_SECONDS)
+                    running[executor.submit(self._run_suite, name)] = (name, started, deadline)
+                    print(f"  [{name}] started {SUITE_LABELS[name]}")
+
+                if not running:
+                    # Only timed-out suites that have not exited block the rest
+                    give_up = min(t for _, t in abandoned.values()) + SUITE_TIMEOUT_GRACE_SECONDS
+                    if time.time() >= give_up:
+                        for name in pending:
+                            message = "Suite not started: a timed-out suite still holds its resources"
+                            now = time.time()
+                            self._merge_suite(name, [self._suite_failure(name, now, message)],
+                                              False, now, now)
+                        pending.clear()
+                        break
+                    wait(abandoned, timeout=max(give_up - time.time(), 0), return_when=FIRST_COMPLETED)
+                    continue
+
+                next_deadline = min(d for _, _, d in running.values())
+                done, _ = wait(list(running) + list(abandoned), timeout=max(next_deadline - time.time(), 0),
+                               return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    if future not in running:
+                        continue
+                    name, started, _ = running.pop(future)
+                    try:
+                        results, success, extra = future.result()
+                    except Exception as e:
+                        results, success, extra = [self._suite_failure(name, started, f"Suite crashed: {e}")], False, {}
+                    self._merge_suite(name, results, success, started, time.time(), extra=extra)
+
+                for future, (name, started, deadline) in list(running.items()):
+                    if time.time() >= deadline:
+                        running.pop(future)
+                        abandoned[future] = (name, time.time())
+                        message = f"Suite exceeded its timeout of {self._suite_timeout(name)} minutes"
+                        self._merge_suite(name, [self._suite_failure(name, started, message)],
+                                          False, started, time.time(), timed_out=True)
+        finally:
+            # Do not block on a timed-out suite; its subprocess has its own timeout
+            executor.shutdown(wait=False)
+
+    def _suite_failure(self, name: str, started: float, message: str) -> TestResult:
+        return TestResult(
+            test_id=f"{name}-suite",
+            name=f"{SUITE_LABELS[name]} Suite",
+            category="runtime",
+            framework=name,
+            status="FAIL",
+            duration_seconds=time.time() - started,
+            error_message=message
+        )
+
+    def _merge_suite(self, name: str, results: List[TestResult], success: bool,
+                     started: float, finished: float, timed_out: bool = False,
+                     extra: Optional[dict] = None):
+        """Add a finished suite's results and timing to the report."""
+        self.report.test_results.extend(results)
+        for result in results:
+            metrics.record_test(result)
+        self.report.suite_stats[name] = {
+            "duration_seconds": round(finished - started, 1),
+            "started_offset_seconds": round(started - self._suites_started, 1),
+            "success": success,
+            "timed_out": timed_out,
+            "tests": len(results),
+            "passed": sum(1 for r in results if r.status == "PASS"),
+            "failed": sum(1 for r in results if r.status == "FAIL"),
+            "skipped": sum(1 for r in results if r.status == "SKIP"),
+            **(extra or {}),
+        }
+        if timed_out:
+            print(f"  [{name}] ❌ {SUITE_LABELS[name]} timed out after {finished - started:.0f}s")
+            return
+        status = "✅ PASS" if success else "⚠️ FAIL"
+        print(f"  [{name}] {status} {SUITE_LABELS[name]} completed "
+              f"({len(results)} tests, {finished - started:.0f}s)")
+
     def _run_remediation(self):
-        """Run auto-remediation for infrastructure issues."""
-        actions = []
+        """Plan auto-remediation for infrastructure issues, then execute the plan."""
+        remediation_cfg = self.config.get("remediation", {})
+        ghost_plan, node_plan = [], []
+        controller_actions = []
+
+        if self.remediation_controller:
+            self.remediation_controller.stop()
+            self.remediation_controller.join()
+            controller_actions = list(self.remediation_controller.actions)
+            print(f"  ✅ Remediation controller: {self.remediation_controller.total_actions} "
+                  f"action(s) during the tests")
 
         # VMSS ghost detection
-        if self.config.get("remediation", {}).get("vmss_ghosts", {}).get("enabled", True):
-            print("  Detecting VMSS ghost instances...")
+        if remediation_cfg.get("vmss_ghosts", {}).get("enabled", True):
+            print("  Detecting VMSS ghost and orphan instances...")
             # Get cluster config from environment
             resource_group = os.environ.get("RESOURCE_GROUP", "rg-aks-spot")
             cluster_name = self.report.cluster_name
             location = os.environ.get("LOCATION", "australiaeast")
-            min_age = self.config.get("remediation", {}).get("vmss_ghosts", {}).get("min_age_minutes", 5)
+            min_age = remediation_cfg.get("vmss_ghosts", {}).get("min_age_minutes", 5)
 
-            ghost_actions = vmss_ghost.detect_and_remediate(resource_group, cluster_name, location, min_age)
-            actions.extend(ghost_actions)
-            print(f"  ✅ VMSS ghosts: {len(ghost_actions)} instances processed")
+            batch_size = remediation_cfg.get("vmss_ghosts", {}).get("batch_size", vmss_ghost.DEFAULT_BATCH_SIZE)
+            max_fraction = remediation_cfg.get("vmss_ghosts", {}).get(
+                "max_unregistered_fraction", vmss_ghost.DEFAULT_MAX_UNREGISTERED_FRACTION)
+            ghost_plan = vmss_ghost.plan_actions(resource_group, cluster_name, location, min_age, batch_size,
+                                                 max_unregistered_fraction=max_fraction)
+            print(f"  ✅ VMSS ghosts/orphans: {len(ghost_plan)} action(s) planned")
 
         # Stuck node detection
-        if self.config.get("remediation", {}).get("stuck_nodes", {}).get("enabled", True):
+        if remediation_cfg.get("stuck_nodes", {}).get("enabled", True):
             print("  Detecting stuck nodes...")
-            min_age = self.config.get("remediation", {}).get("stuck_nodes", {}).get("min_age_minutes", 5)
+            min_age = remediation_cfg.get("stuck_nodes", {}).get("min_age_minutes", 5)
 
-            node_actions = stuck_nodes.detect_and_remediate(min_age)
-            actions.extend(node_actions)
-            print(f"  ✅ Stuck nodes: {len(node_actions)} nodes processed")
+            node_plan = stuck_nodes.plan_actions(min_age)
+            print(f"  ✅ Stuck nodes: {len(node_plan)} action(s) planned")
 
-        self.report.remediation_actions = actions
+        plan = planner.build_plan(ghost_plan, node_plan)
+        if remediation_cfg.get("dry_run", False):
+            print(planner.format_plan(plan))
+            planned = planner.planned_entries(plan)
+            self.report.remediation_actions = controller_actions + planned
+            print(f"  ✅ Dry run: {len(planned)} target(s) planned, nothing executed")
+            return
+
+        actions = planner.execute(
+            plan,
+            max_workers=remediation_cfg.get("max_workers", planner.DEFAULT_MAX_WORKERS),
+            rate_per_second=remediation_cfg.get("rate_per_second", planner.DEFAULT_RATE_PER_SECOND),
+            burst=remediation_cfg.get("burst", planner.DEFAULT_BURST),
+            retries=remediation_cfg.get("retries", planner.DEFAULT_RETRIES)
+        )
+        self.report.remediation_actions = controller_actions + actions
+        for action in actions:
+            metrics.record_remediation(action)
         successful = sum(1 for a in actions if a.success)
         print(f"  ✅ Remediation complete: {successful}/{len(actions)} actions successful")
 
@@ -198,18 +514,37 @@ class TestOrchestrator:
         os.makedirs(output_dir, exist_ok=True)
 
         formats = self.config.get("reports", {}).get("formats", ["json", "html", "markdown"])
-
-        if "json" in formats:
-            json_path = os.path.join(output_dir, f"test-report-{timestamp_str}.json")
-            json_reporter.generate_report(self.report, json_path)
-            print(f"  ✅ JSON report: {json_path}")
-
-        if "html" in formats:
-            html_path = os.path.join(output_dir, f"test-report-{timestamp_str}.html")
-            html_reporter.generate_report(self.report, html_path)
-            print(f"  ✅ HTML report: {html_path}")
-
-        if "markdown" in formats:
-            md_path = os.path.join(output_dir, f"test-report-{timestamp_str}.md")
-            markdown_reporter.generate_report(self.report, md_path)
-            print(f"  ✅ Markdown report: {md_path}")
+        json_mode = self.config.get("reports", {}).get("json_mode", "pretty")
+        generators = {
+            "json": (functools.partial(json_reporter.generate_report, mode=json_mode),
+                     "ndjson" if json_mode == "ndjson" else "json", "JSON"),
+            "html": (html_reporter.generate_report, "html", "HTML"),
+            "markdown": (markdown_reporter.generate_report, "md", "Markdown"),
+        }
+        outputs = {
+            name: (generate, os.path.join(output_dir, f"test-report-{timestamp_str}.{ext}"))
+            for name, (generate, ext, _) in generators.items() if name in formats
+        }
+
+        # One pass over the results for every format, then all formats written concurrently
+        view = report_view.build_view(self.report)
+        for name, path in report_view.write_reports(view, outputs).items():
+            print(f"  ✅ {generators[name][2]} report: {path}")
+
+    def _update_trends(self):
+        """Add this run to the trend index, compact expired runs, and rewrite trends.md."""
+        reports_cfg = self.config.get("reports", {})
+        trends_cfg = reports_cfg.get("trends", {})
+        if not trends_cfg.get("enabled", True):
+            return
+        output_dir = reports_cfg.get("output_dir", "./reports")
+        try:
+            stats = trends.refresh(output_dir, reports_cfg.get("retention_days", 30),
+                                   trends_cfg.get("window_runs", 30))
+        except Exception as e:
+            # The run's own reports are already written; trends are best effort
+            print(f"  ⚠️  Trends not updated ({type(e).__name__}: {e}); "
+                  f"fix or remove {os.path.join(output_dir, trends.INDEX_FILE)}")
+            return
+        print(f"  ✅ Trends: {stats['runs']} runs indexed ({stats['added']} new, "
+              f"{stats['compacted']} compacted): {os.path.join(output_dir, 'trends.md')}")
@@ -0,0 +1,228 @@
+"""Continuous remediation controller behind ``aks-spot-test remediate --watch``.
+
+Instead of scanning every node once after the tests, the controller follows
+a watch on Node objects. When a node's Ready condition turns False, it arms
+a timer for lastTransitionTime + min_age_minutes. When the node turns Ready
+again, or is deleted, the timer is cancelled. Timers sit in a heap served
+by one loop thread, so a thousand healthy nodes cost nothing. When a timer
+fires, the node's latest watched state is checked once more, and the node
+is deleted through the planner (shared rate limit, retries). A failed
+delete is re-armed after REQUEUE_SECONDS.
+
+VMSS ghosts and orphans have no watchable Kubernetes signal. Every
+vmss_interval seconds the loop runs a reconcile that lists only the VMSS
+side. Nodes come from the watch cache, so no extra node list is made.
+
+A stuck node is therefore removed about min_age_minutes after it went
+NotReady, instead of after the whole test run.
+"""
+
+import heapq
+import signal
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from ..models import RemediationAction
+from ..monitors.watch import ResourceWatcher
+from . import planner, stuck_nodes, vmss_ghost
+
+DEFAULT_VMSS_INTERVAL_SECONDS = 300
+# Retry delay for a stuck node whose delete failed
+REQUEUE_SECONDS = 60
+# Remediation actions kept in memory (the total is counted separately)
+MAX_ACTIONS = 1000
+
+
+class RemediationController:
+    """Watch-driven stuck-node timers plus a periodic VMSS reconcile."""
+
+    def __init__(self, resource_group: str, cluster_name: str, location: str,
+                 min_age_minutes: float = 5, vmss_min_age_minutes: float = 5,
+                 vmss_interval: int = DEFAULT_VMSS_INTERVAL_SECONDS,
+                 batch_size: int = vmss_ghost.DEFAULT_BATCH_SIZE,
+                 max_unregistered_fraction: float = vmss_ghost.DEFAULT_MAX_UNREGISTERED_FRACTION,
+                 stuck_nodes_enabled: bool = True, vmss_enabled: bool = True,
+                 max_workers: int = planner.DEFAULT_MAX_WORKERS,
+                 rate_per_second: float = planner.DEFAULT_RATE_PER_SECOND,
+                 burst: int = planner.DEFAULT_BURST, retries: int = planner.DEFAULT_RETRIES,
+                 dry_run: bool = False,
+                 on_action: Optional[Callable[[RemediationAction], None]] = None):
+        self.resource_group = resource_group
+        self.cluster_name = cluster_name
+        self.location = location
+        self.min_age_minutes = min_age_minutes
+        self.vmss_min_age_minutes = vmss_min_age_minutes
+        self.vmss_interval = vmss_interval
+        self.batch_size = batch_size
+        self.max_unregistered_fraction = max_unregistered_fraction
+        self.stuck_nodes_enabled = stuck_nodes_enabled
+        self.vmss_enabled = vmss_enabled
+        self.max_workers = max_workers
+        self.retries = retries
+        self.dry_run = dry_run
+        self.on_action = on_action
+        self.bucket = planner.TokenBucket(rate_per_second, burst)
+
+        self.actions: deque = deque(maxlen=MAX_ACTIONS)
+        self.total_actions = 0
+        self.stats = {"timers_armed": 0, "timers_cancelled": 0, "timers_fired": 0,
+                      "requeued": 0, "vmss_reconciles": 0}
+
+        self._cond = threading.Condition()
+        self._stopping = False
+        # uid -> latest node object, from the watch
+        self._nodes: Dict[str, Dict] = {}
+        # node name -> (NotReady since, deadline epoch) of its armed timer
+        self._timers: Dict[str, Tuple[datetime, float]] = {}
+        # (deadline, name, since); stale entries are skipped when popped
+        self._heap: List[Tuple[float, str, datetime]] = []
+        # node name -> NotReady since, for timers that already fired (no re-arm
+        # on later updates of the same NotReady spell, only via requeue)
+        self._fired: Dict[str, datetime] = {}
+        self._next_vmss = 0.0
+        self._watcher = ResourceWatcher("/api/v1/nodes", self._on_node, emit_initial=True)
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._watcher.start()
+        self._next_vmss = time.time() + min(self.vmss_interval, 60)
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def stop(self, *_):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+
+    def join(self):
+        """Wait for the loop to exit (after stop), then close the watch."""
+        if self.thread:
+            self.thread.join(timeout=30)
+        self._watcher.stop()
+
+    def run(self):
+        """Run in the foreground until SIGTERM or Ctrl+C."""
+        signal.signal(signal.SIGTERM, self.stop)
+        self.start()
+        try:
+            while self.thread.is_alive():
+                self.thread.join(timeout=1)
+        except KeyboardInterrupt:
+            self.stop()
+        finally:
+            self.join()
+
+    @property
+    def pending_timers(self) -> int:
+        with self._cond:
+            return len(self._timers)
+
+    def _on_node(self, event_type: str, node: Dict, observed_at: float):
+        uid = node.get("metadata", {}).get("uid", "")
+        with self._cond:
+            if event_type == "DELETED":
+                # Re-list deletions carry only the uid; the cached object has the name
+                node = self._nodes.pop(uid, node)
+                self._cancel(node.get("metadata", {}).get("name", ""))
+                return
+            self._nodes[uid] = node
+            if not self.stuck_nodes_enabled:
+                return
+            name = node.get("metadata", {}).get("name", "")
+            since = stuck_nodes.not_ready_since(node)
+            if since is None:
+                self._cancel(name)
+            elif since != self._fired.get(name) and since != self._timers.get(name, (None,))[0]:
+                self._arm(name, since, since.timestamp() + self.min_age_minutes * 60)
+
+    def _arm(self, name: str, since: datetime, deadline: float):
+        """Caller holds the condition lock."""
+        self._timers[name] = (since, deadline)
+        heapq.heappush(self._heap, (deadline, name, since))
+        self.stats["timers_armed"] += 1
+        self._cond.notify()
+
+    def _cancel(self, name: str):
+        """Caller holds the condition lock."""
+        self._fired.pop(name, None)
+        if self._timers.pop(name, None) is not None:
+            self.stats["timers_cancelled"] += 1
+
+    def _due(self, now: float) -> List[planner.PlannedAction]:
+        """Pop expired timers that are still current; caller holds the lock."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, name, since = heapq.heappop(self._heap)
+            if self._timers.get(name) != (since, deadline):
+                continue
+            del self._timers[name]
+            self._fired[name] = since
+            self.stats["timers_fired"] += 1
+            due.append(stuck_nodes.delete_action(name, (now - since.timestamp()) / 60))
+        return due
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                now = time.time()
+                wake_at = self._next_vmss if self.vmss_enabled else now + 3600
+                if self._heap:
+                    wake_at = min(wake_at, self._heap[0][0])
+                if not self._stopping and wake_at > now:
+                    self._cond.wait(wake_at - now)
+                if self._stopping:
+                    return
+                now = time.time()
+                due = self._due(now)
+                reconcile = self.vmss_enabled and now >= self._next_vmss
+                nodes = list(self._nodes.values()) if reconcile else None
+
+            if due:
+                self._execute(due, requeue=True)
+            if reconcile:
+                # Without the node list every instance would look unregistered
+                if self._watcher.synced.is_set():
+                    self._reconcile_vmss(nodes)
+                    self._next_vmss = time.time() + self.vmss_interval
+                else:
+                    self._next_vmss = time.time() + 15
+
+    def _reconcile_vmss(self, nodes: List[Dict]):
+        """One VMSS pass against the watched nodes.
+
+        A node that is also on a stuck timer may be deleted by either path;
+        the second delete finds it gone, which counts as done.
+        """
+        self.stats["vmss_reconciles"] += 1
+        plan = vmss_ghost.plan_actions(self.resource_group, self.cluster_name, self.location,
+                                       self.vmss_min_age_minutes, self.batch_size, nodes=nodes,
+                                       max_unregistered_fraction=self.max_unregistered_fraction)
+        if plan:
+            self._execute(plan, requeue=False)
+
+    def _execute(self, plan: List[planner.PlannedAction], requeue: bool):
+        if self.dry_run:
+            print(planner.format_plan(plan))
+            actions = planner.planned_entries(plan)
+        else:
+            actions = planner.execute(plan, max_workers=self.max_workers, retries=self.retries,
+                                      bucket=self.bucket)
+        for action in actions:
+            self.actions.append(action)
+            self.total_actions += 1
+            if self.on_action:
+                self.on_action(action)
+            if requeue and not action.success and not action.dry_run:
+                self._requeue(action.target)
+
+    def _requeue(self, name: str):
+        with self._cond:
+            for node in self._nodes.values():
+                if node.get("metadata", {}).get("name") == name:
+                    since = stuck_nodes.not_ready_since(node)
+                    if since is not None and name not in self._timers:
+                        self.stats["requeued"] += 1
+                        self._arm(name, since, time.time() + REQUEUE_SECONDS)
+                    return
@@ -0,0 +1,158 @@
+"""Hash-join of VMSS instances and Kubernetes nodes on their Azure resource ID.
+
+A node's ``spec.providerID`` is ``azure://`` + the resource ID of the VMSS
+instance backing it. Both sides are indexed on the normalised ID (lowercase,
+no scheme), and one pass over the union classifies:
+
+    ghost             instance in Failed/Unknown provisioning state
+    unregistered      instance (Succeeded) with no Node object
+    missing_instance  Node whose providerID points at an instance that no
+                      longer exists in its (listed) VMSS
+
+Anything younger than min_age_minutes is left alone: new instances take a
+few minutes to register, and deleted nodes take a moment to disappear.
+Without a node list (nodes_listed False) nothing is classified unregistered:
+every instance would otherwise look like one.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+GHOST_STATES = ("Failed", "Unknown")
+# Instances in these states are on their way in or out; never orphans
+TRANSITIONAL_STATES = ("Creating", "Updating", "Deleting")
+
+
+def normalize_id(resource_id: str) -> str:
+    """Canonical form of an instance resource ID or node providerID."""
+    rid = (resource_id or "").strip().lower()
+    if rid.startswith("azure://"):
+        rid = rid[len("azure://"):]
+    return "/" + rid.strip("/") if rid else ""
+
+
+def vmss_of(resource_id: str) -> str:
+    """The VMSS name in a normalised instance ID ("" if not a VMSS instance)."""
+    parts = resource_id.split("/")
+    try:
+        return parts[parts.index("virtualmachinescalesets") + 1]
+    except (ValueError, IndexError):
+        return ""
+
+
+def _age_minutes(timestamp: str, now: datetime) -> Optional[float]:
+    if not timestamp:
+        return None
+    try:
+        ts = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return (now - ts).total_seconds() / 60
+
+
+@dataclass
+class Orphan:
+    kind: str  # "ghost", "unregistered", "missing_instance"
+    resource_id: str
+    vmss: str
+    instance_id: str = ""
+    node: str = ""
+    age_minutes: float = 0.0
+    state: str = ""
+
+
+@dataclass
+class OrphanIndex:
+    instances: Dict[str, Dict] = field(default_factory=dict)
+    nodes: Dict[str, Dict] = field(default_factory=dict)
+    # VMSS names whose instances were listed; nodes are only judged against these
+    listed_vmss: set = field(default_factory=set)
+    # False when the node list could not be fetched; only ghosts are judged then
+    nodes_listed: bool = True
+
+    @classmethod
+    def build(cls, instances: List[Dict], nodes: Optional[List[Dict]], listed_vmss=()) -> "OrphanIndex":
+        """Index both sides; nodes None means the node list is unavailable."""
+        index = cls(listed_vmss={name.lower() for name in listed_vmss}, nodes_listed=nodes is not None)
+        nodes = nodes or []
+        for instance in instances:
+            rid = normalize_id(instance.get("id", ""))
+            if rid:
+                index.instances[rid] = instance
+        for node in nodes:
+            rid = normalize_id(node.get("spec", {}).get("providerID", ""))
+            if rid:
+                index.nodes[rid] = node
+        return index
+
+    def classify(self, min_age_minutes: float = 5, now: Optional[datetime] = None) -> List[Orphan]:
+        """Find every orphan in one pass over both key sets."""
+        now = now or datetime.now(timezone.utc)
+        orphans = []
+        for rid in self.instances.keys() | self.nodes.keys():
+            instance, node = self.instances.get(rid), self.nodes.get(rid)
+            if instance is not None:
+                orphan = self._classify_instance(rid, instance, node, now)
+            else:
+                orphan = self._classify_node(rid, node, now)
+            if orphan and orphan.age_minutes >= min_age_minutes:
+                orphans.append(orphan)
+        orphans.sort(key=lambda o: (o.kind, o.resource_id))
+        return orphans
+
+    def _classify_instance(self, rid: str, instance: Dict, node: Optional[Dict],
+                           now: datetime) -> Optional[Orphan]:
+        state = instance.get("provisioningState", "")
+        if state in GHOST_STATES:
+            kind = "ghost"
+        elif node is None and self.nodes_listed and state not in TRANSITIONAL_STATES:
+            kind = "unregistered"
+        else:
+            return None
+        age = _age_minutes(instance.get("timeCreated", ""), now)
+        if age is None:
+            return None
+        return Orphan(kind=kind, resource_id=rid, vmss=instance.get("_vmss") or vmss_of(rid),
+                      instance_id=str(instance.get("instanceId", "")), age_minutes=age, state=state,
+                      node=(node or {}).get("metadata", {}).get("name", ""))
+
+    def _classify_node(self, rid: str, node: Dict, now: datetime) -> Optional[Orphan]:
+        vmss = vmss_of(rid)
+        # A node on a VMSS we could not list is unknown, not orphaned
+        if not vmss or vmss not in self.listed_vmss:
+            return None
+        age = _age_minutes(node.get("metadata", {}).get("creationTimestamp", ""), now)
+        if age is None:
+            return None
+        return Orphan(kind="missing_instance", resource_id=rid, vmss=vmss,
+                      instance_id=rid.rsplit("/", 1)[-1], age_minutes=age,
+                      node=node.get("metadata", {}).get("name", ""))
+
+
+def batches(items: List, size: int) -> List[List]:
+    return [items[i:i + size] for i in range(0, len(items), max(1, size))]
+
+
+def group_by_vmss(orphans: List[Orphan]) -> Dict[str, List[Orphan]]:
+    groups: Dict[str, List[Orphan]] = {}
+    for orphan in orphans:
+        groups.setdefault(orphan.vmss, []).append(orphan)
+    return groups
+
+
+def instance_counts(index: OrphanIndex) -> Dict[str, int]:
+    """VMSS name -> instances listed in it."""
+    counts: Dict[str, int] = {}
+    for rid, instance in index.instances.items():
+        vmss = instance.get("_vmss") or vmss_of(rid)
+        counts[vmss] = counts.get(vmss, 0) + 1
+    return counts
+
+
+def summary(orphans: List[Orphan]) -> Tuple[int, int, int]:
+    """Counts of (ghost, unregistered, missing_instance) orphans."""
+    kinds = [o.kind for o in orphans]
+    return kinds.count("ghost"), kinds.count("unregistered"), kinds.count("missing_instance")
@@ -0,0 +1,157 @@
+"""Plan/execute remediation engine.
+
+Detectors (vmss_ghost.plan_actions, stuck_nodes.plan_actions) only describe
+what they would do, as PlannedAction entries. ``build_plan`` merges them and
+drops duplicate targets: a node already deleted as an orphan is not deleted
+again as a stuck node. The full plan can then be printed (``remediate
+--plan``) or run with ``execute``:
+
+    - a bounded worker pool runs actions concurrently
+    - a token bucket limits how fast commands hit the Azure/Kubernetes APIs
+    - each action is retried with exponential backoff; "not found" counts as
+      done, since the target is already gone
+
+Every target gets a RemediationAction carrying its attempts and latency.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+from ..models import RemediationAction
+from ..utils import run_command
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_RATE_PER_SECOND = 2.0
+DEFAULT_BURST = 5
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF_SECONDS = 2.0
+
+_NOT_FOUND_MARKERS = ("notfound", "not found", "could not be found")
+
+
+@dataclass
+class PlannedAction:
+    """One command to run, covering one or more targets."""
+    action_type: str
+    targets: List[str]
+    command: List[str]
+    reason: str
+    timeout: int = 300
+    # Per-target reasons for batched actions (falls back to reason)
+    target_reasons: Dict[str, str] = field(default_factory=dict)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: rate tokens per second, up to burst at once."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def build_plan(*action_lists: List[PlannedAction]) -> List[PlannedAction]:
+    """Concatenate detector plans, skipping actions on targets an earlier action covers."""
+    plan, covered = [], set()
+    for actions in action_lists:
+        for action in actions:
+            if covered.intersection(action.targets):
+                continue
+            covered.update(action.targets)
+            plan.append(action)
+    return plan
+
+
+def format_plan(plan: List[PlannedAction]) -> str:
+    if not plan:
+        return "Nothing to remediate."
+    lines = [f"{len(plan)} action(s), {sum(len(a.targets) for a in plan)} target(s):"]
+    for i, action in enumerate(plan, 1):
+        lines.append(f"  {i}. {action.action_type}: {', '.join(action.targets)}")
+        lines.append(f"     reason:  {action.reason}")
+        lines.append(f"     command: {' '.join(action.command)}")
+    return "\n".join(lines)
+
+
+def planned_entries(plan: List[PlannedAction]) -> List[RemediationAction]:
+    """RemediationAction records for a plan that was not executed (dry run)."""
+    return [
+        RemediationAction(
+            timestamp=datetime.now(),
+            action_type=action.action_type,
+            target=target,
+            success=False,
+            details=f"Planned (dry run): {action.target_reasons.get(target, action.reason)}",
+            dry_run=True
+        )
+        for action in plan for target in action.targets
+    ]
+
+
+def execute(plan: List[PlannedAction], max_workers: int = DEFAULT_MAX_WORKERS,
+            rate_per_second: float = DEFAULT_RATE_PER_SECOND, burst: int = DEFAULT_BURST,
+            retries: int = DEFAULT_RETRIES, backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+            bucket: Optional[TokenBucket] = None) -> List[RemediationAction]:
+    """Run the plan on a worker pool under a shared rate limit.
+
+    Pass a long-lived bucket to keep one rate limit across several calls.
+    """
+    bucket = bucket or TokenBucket(rate_per_second, burst)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        outcomes = list(pool.map(lambda a: _run(a, bucket, retries, backoff_seconds), plan))
+    return [entry for entries in outcomes for entry in entries]
+
+
+def _run(action: PlannedAction, bucket: TokenBucket, retries: int,
+         backoff_seconds: float) -> List[RemediationAction]:
+    start = time.time()
+    error: Optional[str] = None
+    attempts = 0
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(backoff_seconds * 2 ** (attempt - 1))
+        bucket.acquire()
+        attempts += 1
+        result = run_command(action.command, timeout=action.timeout)
+        output = f"{result.stdout} {result.stderr}".lower()
+        if result.returncode == 0 or any(marker in output for marker in _NOT_FOUND_MARKERS):
+            error = None
+            break
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"exit code {result.returncode}"
+
+    duration = round(time.time() - start, 2)
+    details_suffix = f" (error: {error})" if error else ""
+    if len(action.targets) > 1:
+        details_suffix += f" (batch of {len(action.targets)})"
+    return [
+        RemediationAction(
+            timestamp=datetime.now(),
+            action_type=action.action_type,
+            target=target,
+            success=error is None,
+            details=action.target_reasons.get(target, action.reason) + details_suffix,
+            duration_seconds=duration,
+            attempts=attempts
+        )
+        for target in action.targets
+    ]
@@ -1,13 +1,43 @@
 """Stuck node detection and removal."""
 
-from datetime import datetime, timedelta
-from typing import List
+from datetime import datetime
+from typing import Dict, List, Optional
 from ..models import RemediationAction
-from ..utils import run_kubectl, run_command
-
-
-def detect_and_remediate(min_age_minutes: int = 5) -> List[RemediationAction]:
-    """Detect and delete NotReady nodes stuck for > min_age_minutes."""
+from ..utils import run_kubectl
+from . import planner
+from .planner import PlannedAction
+
+
+def not_ready_since(node: Dict) -> Optional[datetime]:
+    """When the node's Ready condition turned False (None if it is Ready, or has no timestamp)."""
+    for condition in node.get("status", {}).get("conditions", []):
+        if condition.get("type") != "Ready":
+            continue
+        last_transition = condition.get("lastTransitionTime")
+        if condition.get("status") != "False" or not last_transition:
+            return None
+        try:
+            return datetime.fromisoformat(last_transition.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    return None
+
+
+def delete_action(node_name: str, age_minutes: float) -> PlannedAction:
+    return PlannedAction(
+        action_type="delete_stuck_node",
+        targets=[node_name],
+        command=["kubectl", "delete", "node", node_name],
+        reason=f"Node NotReady for {age_minutes:.1f} minutes"
+    )
+
+
+def plan_actions(min_age_minutes: int = 5) -> List[PlannedAction]:
+    """Plan one delete per node NotReady for > min_age_minutes.
+
+    Nodes are deleted one per action (not batched) so each gets its own
+    retries: a node that is already gone doesn't fail the others.
+    """
     actions = []
 
     nodes = run_kubectl(["get", "nodes"], output_json=True)
@@ -15,44 +45,16 @@ def detect_and_remediate(min_age_minutes: int = 5) -> List[RemediationAction]:
         return actions
 
     for node in nodes.get("items", []):
-        node_name = node.get("metadata", {}).get("name", "")
-
-        # Check if NotReady
-        is_ready = False
-        for condition in node.get("status", {}).get("conditions", []):
-            if condition.get("type") == "Ready":
-                is_ready = condition.get("status") == "True"
-                break
-
-        if not is_ready:
-            # Check age of NotReady condition
-            for condition in node.get("status", {}).get("conditions", []):
-                if condition.get("type") == "Ready" and condition.get("status") == "False":
-                    last_transition = condition.get("lastTransitionTime")
-                    if last_transition:
-                        try:
-                            transition_time = datetime.fromisoformat(last_transition.replace('Z', '+00:00'))
-                            age_minutes = (datetime.now(transition_time.tzinfo) - transition_time).total_seconds() / 60
-
-                            if age_minutes >= min_age_minutes:
-                                # Delete stuck node
-                                result = run_command(["kubectl", "delete", "node", node_name])
-                                success = result.returncode == 0
-
-                                actions.append(RemediationAction(
-                                    timestamp=datetime.now(),
-                                    action_type="delete_stuck_node",
-                                    target=node_name,
-                                    success=success,
-                                    details=f"Node NotReady for {age_minutes:.1f} minutes"
-                                ))
-                        except Exception as e:
-                            actions.append(RemediationAction(
-                                timestamp=datetime.now(),
-                                action_type="delete_stuck_node",
-                                target=node_name,
-                                success=False,
-                                details=f"Error: {str(e)}"
-                            ))
+        since = not_ready_since(node)
+        if since is None:
+            continue
+        age_minutes = (datetime.now(since.tzinfo) - since).total_seconds() / 60
+        if age_minutes >= min_age_minutes:
+            actions.append(delete_action(node.get("metadata", {}).get("name", ""), age_minutes))
 
     return actions
+
+
+def detect_and_remediate(min_age_minutes: int = 5) -> List[RemediationAction]:
+    """Detect and delete NotReady nodes stuck for > min_age_minutes."""
+    return planner.execute(plan_actions(min_age_minutes))
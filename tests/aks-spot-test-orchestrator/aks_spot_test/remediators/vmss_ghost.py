@@ -1,66 +1,140 @@
-"""VMSS ghost instance detection and removal."""
+"""VMSS ghost and orphan detection and removal.
 
-from datetime import datetime, timedelta
-from typing import List
+VMSS instances and Kubernetes nodes are joined in an OrphanIndex (see
+orphan_index), which finds failed ghost instances, instances that never
+registered a node, and nodes whose instance is gone, all in one pass.
+plan_actions turns them into one ``az vmss delete-instances`` per VMSS and
+batch, and one ``kubectl delete node`` per batch, for planner.execute.
+
+Unregistered instances are judged against the node list, so two guards keep a
+bad or partial node list from deleting healthy capacity: if ``kubectl get
+nodes`` fails only ghosts are acted on, and at most max_unregistered_fraction
+of each VMSS's instances are deleted as unregistered in one pass (oldest first).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from ..models import RemediationAction
-from ..utils import run_az
+from ..utils import run_az, run_kubectl
+from . import planner
+from .orphan_index import Orphan, OrphanIndex, batches, group_by_vmss, instance_counts, summary
+from .planner import PlannedAction
 
+DEFAULT_BATCH_SIZE = 20
+DEFAULT_MAX_UNREGISTERED_FRACTION = 0.5
 
-def detect_and_remediate(resource_group: str, cluster_name: str, location: str, min_age_minutes: int = 5) -> List[RemediationAction]:
-    """Detect and delete VMSS ghost instances."""
-    actions = []
+ACTION_TYPES = {
+    "ghost": "delete_vmss_ghost",
+    "unregistered": "delete_orphan_instance",
+    "missing_instance": "delete_orphan_node",
+}
+
+
+def collect(resource_group: str, cluster_name: str, location: str,
+            nodes: Optional[List[Dict]] = None) -> Tuple[OrphanIndex, str]:
+    """List VMSS instances (in parallel per VMSS) and nodes; return (index, node resource group).
+
+    Callers that already hold the node list (e.g. from a watch) pass it as
+    nodes, and only the VMSS side is listed.
+    """
     mc_rg = f"MC_{resource_group}_{cluster_name}_{location}"
+    vmss_names = [v.get("name", "") for v in run_az(["vmss", "list", "-g", mc_rg]) or []]
+
+    def list_instances(name: str):
+        return name, run_az(["vmss", "list-instances", "-n", name, "-g", mc_rg])
+
+    instances: List[Dict] = []
+    listed = []
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for name, items in pool.map(list_instances, vmss_names):
+            if items is None:
+                continue
+            listed.append(name)
+            for instance in items:
+                instance["_vmss"] = name
+                instances.append(instance)
+
+    if nodes is None:
+        node_list = run_kubectl(["get", "nodes"], output_json=True)
+        if node_list is None:
+            print("    ⚠️  Could not list nodes; only ghost instances will be considered")
+        else:
+            nodes = node_list.get("items", [])
+    return OrphanIndex.build(instances, nodes, listed), mc_rg
+
+
+def detect(resource_group: str, cluster_name: str, location: str, min_age_minutes: int = 5,
+           nodes: Optional[List[Dict]] = None) -> Tuple[List[Orphan], str]:
+    index, mc_rg = collect(resource_group, cluster_name, location, nodes)
+    return index.classify(min_age_minutes), mc_rg
 
-    # Get all VMSS in managed cluster resource group
-    vmss_list = run_az(["vmss", "list", "-g", mc_rg])
-    if not vmss_list:
-        return actions
-
-    for vmss in vmss_list:
-        vmss_name = vmss.get("name", "")
-
-        # Get instances
-        instances = run_az(["vmss", "list-instances", "-n", vmss_name, "-g", mc_rg])
-        if not instances:
-            continue
-
-        for instance in instances:
-            instance_id = instance.get("instanceId", "")
-            provisioning_state = instance.get("provisioningState", "")
-
-            # Check if ghost (Failed/Unknown state)
-            if provisioning_state in ["Failed", "Unknown"]:
-                # Check age (only delete if stuck for > min_age_minutes)
-                created_time_str = instance.get("timeCreated")
-                if created_time_str:
-                    try:
-                        created_time = datetime.fromisoformat(created_time_str.replace('Z', '+00:00'))
-                        age_minutes = (datetime.now(created_time.tzinfo) - created_time).total_seconds() / 60
-
-                        if age_minutes >= min_age_minutes:
-                            # Delete ghost instance
-                            result = run_az([
-                                "vmss", "delete-instances",
-                                "-n", vmss_name,
-                                "-g", mc_rg,
-                                "--instance-ids", instance_id
-                            ], output_json=False)
-
-                            success = result is not None
-                            actions.append(RemediationAction(
-                                timestamp=datetime.now(),
-                                action_type="delete_vmss_ghost",
-                                target=f"{vmss_name}/{instance_id}",
-                                success=success,
-                                details=f"Instance in {provisioning_state} state for {age_minutes:.1f} minutes"
-                            ))
-                    except Exception as e:
-                        actions.append(RemediationAction(
-                            timestamp=datetime.now(),
-                            action_type="delete_vmss_ghost",
-                            target=f"{vmss_name}/{instance_id}",
-                            success=False,
-                            details=f"Error: {str(e)}"
-                        ))
+
+def plan_actions(resource_group: str, cluster_name: str, location: str, min_age_minutes: int = 5,
+                 batch_size: int = DEFAULT_BATCH_SIZE, nodes: Optional[List[Dict]] = None,
+                 max_unregistered_fraction: float = DEFAULT_MAX_UNREGISTERED_FRACTION) -> List[PlannedAction]:
+    """Detect ghost/orphan instances and orphan nodes; plan batched deletes for them."""
+    index, mc_rg = collect(resource_group, cluster_name, location, nodes)
+    orphans = index.classify(min_age_minutes)
+    ghosts, unregistered, missing = summary(orphans)
+    if orphans:
+        print(f"    Found {ghosts} ghost, {unregistered} unregistered instance(s), "
+              f"{missing} node(s) without instance")
+
+    actions = []
+    instance_orphans = [o for o in orphans if o.kind != "missing_instance"]
+    sizes = instance_counts(index)
+    for vmss, group in group_by_vmss(instance_orphans).items():
+        group = _cap_unregistered(vmss, group, sizes.get(vmss, 0), max_unregistered_fraction)
+        # Ghosts and unregistered instances are separate actions so each keeps its action type
+        for kind in ("ghost", "unregistered"):
+            for batch in batches([o for o in group if o.kind == kind], batch_size):
+                actions.append(_planned(batch, [
+                    "az", "vmss", "delete-instances",
+                    "-n", vmss,
+                    "-g", mc_rg,
+                    "--instance-ids", *[o.instance_id for o in batch]
+                ]))
+
+    node_orphans = [o for o in orphans if o.kind == "missing_instance"]
+    for batch in batches(node_orphans, batch_size):
+        actions.append(_planned(batch, ["kubectl", "delete", "node", *[o.node for o in batch]]))
 
     return actions
+
+
+def detect_and_remediate(resource_group: str, cluster_name: str, location: str, min_age_minutes: int = 5,
+                         batch_size: int = DEFAULT_BATCH_SIZE) -> List[RemediationAction]:
+    """Detect ghost/orphan instances and orphan nodes, and delete them in batches."""
+    return planner.execute(plan_actions(resource_group, cluster_name, location, min_age_minutes, batch_size))
+
+
+def _cap_unregistered(vmss: str, group: List[Orphan], size: int, fraction: float) -> List[Orphan]:
+    """Keep at most fraction of the VMSS's instances as unregistered deletes, oldest first."""
+    unregistered = [o for o in group if o.kind == "unregistered"]
+    limit = max(1, int(size * fraction))
+    if len(unregistered) <= limit:
+        return group
+    print(f"    ⚠️  {vmss}: {len(unregistered)} of {size} instance(s) look unregistered; "
+          f"deleting only the {limit} oldest this pass")
+    keep = sorted(unregistered, key=lambda o: o.age_minutes, reverse=True)[:limit]
+    return [o for o in group if o.kind != "unregistered"] + keep
+
+
+def _planned(batch: List[Orphan], command: List[str]) -> PlannedAction:
+    reasons = {}
+    for orphan in batch:
+        if orphan.kind == "ghost":
+            details = f"Instance in {orphan.state} state for {orphan.age_minutes:.1f} minutes"
+        elif orphan.kind == "unregistered":
+            details = f"Instance has no Kubernetes node after {orphan.age_minutes:.1f} minutes"
+        else:
+            details = f"Node's VMSS instance {orphan.vmss}/{orphan.instance_id} no longer exists"
+        target = orphan.node if orphan.kind == "missing_instance" else f"{orphan.vmss}/{orphan.instance_id}"
+        reasons[target] = details
+    return PlannedAction(
+        action_type=ACTION_TYPES[batch[0].kind],
+        targets=list(reasons),
+        command=command,
+        reason=f"{len(batch)} {batch[0].kind} orphan(s)",
+        target_reasons=reasons
+    )
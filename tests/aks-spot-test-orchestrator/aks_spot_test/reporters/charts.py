@@ -0,0 +1,60 @@
+"""Small dependency-free charts of the cluster timeline for the reports."""
+
+from typing import Dict, List
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+# Series charted from ClusterSnapshot timelines: key -> (label, colour)
+TIMELINE_SERIES = {
+    "total_nodes": ("Nodes", "#0d6efd"),
+    "spot_nodes": ("Spot nodes", "#198754"),
+    "pending_pods": ("Pending pods", "#dc3545"),
+}
+
+
+def downsample(values: List[float], width: int) -> List[float]:
+    """Reduce to at most width points, keeping each bucket's maximum (spikes stay visible)."""
+    if len(values) <= width:
+        return list(values)
+    step = len(values) / width
+    return [max(values[int(i * step):max(int((i + 1) * step), int(i * step) + 1)]) for i in range(width)]
+
+
+def sparkline(values: List[float], width: int = 60) -> str:
+    points = downsample(values, width)
+    if not points:
+        return ""
+    low, high = min(points), max(points)
+    span = (high - low) or 1
+    return "".join(SPARK_CHARS[int((v - low) / span * (len(SPARK_CHARS) - 1))] for v in points)
+
+
+def timeline_svg(timeline: Dict, width: int = 800, height: int = 200) -> str:
+    """Inline SVG line chart of the timeline's node, spot and pending series."""
+    t = timeline.get("t", [])
+    if len(t) < 2:
+        return ""
+    series = {key: timeline[key] for key in TIMELINE_SERIES if timeline.get(key)}
+    top = max((max(values) for values in series.values()), default=0) or 1
+    duration = (t[-1] - t[0]) or 1
+    pad = 30
+
+    def x(ts: float) -> float:
+        return pad + (ts - t[0]) / duration * (width - 2 * pad)
+
+    def y(v: float) -> float:
+        return height - pad - v / top * (height - 2 * pad)
+
+    parts = [
+        f'<svg viewBox="0 0 {width} {height}" width="100%" role="img" aria-label="Cluster timeline">',
+        f'<line x1="{pad}" y1="{height - pad}" x2="{width - pad}" y2="{height - pad}" stroke="#adb5bd"/>',
+        f'<text x="2" y="{pad}" font-size="11">{top}</text>',
+        f'<text x="{width - pad}" y="{height - 8}" font-size="11" text-anchor="end">{duration // 60}m</text>',
+    ]
+    for i, (key, values) in enumerate(series.items()):
+        label, colour = TIMELINE_SERIES[key]
+        points = " ".join(f"{x(ts):.1f},{y(v):.1f}" for ts, v in zip(t, values))
+        parts.append(f'<polyline fill="none" stroke="{colour}" stroke-width="2" points="{points}"/>')
+        parts.append(f'<text x="{pad + 10 + i * 120}" y="14" font-size="12" fill="{colour}">{label}</text>')
+    parts.append("</svg>")
+    return "".join(parts)
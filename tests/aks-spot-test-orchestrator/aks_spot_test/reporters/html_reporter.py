@@ -1,153 +1,194 @@
-"""HTML report generator."""
+"""HTML report generator.
+
+The document is streamed to the file section by section; nothing the size
+of the results table is ever built in memory. Every value is HTML-escaped.
+The results are embedded once as compact JSON rows and paged and filtered
+by a small inline script, so the browser only ever has one page of rows in
+the DOM, even with 50k results. The first page is also rendered server-side
+so the report reads without JavaScript. CSS is inline; the report has no
+external dependencies and works offline.
+"""
 
-import os
+import json
+from html import escape
+from typing import Optional, TextIO
 from ..models import TestReport
+from .view import ReportView, build_view
+
+PAGE_SIZE = 100
+# Rows serialised per write() of the embedded JSON
+CHUNK_ROWS = 1000
 
+# Keep "</script>" and "<!--" in test data from ending the data block early
+_JSON_SCRIPT_ESCAPES = str.maketrans({"<": "\\u003c", ">": "\\u003e", "&": "\\u0026"})
 
-def generate_report(report: TestReport, output_path: str):
+
+def generate_report(report: TestReport, output_path: str, view: Optional[ReportView] = None):
     """Generate HTML report file."""
-    template = _get_html_template()
-
-    # Replace placeholders
-    html = template.replace("{{CLUSTER_NAME}}", report.cluster_name)
-    html = html.replace("{{TIMESTAMP}}", report.timestamp.strftime('%Y-%m-%d %H:%M:%S'))
-    html = html.replace("{{DURATION}}", _format_duration(report.duration_seconds))
-    html = html.replace("{{PASS_RATE}}", f"{report.pass_rate:.1f}")
-    html = html.replace("{{TOTAL_TESTS}}", str(report.total_tests))
-    html = html.replace("{{PASSED}}", str(report.passed))
-    html = html.replace("{{FAILED}}", str(report.failed))
-    html = html.replace("{{SKIPPED}}", str(report.skipped))
-    html = html.replace("{{EVICTION_RATE}}", f"{report.eviction_rate_per_hour:.1f}")
-    html = html.replace("{{REMEDIATION_COUNT}}", str(len(report.remediation_actions)))
-
-    # Build test results table
-    results_html = ""
-    for result in report.test_results:
-        status_class = "success" if result.status == "PASS" else "danger" if result.status == "FAIL" else "warning"
-        status_icon = "✅" if result.status == "PASS" else "❌" if result.status == "FAIL" else "⏭️"
-
-        results_html += f"""
-        <tr class="table-{status_class}">
-            <td>{status_icon} {result.test_id}</td>
-            <td>{result.name}</td>
-            <td>{result.framework}</td>
-            <td>{result.category}</td>
-            <td>{result.duration_seconds:.1f}s</td>
-        </tr>
-        """
-
-    html = html.replace("{{TEST_RESULTS}}", results_html)
-
-    # Write file
-    with open(output_path, 'w') as f:
-        f.write(html)
-
-
-def _format_duration(seconds: float) -> str:
-    """Format duration in human-readable form."""
-    minutes = int(seconds // 60)
-    secs = int(seconds % 60)
-    return f"{minutes}m {secs}s"
-
-
-def _get_html_template() -> str:
-    """Get minimal HTML template."""
-    return """<!DOCTYPE html>
+    view = view or build_view(report)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(_HEAD)
+        _write_summary(f, view)
+        if view.timeline_svg:
+            f.write('<section><h3>Cluster Timeline</h3>')
+            f.write(view.timeline_svg)
+            f.write('</section>\n')
+        _write_results(f, view)
+        if view.remediations:
+            _write_remediations(f, view)
+        f.write(_FOOTER)
+
+
+def _write_summary(f: TextIO, view: ReportView):
+    f.write(f"""<h1>AKS Spot Test Report</h1>
+<p class="muted"><strong>Cluster:</strong> {escape(view.cluster_name)} |
+<strong>Date:</strong> {escape(view.timestamp)} |
+<strong>Duration:</strong> {escape(view.duration)}</p>
+<hr>
+<div class="cards">
+<div class="card"><h5>Pass Rate</h5><h2>{view.pass_rate:.1f}%</h2></div>
+<div class="card"><h5>Total Tests</h5><h2>{view.total}</h2></div>
+<div class="card"><h5>Eviction Rate</h5><h2>{view.eviction_rate:.1f}/hr</h2></div>
+<div class="card"><h5>Remediations</h5><h2>{view.remediation_count}</h2></div>
+</div>
+<section><h3>Test Summary</h3><p>
+<span class="badge success">✅ {view.passed} Passed</span>
+<span class="badge danger">❌ {view.failed} Failed</span>
+<span class="badge warning">⏭️ {view.skipped} Skipped</span>
+</p></section>
+""")
+
+
+def _row_html(row) -> str:
+    return (f'<tr class="{row.status_class}"><td>{row.status_icon} {escape(row.test_id)}</td>'
+            f'<td>{escape(row.name)}</td><td>{escape(row.framework)}</td>'
+            f'<td>{escape(row.category)}</td><td>{row.duration}</td></tr>\n')
+
+
+def _write_results(f: TextIO, view: ReportView):
+    f.write("""<section><h3>Test Results</h3>
+<div class="filters">
+<input id="q" type="search" placeholder="Filter by ID, name, framework or category">
+<select id="status"><option value="">All statuses</option>
+<option value="FAIL">Failed</option><option value="PASS">Passed</option><option value="SKIP">Skipped</option></select>
+<span id="count"></span>
+</div>
+<table><thead><tr><th>Test ID</th><th>Name</th><th>Framework</th><th>Category</th><th>Duration</th></tr></thead>
+<tbody id="rows">
+""")
+    # First page server-side; the script replaces it
+    for row in view.results[:PAGE_SIZE]:
+        f.write(_row_html(row))
+    f.write("""</tbody></table>
+<div class="pager"><button id="prev">&larr; Prev</button> <span id="page"></span> <button id="next">Next &rarr;</button></div>
+</section>
+<script type="application/json" id="results-data">[""")
+
+    # [status, test_id, name, framework, category, duration], streamed in chunks
+    results = view.results
+    for start in range(0, len(results), CHUNK_ROWS):
+        chunk = ",".join(
+            json.dumps([r.status, r.test_id, r.name, r.framework, r.category, r.duration],
+                       ensure_ascii=False, separators=(",", ":"))
+            for r in results[start:start + CHUNK_ROWS]
+        )
+        f.write(("," if start else "") + chunk.translate(_JSON_SCRIPT_ESCAPES))
+    f.write(f"]</script>\n<script>const PAGE_SIZE = {PAGE_SIZE};\n{_SCRIPT}</script>\n")
+
+
+def _write_remediations(f: TextIO, view: ReportView):
+    f.write("<section><h3>Remediation Actions</h3>\n<table><thead><tr><th>Time</th><th>Action Type</th>"
+            "<th>Target</th><th>Status</th><th>Duration</th><th>Attempts</th><th>Details</th></tr></thead><tbody>\n")
+    for row in view.remediations:
+        f.write(f"<tr><td>{row.time}</td><td>{escape(row.action_type)}</td><td>{escape(row.target)}</td>"
+                f"<td>{row.status}</td><td>{row.duration}</td><td>{row.attempts}</td>"
+                f"<td>{escape(row.details)}</td></tr>\n")
+    f.write("</tbody></table></section>\n")
+
+
+_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AKS Spot Test Report</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-    <style>
-        body { padding: 20px; }
-        .stat-card { margin-bottom: 20px; }
-        .badge-custom { font-size: 1.2em; }
-    </style>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>AKS Spot Test Report</title>
+<style>
+body { font-family: system-ui, -apple-system, "Segoe UI", Roboto, sans-serif; margin: 0; padding: 20px; color: #212529; }
+.container { max-width: 1140px; margin: 0 auto; }
+.muted { color: #6c757d; }
+section { margin-top: 1.5rem; }
+.cards { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 1rem; }
+.card { border: 1px solid #dee2e6; border-radius: 6px; padding: 1rem; }
+.card h5 { margin: 0 0 .5rem; font-weight: 500; }
+.card h2 { margin: 0; }
+.badge { display: inline-block; padding: .35em .65em; border-radius: 6px; font-size: 1.2em; color: #fff; }
+.badge.success { background: #198754; }
+.badge.danger { background: #dc3545; }
+.badge.warning { background: #ffc107; color: #212529; }
+table { width: 100%; border-collapse: collapse; }
+th, td { text-align: left; padding: .5rem; border-bottom: 1px solid #dee2e6; }
+tr.success { background: #d1e7dd; }
+tr.danger { background: #f8d7da; }
+tr.warning { background: #fff3cd; }
+.filters { display: flex; gap: .5rem; align-items: center; margin-bottom: .5rem; }
+.filters input { flex: 1; padding: .375rem .75rem; }
+.filters select, .pager button { padding: .375rem .75rem; }
+.pager { margin-top: .5rem; text-align: center; }
+footer { margin-top: 3rem; text-align: center; color: #6c757d; }
+</style>
 </head>
 <body>
-    <div class="container">
-        <h1>AKS Spot Test Report</h1>
-        <p class="text-muted">
-            <strong>Cluster:</strong> {{CLUSTER_NAME}} |
-            <strong>Date:</strong> {{TIMESTAMP}} |
-            <strong>Duration:</strong> {{DURATION}}
-        </p>
-        <hr>
-
-        <!-- Summary Cards -->
-        <div class="row">
-            <div class="col-md-3">
-                <div class="card stat-card">
-                    <div class="card-body">
-                        <h5 class="card-title">Pass Rate</h5>
-                        <h2>{{PASS_RATE}}%</h2>
-                    </div>
-                </div>
-            </div>
-            <div class="col-md-3">
-                <div class="card stat-card">
-                    <div class="card-body">
-                        <h5 class="card-title">Total Tests</h5>
-                        <h2>{{TOTAL_TESTS}}</h2>
-                    </div>
-                </div>
-            </div>
-            <div class="col-md-3">
-                <div class="card stat-card">
-                    <div class="card-body">
-                        <h5 class="card-title">Eviction Rate</h5>
-                        <h2>{{EVICTION_RATE}}/hr</h2>
-                    </div>
-                </div>
-            </div>
-            <div class="col-md-3">
-                <div class="card stat-card">
-                    <div class="card-body">
-                        <h5 class="card-title">Remediations</h5>
-                        <h2>{{REMEDIATION_COUNT}}</h2>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <!-- Test Summary -->
-        <div class="row mt-4">
-            <div class="col-md-12">
-                <h3>Test Summary</h3>
-                <p>
-                    <span class="badge bg-success badge-custom">✅ {{PASSED}} Passed</span>
-                    <span class="badge bg-danger badge-custom">❌ {{FAILED}} Failed</span>
-                    <span class="badge bg-warning badge-custom">⏭️ {{SKIPPED}} Skipped</span>
-                </p>
-            </div>
-        </div>
-
-        <!-- Test Results Table -->
-        <div class="row mt-4">
-            <div class="col-md-12">
-                <h3>Test Results</h3>
-                <table class="table table-striped table-hover">
-                    <thead>
-                        <tr>
-                            <th>Test ID</th>
-                            <th>Name</th>
-                            <th>Framework</th>
-                            <th>Category</th>
-                            <th>Duration</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {{TEST_RESULTS}}
-                    </tbody>
-                </table>
-            </div>
-        </div>
-
-        <footer class="mt-5 text-center text-muted">
-            <p>Generated by <code>aks-spot-test</code> v1.0.0</p>
-        </footer>
-    </div>
+<div class="container">
+"""
+
+_SCRIPT = """(function () {
+  const rows = JSON.parse(document.getElementById("results-data").textContent);
+  const icons = {PASS: "✅", FAIL: "❌", SKIP: "⏭️"};
+  const classes = {PASS: "success", FAIL: "danger", SKIP: "warning"};
+  const tbody = document.getElementById("rows");
+  const q = document.getElementById("q"), status = document.getElementById("status");
+  let matches = rows, page = 0;
+
+  function cell(text) {
+    const td = document.createElement("td");
+    td.textContent = text;
+    return td;
+  }
+
+  function render() {
+    const pages = Math.max(1, Math.ceil(matches.length / PAGE_SIZE));
+    page = Math.min(page, pages - 1);
+    const fragment = document.createDocumentFragment();
+    for (const r of matches.slice(page * PAGE_SIZE, (page + 1) * PAGE_SIZE)) {
+      const tr = document.createElement("tr");
+      tr.className = classes[r[0]] || "warning";
+      tr.append(cell((icons[r[0]] || "⏭️") + " " + r[1]), cell(r[2]), cell(r[3]), cell(r[4]), cell(r[5]));
+      fragment.append(tr);
+    }
+    tbody.replaceChildren(fragment);
+    document.getElementById("page").textContent = "Page " + (page + 1) + " of " + pages;
+    document.getElementById("count").textContent = matches.length + " of " + rows.length + " tests";
+  }
+
+  function filter() {
+    const text = q.value.trim().toLowerCase(), wanted = status.value;
+    matches = rows.filter(r => (!wanted || r[0] === wanted) &&
+      (!text || (r[1] + " " + r[2] + " " + r[3] + " " + r[4]).toLowerCase().includes(text)));
+    page = 0;
+    render();
+  }
+
+  let timer;
+  q.addEventListener("input", () => { clearTimeout(timer); timer = setTimeout(filter, 150); });
+  status.addEventListener("change", filter);
+  document.getElementById("prev").addEventListener("click", () => { if (page > 0) { page--; render(); } });
+  document.getElementById("next").addEventListener("click", () => { page++; render(); });
+  render();
+})();
+"""
+
+_FOOTER = """<footer><p>Generated by <code>aks-spot-test</code> v1.0.0</p></footer>
+</div>
 </body>
 </html>
 """
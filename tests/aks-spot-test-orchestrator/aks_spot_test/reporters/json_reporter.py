@@ -1,28 +1,124 @@
-"""JSON report generator."""
+"""JSON report generator.
+
+The report is encoded by walking the dataclasses directly. Nothing is
+copied through ``dataclasses.asdict``, and the tree is not rebuilt to
+convert datetimes: datetimes are serialised inline as ISO strings. Output is
+written in chunks as it is produced, so peak memory stays near one copy of
+the report whatever its size.
+
+Modes:
+    pretty   indent=2, same document as before (default)
+    compact  the same document without whitespace
+    ndjson   one JSON object per line: a {"record": "report", ...} header
+             with every field except test_results, then one
+             {"record": "test_result", ...} line per result
+"""
 
 import json
-from dataclasses import asdict
+from dataclasses import fields, is_dataclass
 from datetime import datetime
+from functools import lru_cache
+from typing import Iterator, Optional
 from ..models import TestReport
+from .view import ReportView
+
+MODES = ("pretty", "compact", "ndjson")
+# Pieces buffered before each write()
+WRITE_BATCH = 4096
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls) -> tuple:
+    return tuple(f.name for f in fields(cls))
+
+
+def _shallow_dict(obj) -> dict:
+    """Field name -> value, without copying the values (unlike asdict)."""
+    return {name: getattr(obj, name) for name in _field_names(type(obj))}
+
+
+def _default(obj):
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if is_dataclass(obj):
+        return _shallow_dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def encode(obj, indent: Optional[int] = 2, level: int = 0) -> Iterator[str]:
+    """Yield the JSON text of obj in pieces.
+
+    The top-level dataclass and lists of dataclasses are walked here; each
+    element (a TestResult, a snapshot) and any other value is handed to
+    json.dumps in one call.
+    """
+    if level == 0 and is_dataclass(obj):
+        items = list(_shallow_dict(obj).items())
+        yield from _encode_container(items, "{", "}", indent, level)
+    elif isinstance(obj, list) and obj and is_dataclass(obj[0]):
+        yield from _encode_container(obj, "[", "]", indent, level)
+    else:
+        text = json.dumps(obj, indent=indent, separators=None if indent else (",", ":"), default=_default)
+        if indent and level and "\n" in text:
+            text = text.replace("\n", "\n" + " " * (indent * level))
+        yield text
+
+
+def _encode_container(items, open_: str, close: str, indent: Optional[int], level: int) -> Iterator[str]:
+    is_object = open_ == "{"
+    if not items:
+        yield open_ + close
+        return
+    if indent:
+        inner = "\n" + " " * (indent * (level + 1))
+        separator, colon = "," + inner, ": "
+        end = "\n" + " " * (indent * level) + close
+    else:
+        inner, separator, colon, end = "", ",", ":", close
+    yield open_ + inner
+    for i, item in enumerate(items):
+        if i:
+            yield separator
+        if is_object:
+            key, value = item
+            yield json.dumps(key) + colon
+        else:
+            value = item
+        yield from encode(value, indent, level + 1)
+    yield end
+
 
+def iter_ndjson(report: TestReport) -> Iterator[str]:
+    """Yield the report as NDJSON lines (each ending in a newline)."""
+    header = {"record": "report"}
+    header.update(_shallow_dict(report))
+    del header["test_results"]
+    yield json.dumps(header, separators=(",", ":"), default=_default) + "\n"
+    for result in report.test_results:
+        record = {"record": "test_result"}
+        record.update(_shallow_dict(result))
+        yield json.dumps(record, separators=(",", ":"), default=_default) + "\n"
 
-def generate_report(report: TestReport, output_path: str):
-    """Generate JSON report file."""
-    # Convert dataclass to dict
-    report_dict = asdict(report)
 
-    # Convert datetime objects to ISO format strings
-    def convert_datetime(obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, dict):
-            return {k: convert_datetime(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [convert_datetime(item) for item in obj]
-        return obj
+def generate_report(report: TestReport, output_path: str, view: Optional[ReportView] = None,
+                    mode: str = "pretty"):
+    """Generate JSON report file.
 
-    report_dict = convert_datetime(report_dict)
+    The JSON keeps the raw report, so the view is accepted only for the
+    common reporter signature.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown JSON report mode {mode!r} (expected one of {', '.join(MODES)})")
+    if mode == "ndjson":
+        pieces = iter_ndjson(report)
+    else:
+        pieces = encode(report, indent=2 if mode == "pretty" else None)
 
-    # Write JSON file
     with open(output_path, 'w') as f:
-        json.dump(report_dict, f, indent=2)
+        batch = []
+        for piece in pieces:
+            batch.append(piece)
+            if len(batch) >= WRITE_BATCH:
+                f.write("".join(batch))
+                batch.clear()
+        f.write("".join(batch))
@@ -1,73 +1,92 @@
 """Markdown report generator."""
 
+from typing import Optional
 from ..models import TestReport
+from .view import ReportView, build_view
 
 
-def generate_report(report: TestReport, output_path: str):
+def generate_report(report: TestReport, output_path: str, view: Optional[ReportView] = None):
     """Generate Markdown report file."""
+    view = view or build_view(report)
     lines = []
 
     # Header
     lines.append("# AKS Spot Test Report\n")
-    lines.append(f"**Cluster:** {report.cluster_name}\n")
-    lines.append(f"**Date:** {report.timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n")
-    lines.append(f"**Duration:** {_format_duration(report.duration_seconds)}\n")
-    lines.append(f"**Run ID:** {report.run_id}\n")
+    lines.append(f"**Cluster:** {view.cluster_name}\n")
+    lines.append(f"**Date:** {view.timestamp}\n")
+    lines.append(f"**Duration:** {view.duration}\n")
+    lines.append(f"**Run ID:** {view.run_id}\n")
     lines.append("\n---\n\n")
 
     # Executive Summary
     lines.append("## Executive Summary\n\n")
-    status_emoji = "✅" if report.failed == 0 else "⚠️"
-    lines.append(f"{status_emoji} **Overall Result:** {'PASS' if report.failed == 0 else 'FAIL'} ({report.pass_rate:.2f}% pass rate)\n\n")
-    lines.append(f"- **Total Tests:** {report.total_tests}\n")
-    lines.append(f"- **Passed:** {report.passed} ✅\n")
-    lines.append(f"- **Failed:** {report.failed} ❌\n")
-    lines.append(f"- **Skipped:** {report.skipped} ⏭️\n\n")
+    status_emoji = "✅" if view.overall == "PASS" else "⚠️"
+    lines.append(f"{status_emoji} **Overall Result:** {view.overall} ({view.pass_rate:.2f}% pass rate)\n\n")
+    lines.append(f"- **Total Tests:** {view.total}\n")
+    lines.append(f"- **Passed:** {view.passed} ✅\n")
+    lines.append(f"- **Failed:** {view.failed} ❌\n")
+    lines.append(f"- **Skipped:** {view.skipped} ⏭️\n\n")
 
     # Framework Breakdown
     lines.append("### Framework Breakdown\n\n")
     lines.append("| Framework | Total | Passed | Failed | Skipped | Pass Rate |\n")
-    lines.append("|-----------|-------|--------|--------|---------|-----------|\ n")
-    for framework, stats in report.framework_summary.items():
-        total = stats['total']
-        passed = stats['passed']
-        pass_rate = (passed / total * 100) if total > 0 else 0.0
-        lines.append(f"| {framework.capitalize()} | {total} | {passed} | {stats['failed']} | {stats['skipped']} | {pass_rate:.0f}% |\n")
+    lines.append("|-----------|-------|--------|--------|---------|-----------|\n")
+    for row in view.frameworks:
+        lines.append(f"| {row.name.capitalize()} | {row.total} | {row.passed} | {row.failed} | {row.skipped} | {row.pass_rate:.0f}% |\n")
     lines.append("\n")
 
+    # Suite Timing
+    if view.suites:
+        lines.append("### Suite Timing\n\n")
+        lines.append("| Suite | Started | Duration | Setup | Tests | Result |\n")
+        lines.append("|-------|---------|----------|-------|-------|--------|\n")
+        for row in view.suites:
+            lines.append(f"| {row.suite} | {row.started} | {row.duration} | {row.setup} | {row.tests} | {row.result} |\n")
+        lines.append("\n")
+
     # Category Breakdown
     lines.append("### Category Breakdown\n\n")
     lines.append("| Category | Total | Passed | Failed | Skipped |\n")
-    lines.append("|----------|-------|--------|--------|---------|\ n")
-    for category, stats in sorted(report.category_summary.items()):
-        lines.append(f"| {category} | {stats['total']} | {stats['passed']} | {stats['failed']} | {stats['skipped']} |\n")
+    lines.append("|----------|-------|--------|--------|---------|\n")
+    for row in view.categories:
+        lines.append(f"| {row.name} | {row.total} | {row.passed} | {row.failed} | {row.skipped} |\n")
     lines.append("\n---\n\n")
 
     # Cluster Health
     lines.append("## Cluster Health\n\n")
-    lines.append(f"**Eviction Rate:** {report.eviction_rate_per_hour:.1f} evictions/hour ({len(report.eviction_events)} total during test)\n")
-    lines.append(f"**Remediation:** {len(report.remediation_actions)} actions taken\n\n")
+    lines.append(f"**Eviction Rate:** {view.eviction_rate:.1f} evictions/hour ({view.eviction_count} total during test)\n")
+    if view.monitor_line:
+        lines.append(f"**Eviction Monitor:** {view.monitor_line}\n")
+    lines.append(f"**Remediation:** {view.remediation_count} actions taken\n\n")
 
-    if report.initial_state and report.final_state:
+    if view.node_distribution:
         lines.append("### Node Distribution\n\n")
         lines.append("| Metric | Before | After | Change |\n")
-        lines.append("|--------|--------|-------|--------|\ n")
-        lines.append(f"| Total Nodes | {report.initial_state.total_nodes} | {report.final_state.total_nodes} | {report.final_state.total_nodes - report.initial_state.total_nodes:+d} |\n")
-        lines.append(f"| Spot Nodes | {report.initial_state.spot_nodes} | {report.final_state.spot_nodes} | {report.final_state.spot_nodes - report.initial_state.spot_nodes:+d} |\n")
-        lines.append(f"| Ready Nodes | {report.initial_state.ready_nodes} | {report.final_state.ready_nodes} | {report.final_state.ready_nodes - report.initial_state.ready_nodes:+d} |\n")
+        lines.append("|--------|--------|-------|--------|\n")
+        for row in view.node_distribution:
+            lines.append(f"| {row.metric} | {row.before} | {row.after} | {row.change} |\n")
+        lines.append("\n")
+
+    if view.timeline_rows:
+        lines.append("### Cluster Timeline\n\n")
+        lines.append(f"{view.timeline_summary}\n\n")
+        lines.append("| Series | Min | Max | Final | Trend |\n")
+        lines.append("|--------|-----|-----|-------|-------|\n")
+        for row in view.timeline_rows:
+            lines.append(f"| {row.label} | {row.low} | {row.high} | {row.final} | `{row.trend}` |\n")
         lines.append("\n")
 
     # Failed Tests
-    if report.top_failures:
+    if view.failures:
         lines.append("## Failed Tests\n\n")
-        for i, failure in enumerate(report.top_failures, 1):
+        for i, failure in enumerate(view.failures, 1):
             lines.append(f"### {i}. {failure.test_id}: {failure.name} ❌\n\n")
             lines.append(f"**Framework:** {failure.framework}\n")
             lines.append(f"**Category:** {failure.category}\n")
-            lines.append(f"**Duration:** {failure.duration_seconds:.1f}s\n\n")
-            if failure.error_message:
+            lines.append(f"**Duration:** {failure.duration}\n\n")
+            if failure.error:
                 lines.append("**Error:**\n```\n")
-                lines.append(failure.error_message[:500])  # Truncate long errors
+                lines.append(failure.error)
                 lines.append("\n```\n\n")
             if failure.reproduce_commands:
                 lines.append("**Reproduce:**\n```bash\n")
@@ -76,13 +95,12 @@ def generate_report(report: TestReport, output_path: str):
                 lines.append("```\n\n")
 
     # Remediation Actions
-    if report.remediation_actions:
+    if view.remediations:
         lines.append("## Remediation Actions\n\n")
-        lines.append("| Time | Action Type | Target | Status | Details |\n")
-        lines.append("|------|-------------|--------|--------|---------|\ n")
-        for action in report.remediation_actions:
-            status = "✅ Success" if action.success else "❌ Failed"
-            lines.append(f"| {action.timestamp.strftime('%H:%M:%S')} | {action.action_type} | {action.target} | {status} | {action.details} |\n")
+        lines.append("| Time | Action Type | Target | Status | Duration | Attempts | Details |\n")
+        lines.append("|------|-------------|--------|--------|----------|----------|---------|\n")
+        for row in view.remediations:
+            lines.append(f"| {row.time} | {row.action_type} | {row.target} | {row.status} | {row.duration} | {row.attempts} | {row.details} |\n")
         lines.append("\n")
 
     # Footer
@@ -92,10 +110,3 @@ def generate_report(report: TestReport, output_path: str):
     # Write file
     with open(output_path, 'w') as f:
         f.writelines(lines)
-
-
-def _format_duration(seconds: float) -> str:
-    """Format duration in human-readable form."""
-    minutes = int(seconds // 60)
-    secs = int(seconds % 60)
-    return f"{minutes}m {secs}s"
@@ -0,0 +1,285 @@
+"""Precomputed, immutable view of a TestReport shared by all reporters.
+
+``build_view`` walks the report once. It formats every cell (durations,
+status icons, timestamps), groups results by framework and category in the
+same pass over test_results, and sorts each table. Each reporter then only
+writes out strings, so adding a format costs one more write, not one more
+walk of tens of thousands of results. ``write_reports`` renders all formats
+from the same view on a thread pool.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+from ..models import ClusterSnapshot, TestReport, TestResult
+from .charts import TIMELINE_SERIES, sparkline, timeline_svg
+
+STATUS_ICONS = {"PASS": "✅", "FAIL": "❌", "SKIP": "⏭️"}
+STATUS_CLASSES = {"PASS": "success", "FAIL": "danger", "SKIP": "warning"}
+# Characters of an error message shown in the failure details
+ERROR_PREVIEW_CHARS = 500
+
+
+@dataclass(frozen=True)
+class ResultRow:
+    test_id: str
+    name: str
+    framework: str
+    category: str
+    status: str
+    status_icon: str
+    status_class: str
+    duration: str  # "12.3s"
+
+
+@dataclass(frozen=True)
+class SummaryRow:
+    """Per-framework or per-category counts."""
+    name: str
+    total: int
+    passed: int
+    failed: int
+    skipped: int
+    pass_rate: float
+
+
+@dataclass(frozen=True)
+class SuiteRow:
+    suite: str
+    started: str
+    duration: str
+    setup: str
+    tests: int
+    result: str
+
+
+@dataclass(frozen=True)
+class StateRow:
+    """One Before/After row of the node distribution."""
+    metric: str
+    before: int
+    after: int
+    change: str
+
+
+@dataclass(frozen=True)
+class TimelineRow:
+    label: str
+    low: int
+    high: int
+    final: int
+    trend: str
+
+
+@dataclass(frozen=True)
+class FailureView:
+    test_id: str
+    name: str
+    framework: str
+    category: str
+    duration: str
+    error: str
+    reproduce_commands: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class RemediationRow:
+    time: str
+    action_type: str
+    target: str
+    status: str
+    duration: str
+    attempts: int
+    details: str
+
+
+@dataclass(frozen=True)
+class ReportView:
+    report: TestReport
+    cluster_name: str
+    run_id: str
+    timestamp: str
+    duration: str
+    total: int
+    passed: int
+    failed: int
+    skipped: int
+    pass_rate: float
+    overall: str  # "PASS" / "FAIL"
+    eviction_rate: float
+    eviction_count: int
+    monitor_line: str
+    remediation_count: int
+    results: Tuple[ResultRow, ...]
+    frameworks: Tuple[SummaryRow, ...]
+    categories: Tuple[SummaryRow, ...]
+    suites: Tuple[SuiteRow, ...]
+    node_distribution: Tuple[StateRow, ...]
+    timeline_summary: str
+    timeline_rows: Tuple[TimelineRow, ...]
+    timeline_svg: str
+    failures: Tuple[FailureView, ...]
+    remediations: Tuple[RemediationRow, ...]
+
+
+def format_duration(seconds: float) -> str:
+    """Format duration in human-readable form."""
+    minutes = int(seconds // 60)
+    secs = int(seconds % 60)
+    return f"{minutes}m {secs}s"
+
+
+def build_view(report: TestReport) -> ReportView:
+    """Format, group and sort everything the reporters need, in one pass over the results."""
+    results = []
+    frameworks: Dict[str, list] = {}
+    categories: Dict[str, list] = {}
+    counts = {"PASS": 0, "FAIL": 0, "SKIP": 0}
+    for result in report.test_results:
+        status = result.status
+        results.append(ResultRow(
+            test_id=result.test_id,
+            name=result.name,
+            framework=result.framework,
+            category=result.category,
+            status=status,
+            status_icon=STATUS_ICONS.get(status, "⏭️"),
+            status_class=STATUS_CLASSES.get(status, "warning"),
+            duration=f"{result.duration_seconds:.1f}s"
+        ))
+        if status in counts:
+            counts[status] += 1
+        for groups, key in ((frameworks, result.framework), (categories, result.category)):
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = [0, 0, 0, 0]
+            group[0] += 1
+            if status == "PASS":
+                group[1] += 1
+            elif status == "FAIL":
+                group[2] += 1
+            elif status == "SKIP":
+                group[3] += 1
+
+    total = len(results)
+    pass_rate = counts["PASS"] / total * 100 if total else 0.0
+    return ReportView(
+        report=report,
+        cluster_name=report.cluster_name,
+        run_id=report.run_id,
+        timestamp=report.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+        duration=format_duration(report.duration_seconds),
+        total=total,
+        passed=counts["PASS"],
+        failed=counts["FAIL"],
+        skipped=counts["SKIP"],
+        pass_rate=pass_rate,
+        overall="PASS" if counts["FAIL"] == 0 else "FAIL",
+        eviction_rate=report.eviction_rate_per_hour,
+        eviction_count=len(report.eviction_events),
+        monitor_line=_monitor_line(report.monitor_stats),
+        remediation_count=len(report.remediation_actions),
+        results=tuple(results),
+        frameworks=tuple(_summary_rows(frameworks.items())),
+        categories=tuple(_summary_rows(sorted(categories.items()))),
+        suites=tuple(_suite_rows(report.suite_stats)),
+        node_distribution=tuple(_state_rows(report.initial_state, report.final_state)),
+        timeline_summary=_timeline_summary(report.cluster_timeline),
+        timeline_rows=tuple(_timeline_rows(report.cluster_timeline)),
+        timeline_svg=timeline_svg(report.cluster_timeline),
+        failures=tuple(_failure(f) for f in report.top_failures),
+        remediations=tuple(_remediation_rows(report.remediation_actions))
+    )
+
+
+def write_reports(view: ReportView, outputs: Dict[str, Tuple[Callable, str]],
+                  max_workers: Optional[int] = None) -> Dict[str, str]:
+    """Render every format concurrently from one view.
+
+    outputs maps format name -> (generate_report function, output path);
+    returns format name -> path once all of them are written. The first
+    failure is raised after every format has had its chance to finish.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or max(1, len(outputs))) as pool:
+        futures = {name: pool.submit(generate, view.report, path, view=view)
+                   for name, (generate, path) in outputs.items()}
+    for future in futures.values():
+        future.result()
+    return {name: path for name, (_, path) in outputs.items()}
+
+
+def _summary_rows(groups) -> list:
+    return [SummaryRow(name, total, passed, failed, skipped, passed / total * 100 if total else 0.0)
+            for name, (total, passed, failed, skipped) in groups]
+
+
+def _monitor_line(stats: Dict) -> str:
+    if not stats:
+        return ""
+    return (f"{stats.get('mode', '?')} mode, "
+            f"{stats.get('api_requests', 0)} API requests, "
+            f"{stats.get('objects_received', 0)} objects received, "
+            f"{stats.get('missed_updates', 0)} missed updates, "
+            f"median lag {stats.get('median_lag_seconds', 0.0):.1f}s")
+
+
+def _suite_rows(suite_stats: Dict[str, Dict]) -> list:
+    rows = []
+    for suite, stats in suite_stats.items():
+        result = "⏱️ Timeout" if stats.get("timed_out") else ("✅" if stats["success"] else "⚠️")
+        setup = "-"
+        if "venv_setup_seconds" in stats:
+            setup = f"{stats['venv_setup_seconds']:.1f}s ({stats.get('venv_cache', '?')} venv)"
+        rows.append(SuiteRow(suite, f"+{format_duration(stats['started_offset_seconds'])}",
+                             format_duration(stats['duration_seconds']), setup, stats['tests'], result))
+    return rows
+
+
+def _state_rows(initial: Optional[ClusterSnapshot], final: Optional[ClusterSnapshot]) -> list:
+    if not initial or not final:
+        return []
+    return [
+        StateRow(label, getattr(initial, attr), getattr(final, attr),
+                 f"{getattr(final, attr) - getattr(initial, attr):+d}")
+        for label, attr in (("Total Nodes", "total_nodes"), ("Spot Nodes", "spot_nodes"),
+                            ("Ready Nodes", "ready_nodes"))
+    ]
+
+
+def _timeline_summary(timeline: Dict) -> str:
+    t = timeline.get("t", [])
+    if len(t) < 2:
+        return ""
+    return f"{len(t)} samples over {format_duration(t[-1] - t[0])}"
+
+
+def _timeline_rows(timeline: Dict) -> list:
+    if len(timeline.get("t", [])) < 2:
+        return []
+    return [TimelineRow(label, min(values), max(values), values[-1], sparkline(values))
+            for key, (label, _) in TIMELINE_SERIES.items()
+            for values in (timeline.get(key),) if values]
+
+
+def _failure(result: TestResult) -> FailureView:
+    return FailureView(
+        test_id=result.test_id,
+        name=result.name,
+        framework=result.framework,
+        category=result.category,
+        duration=f"{result.duration_seconds:.1f}s",
+        error=(result.error_message or "")[:ERROR_PREVIEW_CHARS],
+        reproduce_commands=tuple(result.reproduce_commands)
+    )
+
+
+def _remediation_rows(actions) -> list:
+    rows = []
+    for action in actions:
+        if action.dry_run:
+            status = "📝 Planned"
+        else:
+            status = "✅ Success" if action.success else "❌ Failed"
+        rows.append(RemediationRow(action.timestamp.strftime('%H:%M:%S'), action.action_type, action.target,
+                                   status, f"{action.duration_seconds:.1f}s", action.attempts, action.details))
+    return rows
@@ -1,80 +1,194 @@
-"""Bash spot behavior test runner."""
+"""Bash spot behavior test runner.
+
+Each category under categories/ is a separate unit, run as
+``./run-all-tests.sh --category <name> --no-clean --no-aggregate``. Units run
+concurrently within the limits of their disruption class:
+
+    read-only    may run alongside other read-only units and one mixed unit
+    mixed        at most one at a time, never alongside a destructive unit
+    destructive  runs alone
+
+Results are ingested from results/ as each test writes its JSON file, not
+after the whole suite exits.
+"""
 
 import os
+import re
 import time
-import json
-import glob
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from ..models import TestResult, Assertion
-from ..utils import run_command
+from ..utils import run_command, run_command_streaming
+from .results_watcher import ResultsWatcher
+
+# Disruption class per category; anything unlisted is destructive
+CATEGORY_CLASSES = {
+    "01-pod-distribution": "read-only",
+    "07-vmss-node-pool": "read-only",
+    "08-autoscaler": "mixed",
+}
+
+# Slack past timeout_minutes for categories to exit, then the summary step
+DEADLINE_SLACK_SECONDS = 30
+AGGREGATE_TIMEOUT_SECONDS = 120
+# Most the runner can take past timeout_minutes (the orchestrator adds its grace on top)
+OVERHEAD_SECONDS = DEADLINE_SLACK_SECONDS + AGGREGATE_TIMEOUT_SECONDS
+
+# lib/common.sh statuses -> models statuses
+STATUS_MAP = {"pass": "PASS", "fail": "FAIL", "skip": "SKIP", "error": "FAIL"}
+
+# Script headers echoed while categories run (verdicts come from ingestion)
+_PROGRESS_RE = re.compile(r"Executing:")
+
+
+def category_class(category: str) -> str:
+    return CATEGORY_CLASSES.get(category, "destructive")
 
 
-def run_tests(working_dir: str, timeout_minutes: int = 20) -> tuple[List[TestResult], bool]:
+def can_start(category: str, running: List[str]) -> bool:
+    """Whether category may start while the given categories are running."""
+    cls = category_class(category)
+    running_classes = [category_class(c) for c in running]
+    if cls == "destructive":
+        return not running
+    if "destructive" in running_classes:
+        return False
+    if cls == "mixed":
+        return "mixed" not in running_classes
+    return True
+
+
+def discover_categories(working_dir: str) -> List[str]:
+    categories_dir = os.path.join(working_dir, "categories")
+    if not os.path.isdir(categories_dir):
+        return []
+    return sorted(d for d in os.listdir(categories_dir)
+                  if os.path.isdir(os.path.join(categories_dir, d)))
+
+
+def parse_result(test_data: Dict) -> TestResult:
+    """Convert one results/<TEST_ID>.json document into a TestResult."""
+    return TestResult(
+        test_id=test_data.get("test_id", ""),
+        name=test_data.get("test_name", ""),
+        category=test_data.get("category", ""),
+        framework="bash",
+        status=STATUS_MAP.get(str(test_data.get("status", "")).lower(), "FAIL"),
+        duration_seconds=test_data.get("duration_seconds", 0.0),
+        error_message=test_data.get("error_message") or None,
+        assertions=[
+            Assertion(
+                description=assertion.get("description", ""),
+                expected=assertion.get("expected"),
+                actual=assertion.get("actual"),
+                passed=assertion.get("passed", False)
+            )
+            for assertion in test_data.get("assertions", [])
+        ],
+        evidence=test_data.get("evidence", {}),
+        reproduce_commands=test_data.get("reproduce_commands", [])
+    )
+
+
+def run_tests(working_dir: str, timeout_minutes: int = 20, idle_timeout_minutes: int = 0,
+              max_parallel_categories: int = 3) -> tuple[List[TestResult], bool]:
     """Run bash spot behavior tests and return results.
 
     Environment variables are inherited from orchestrator's loaded .env file.
+    Categories are scheduled by disruption class (max_parallel_categories
+    1 runs them one at a time). Each category's output is streamed; a
+    category is killed if it prints nothing for idle_timeout_minutes (0
+    disables hang detection), and all are stopped after timeout_minutes.
+    Categories still waiting at that point are not started; each is reported
+    as a SKIP result saying so.
     """
-    results = []
     start_time = time.time()
+    deadline = start_time + timeout_minutes * 60 + DEADLINE_SLACK_SECONDS
+    # config.sh honours RESULTS_DIR from the environment
+    results_dir = os.environ.get("RESULTS_DIR") or os.path.join(working_dir, "results")
 
-    # Run all tests
-    # Environment variables are automatically inherited from os.environ
-    result = run_command(
-        ["./run-all-tests.sh"],
-        cwd=working_dir,
-        timeout=timeout_minutes * 60 + 30,
-        env=os.environ.copy()
-    )
+    # Categories run with --no-clean, so clear the previous run here
+    if os.path.isdir(results_dir):
+        for name in os.listdir(results_dir):
+            if name.endswith(".json"):
+                os.remove(os.path.join(results_dir, name))
+
+    watcher = ResultsWatcher(results_dir)
+    by_path: Dict[str, TestResult] = {}
+
+    def ingest(completed):
+        for path, data in completed:
+            if not isinstance(data, dict) or not data.get("test_id"):
+                continue
+            result = parse_result(data)
+            by_path[path] = result
+            print(f"    [bash] {result.status} {result.test_id} ({result.duration_seconds:.1f}s)")
 
-    success = result.returncode == 0
-
-    # Parse JSON results from results/*.json
-    results_dir = os.path.join(working_dir, "results")
-    if os.path.exists(results_dir):
-        for json_file in glob.glob(os.path.join(results_dir, "*.json")):
-            try:
-                with open(json_file) as f:
-                    test_data = json.load(f)
-
-                    test_id = test_data.get("test_id", "")
-                    test_name = test_data.get("test_name", "")
-                    category = test_data.get("category", "")
-                    status = test_data.get("status", "UNKNOWN")
-                    duration = test_data.get("duration_seconds", 0.0)
-                    error_msg = test_data.get("error_message")
-
-                    # Parse assertions
-                    assertions = []
-                    for assertion in test_data.get("assertions", []):
-                        assertions.append(Assertion(
-                            description=assertion.get("description", ""),
-                            expected=assertion.get("expected"),
-                            actual=assertion.get("actual"),
-                            passed=assertion.get("passed", False)
-                        ))
-
-                    # Extract reproduce commands
-                    evidence = test_data.get("evidence", {})
-                    reproduce_cmds = test_data.get("reproduce_commands", [])
-
-                    results.append(TestResult(
-                        test_id=test_id,
-                        name=test_name,
-                        category=category,
+    pending = discover_categories(working_dir)
+    failures: List[TestResult] = []
+    success = bool(pending)
+    print(f"    {len(pending)} categories, up to {max_parallel_categories} at a time "
+          f"(results watched via {watcher.mode})")
+
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel_categories)) as executor:
+        running = {}
+        while pending or running:
+            if pending and time.time() >= deadline:
+                # Out of time: report what never ran instead of starting it
+                for category in pending:
+                    print(f"    [bash] not started: {category} (suite timeout reached)")
+                    failures.append(TestResult(
+                        test_id=f"bash-{category}",
+                        name=f"Bash Tests: {category}",
+                        category="runtime",
                         framework="bash",
-                        status=status,
-                        duration_seconds=duration,
-                        error_message=error_msg,
-                        assertions=assertions,
-                        evidence=evidence,
-                        reproduce_commands=reproduce_cmds
+                        status="SKIP",
+                        duration_seconds=0.0,
+                        error_message=f"{category} not started: the {timeout_minutes} minute "
+                                      f"suite timeout was reached before it could run"
                     ))
-            except Exception as e:
-                # Skip malformed JSON files
-                continue
+                pending = []
+                success = False
+            for category in list(pending):
+                if len(running) >= max_parallel_categories:
+                    break
+                # Non-destructive units may overtake a blocked destructive one
+                if not can_start(category, list(running.values())):
+                    continue
+                pending.remove(category)
+                remaining = max(1, int(deadline - time.time()))
+                running[executor.submit(_run_category, working_dir, category, remaining,
+                                        idle_timeout_minutes * 60)] = category
+
+            if not running:
+                break
+            # Wakes on new result files (inotify) or after one poll interval
+            ingest(watcher.wait())
+            for future in [f for f in running if f.done()]:
+                category = running.pop(future)
+                result = future.result()
+                if result.returncode != 0:
+                    success = False
+                if result.returncode == 124:
+                    failures.append(TestResult(
+                        test_id=f"bash-{category}",
+                        name=f"Bash Tests: {category}",
+                        category="runtime",
+                        framework="bash",
+                        status="FAIL",
+                        duration_seconds=time.time() - start_time,
+                        error_message=result.stderr or f"{category} timed out"
+                    ))
+
+    ingest(watcher.scan())
+    watcher.close()
 
-    # If no results parsed, create a summary result
-    if not results and not success:
+    # One summary for the whole run, as a sequential run would write
+    run_command(["./run-all-tests.sh", "--aggregate-only"], cwd=working_dir,
+                timeout=AGGREGATE_TIMEOUT_SECONDS, env=os.environ.copy())
+
+    results = list(by_path.values()) + failures
+    if not success and not results:
         results.append(TestResult(
             test_id="bash-suite",
             name="Bash Test Suite",
@@ -82,7 +196,22 @@ def run_tests(working_dir: str, timeout_minutes: int = 20) -> tuple[List[TestRes
             framework="bash",
             status="FAIL",
             duration_seconds=time.time() - start_time,
-            error_message=result.stderr or "Bash tests failed to run"
+            error_message="Bash tests failed to run"
         ))
 
     return results, success
+
+
+def _run_category(working_dir: str, category: str, timeout: int, idle_timeout: Optional[int]):
+    def progress(stream: str, line: str):
+        if _PROGRESS_RE.search(line):
+            print(f"    [bash:{category[:2]}] {line.strip()}")
+
+    return run_command_streaming(
+        ["./run-all-tests.sh", "--category", category, "--no-clean", "--no-aggregate"],
+        cwd=working_dir,
+        timeout=timeout,
+        env=os.environ.copy(),
+        idle_timeout=idle_timeout,
+        on_line=progress
+    )
@@ -0,0 +1,268 @@
+"""Native integration with the spot-behavior-python suite.
+
+The suite is driven by its own ``run_all_tests.py`` (test functions taking
+``(config, writer)`` and recording through ``lib.result_writer``), not by
+pytest. Here the orchestrator imports that module, discovers tests with
+``discover_tests`` and runs them with one shared TestConfig and ResultWriter,
+so cluster discovery caches and helpers are reused across all tests. Each
+``lib.result_writer.TestResult`` is converted directly into a
+``models.TestResult`` as soon as its test finishes.
+
+Two ways to run:
+    inprocess  tests run in the orchestrator process
+    worker     tests run in a spawned child process that streams results back
+               over a queue; the orchestrator enforces timeout and hang
+               detection and a crashing test cannot take the orchestrator down
+
+The suite imports itself through generic top-level names (``config``,
+``lib``, ``categories``). ``suite_imports`` makes those resolve to the suite
+only while it is loaded and run, then restores sys.path and any same-named
+modules that were there before. run_all_tests itself is loaded from its file
+under a unique module name.
+
+A timed-out worker gets SIGTERM on its whole process group (it runs in its
+own session, with its kubectl/az children). The worker turns SIGTERM into
+SystemExit, so the running test's ``finally`` (uncordon, cleanup) still runs;
+SIGKILL follows after WORKER_STOP_GRACE_SECONDS.
+"""
+
+import hashlib
+import importlib.util
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+from ..models import Assertion, TestResult
+
+# lib.result_writer statuses -> models statuses
+STATUS_MAP = {"pass": "PASS", "fail": "FAIL", "skip": "SKIP", "error": "FAIL"}
+
+# Top-level module names the suite imports itself by
+SUITE_PACKAGES = ("config", "lib", "categories", "run_all_tests")
+
+# Time a terminated worker gets to run its tests' cleanup before SIGKILL
+WORKER_STOP_GRACE_SECONDS = 45
+
+
+def _is_suite_module(name: str) -> bool:
+    return name.split(".", 1)[0] in SUITE_PACKAGES
+
+
+@contextmanager
+def suite_imports(working_dir: str):
+    """Resolve the suite's top-level imports to working_dir for the duration."""
+    root = os.path.abspath(working_dir)
+    had_root = root in sys.path
+    saved = {name: mod for name, mod in sys.modules.items() if _is_suite_module(name)}
+    for name in saved:
+        del sys.modules[name]
+    sys.path.insert(0, root)
+    try:
+        yield root
+    finally:
+        # run_all_tests also inserts its own directory on import
+        if not had_root:
+            while root in sys.path:
+                sys.path.remove(root)
+        for name in [n for n in sys.modules if _is_suite_module(n)]:
+            del sys.modules[name]
+        sys.modules.update(saved)
+
+
+def load_suite(working_dir: str):
+    """Load the suite's run_all_tests.py under a unique module name.
+
+    Must be called inside suite_imports(working_dir).
+    """
+    path = os.path.join(os.path.abspath(working_dir), "run_all_tests.py")
+    name = "_spot_suite_" + hashlib.sha1(path.encode()).hexdigest()[:12]
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+def convert_result(result) -> TestResult:
+    """Convert a lib.result_writer.TestResult into a models.TestResult."""
+    status = STATUS_MAP.get(result.status, "FAIL")
+    error_message = result.error_message or None
+    if status == "FAIL" and not error_message:
+        failed = [a.description for a in result.assertions if not a.passed]
+        error_message = "Failed assertions: " + "; ".join(failed) if failed else "Test errored"
+
+    return TestResult(
+        test_id=result.test_id,
+        name=result.test_name,
+        category=result.category,
+        framework="python",
+        status=status,
+        duration_seconds=result.duration_seconds,
+        error_message=error_message,
+        assertions=[
+            Assertion(description=a.description, expected=a.expected,
+                      actual=a.actual, passed=a.passed)
+            for a in result.assertions
+        ],
+        evidence=dict(result.evidence),
+        reproduce_commands=[f"python run_all_tests.py --test {result.test_id}"]
+    )
+
+
+def iter_results(working_dir: str, category: str = "", test_filter: str = "") -> Iterator[TestResult]:
+    """Run the suite's tests and yield each result as soon as its test finishes."""
+    with suite_imports(working_dir):
+        yield from _iter_suite_results(working_dir, category, test_filter)
+
+
+def _iter_suite_results(working_dir: str, category: str, test_filter: str) -> Iterator[TestResult]:
+    suite = load_suite(working_dir)
+    if os.environ.get("CONFIG_FROM_CLUSTER") == "1":
+        config = suite.TestConfig.from_cluster()
+    else:
+        config = suite.TestConfig()
+    writer = suite.ResultWriter(config.results_dir, config.evidence_blob_dir,
+                                config.evidence_inline_bytes, config.evidence_list_cap)
+
+    # Same cleanup as run_all_tests.py: a full run replaces previous results
+    if not test_filter:
+        for fname in os.listdir(config.results_dir):
+            if fname.endswith(".json"):
+                os.remove(os.path.join(config.results_dir, fname))
+
+    for cat_key, test_id, func_name, func in suite.discover_tests(category, test_filter):
+        started = time.time()
+        suite.execute_test(config, writer, test_id, func_name, func)
+        result = writer.last_result
+        if result is None or result.test_id != test_id or not result.end_time:
+            # The test raised before start_test or before finishing
+            yield TestResult(
+                test_id=test_id,
+                name=func_name,
+                category=cat_key.split("-", 1)[-1],
+                framework="python",
+                status="FAIL",
+                duration_seconds=round(time.time() - started, 1),
+                error_message="Test raised an exception before recording a result"
+            )
+            continue
+        yield convert_result(result)
+
+    suite.aggregate_results(config.results_dir, prune_blobs=not config.evidence_blob_dir)
+
+
+def run_in_process(working_dir: str) -> tuple[List[TestResult], Optional[str]]:
+    """Run all tests in this process; returns (results, error)."""
+    results = []
+    try:
+        for result in iter_results(working_dir):
+            results.append(result)
+            _print_result(result)
+    except Exception as e:
+        return results, f"{type(e).__name__}: {e}"
+    return results, None
+
+
+def _worker_main(working_dir: str, log_path: str, out_queue):
+    """Worker process entry point: stream results back, log output to a file."""
+    # Own process group, so a stop reaches the tests' kubectl/az children too
+    os.setsid()
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    with open(log_path, "w", buffering=1) as log:
+        sys.stdout = sys.stderr = log
+        try:
+            for result in iter_results(working_dir):
+                out_queue.put(("result", result))
+        except Exception as e:
+            out_queue.put(("error", f"{type(e).__name__}: {e}"))
+        finally:
+            out_queue.put(("done", None))
+
+
+def _exit_on_sigterm(signum, frame):
+    # Unwinds through the running test's finally blocks, unlike the default action
+    raise SystemExit(128 + signum)
+
+
+def _stop_worker(worker):
+    """SIGTERM the worker's process group, then SIGKILL it after the grace period."""
+    try:
+        os.killpg(worker.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        # Stopped before it called setsid: no group of its own yet
+        worker.terminate()
+    worker.join(timeout=WORKER_STOP_GRACE_SECONDS)
+    try:
+        # Also reaches children the worker left behind
+        os.killpg(worker.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    worker.join(timeout=5)
+
+
+def run_in_worker(working_dir: str, timeout: int,
+                  idle_timeout: int = 0) -> tuple[List[TestResult], Optional[str]]:
+    """Run all tests in a managed worker process; returns (results, error).
+
+    The worker is terminated after timeout seconds, or after idle_timeout
+    seconds without a finished test (0 disables). Its output goes to
+    results/orchestrator-worker.log in the suite directory.
+    """
+    log_dir = os.path.join(os.path.abspath(working_dir), "results")
+    os.makedirs(log_dir, exist_ok=True)
+    log_path = os.path.join(log_dir, "orchestrator-worker.log")
+
+    ctx = multiprocessing.get_context("spawn")
+    out_queue = ctx.Queue()
+    worker = ctx.Process(target=_worker_main, args=(working_dir, log_path, out_queue),
+                         name="spot-python-worker", daemon=True)
+    worker.start()
+    print(f"    Worker pid {worker.pid} started (log: {log_path})")
+
+    results: List[TestResult] = []
+    error = None
+    start = last_activity = time.time()
+    while True:
+        now = time.time()
+        if now - start >= timeout:
+            error = f"Worker timed out after {timeout}s"
+            break
+        if idle_timeout and now - last_activity >= idle_timeout:
+            error = f"No test finished for {idle_timeout}s, worker looks hung and was killed"
+            break
+        try:
+            kind, payload = out_queue.get(timeout=1.0)
+        except queue.Empty:
+            if not worker.is_alive():
+                error = f"Worker exited unexpectedly (exit code {worker.exitcode}), see {log_path}"
+                break
+            continue
+        last_activity = time.time()
+        if kind == "result":
+            results.append(payload)
+            _print_result(payload)
+        elif kind == "error":
+            error = payload
+        elif kind == "done":
+            break
+
+    if worker.is_alive():
+        worker.join(timeout=5 if error is None else 0)
+    if worker.is_alive():
+        print(f"    Stopping worker pid {worker.pid} (up to {WORKER_STOP_GRACE_SECONDS}s for test cleanup)")
+        _stop_worker(worker)
+    return results, error
+
+
+def _print_result(result: TestResult):
+    print(f"    [python] {result.status} {result.test_id} ({result.duration_seconds:.1f}s)")
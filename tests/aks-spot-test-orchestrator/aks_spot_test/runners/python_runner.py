@@ -1,38 +1,74 @@
-"""Python pytest test runner."""
+"""Python test runner.
+
+Runs spot-behavior-python natively (see python_native) by default; the
+legacy pytest mode installs the suite into a venv and parses a pytest JSON
+report instead.
+"""
 
 import os
+import re
 import time
 import json
-from typing import List
+from contextlib import ExitStack
+from typing import Dict, List, Optional
 from ..models import TestResult, Assertion
-from ..utils import run_command
+from ..utils import run_command, run_command_streaming
+from . import python_native, venv_cache
+
+MODES = ("worker", "inprocess", "pytest")
+
+# Slack past timeout_minutes before the suite is killed
+DEADLINE_SLACK_SECONDS = 30
+# Most the runner can take past timeout_minutes: the slack, then stopping the
+# worker (the orchestrator adds its grace on top; venv setup is not counted)
+OVERHEAD_SECONDS = DEADLINE_SLACK_SECONDS + python_native.WORKER_STOP_GRACE_SECONDS + 5
+
+# pytest -v verdict lines echoed while the suite runs
+_PROGRESS_RE = re.compile(r"(PASSED|FAILED|SKIPPED|ERROR)")
+
+
+def _progress(stream: str, line: str):
+    if _PROGRESS_RE.search(line):
+        print(f"    [python] {line.strip()}")
+
 
+def run_tests(working_dir: str, venv_path: str = "venv", timeout_minutes: int = 20,
+              idle_timeout_minutes: int = 0, venv_cache_dir: str = venv_cache.DEFAULT_CACHE_DIR,
+              venv_cache_size: int = venv_cache.DEFAULT_CACHE_SIZE,
+              stats: Optional[Dict] = None, mode: str = "worker") -> tuple[List[TestResult], bool]:
+    """Run the Python suite and return results.
 
-def run_tests(working_dir: str, venv_path: str = "venv", timeout_minutes: int = 20) -> tuple[List[TestResult], bool]:
-    """Run Python pytest tests and return results.
+    mode "worker" (default) and "inprocess" drive the suite's own test
+    discovery directly and need no venv, as the suite only uses the standard
+    library; "pytest" is the venv + pytest path described below.
 
     Environment variables are inherited from orchestrator's loaded .env file.
-    Automatically sets up venv and installs dependencies if needed.
+    The venv comes from the dependency-hash cache (venv_cache_size > 0) or is
+    created at working_dir/venv_path and reinstalled every run (size 0).
+    Setup timing and the cache outcome are written to stats. Test output is
+    streamed; the run is killed if it prints nothing for
+    idle_timeout_minutes (0 disables hang detection).
     """
+    if mode not in MODES:
+        raise ValueError(f"Unknown python suite mode '{mode}', expected one of {', '.join(MODES)}")
+    if mode != "pytest":
+        return _run_native(working_dir, mode, timeout_minutes, idle_timeout_minutes, stats)
+
     results = []
     start_time = time.time()
+    stats = stats if stats is not None else {}
+    requirements_file = os.path.join(working_dir, "requirements.txt")
 
-    # Ensure venv exists and is properly configured
-    venv_root = os.path.join(working_dir, venv_path)
-    venv_activate = os.path.join(venv_root, "bin", "activate")
-    python_cmd = os.path.join(venv_root, "bin", "python")
-    pytest_cmd = os.path.join(venv_root, "bin", "pytest")
+    # The cached venv stays locked against eviction until pytest exits
+    with ExitStack() as venv_lease:
+        if venv_cache_size > 0:
+            python_cmd, error = venv_lease.enter_context(venv_cache.use_venv(
+                requirements_file, venv_cache_dir, venv_cache_size, stats=stats))
+        else:
+            python_cmd, error = _prepare_local_venv(working_dir, venv_path)
+            stats.update(venv_cache="disabled", venv_setup_seconds=round(time.time() - start_time, 1))
 
-    # Create venv if it doesn't exist
-    if not os.path.exists(venv_activate):
-        print(f"    Creating Python virtual environment at {venv_path}...")
-        result = run_command(
-            ["python3", "-m", "venv", venv_path],
-            cwd=working_dir,
-            timeout=300,
-            env=os.environ.copy()
-        )
-        if result.returncode != 0:
+        if error:
             results.append(TestResult(
                 test_id="python-venv-setup",
                 name="Python Virtual Environment Setup",
@@ -40,42 +76,21 @@ def run_tests(working_dir: str, venv_path: str = "venv", timeout_minutes: int =
                 framework="python",
                 status="FAIL",
                 duration_seconds=time.time() - start_time,
-                error_message=f"Failed to create venv: {result.stderr}"
+                error_message=error
             ))
             return results, False
-        print("    ✅ Virtual environment created")
+        print(f"    ✅ Virtual environment ready ({stats['venv_cache']}, {stats['venv_setup_seconds']:.1f}s)")
 
-    # Install dependencies if requirements.txt exists
-    requirements_file = os.path.join(working_dir, "requirements.txt")
-    if os.path.exists(requirements_file):
-        print(f"    Installing dependencies from {requirements_file}...")
-        result = run_command(
-            [python_cmd, "-m", "pip", "install", "-q", "-r", "requirements.txt"],
+        # Run pytest with JSON report
+        # Environment variables are automatically inherited from os.environ
+        result = run_command_streaming(
+            [python_cmd, "-m", "pytest", "-v", "--json-report", "--json-report-file=results.json"],
             cwd=working_dir,
-            timeout=600,
-            env=os.environ.copy()
+            timeout=timeout_minutes * 60 + DEADLINE_SLACK_SECONDS,
+            env=os.environ.copy(),
+            idle_timeout=idle_timeout_minutes * 60,
+            on_line=_progress
         )
-        if result.returncode != 0:
-            results.append(TestResult(
-                test_id="python-deps-install",
-                name="Python Dependencies Installation",
-                category="setup",
-                framework="python",
-                status="FAIL",
-                duration_seconds=time.time() - start_time,
-                error_message=f"Failed to install dependencies: {result.stderr}"
-            ))
-            return results, False
-        print("    ✅ Dependencies installed")
-
-    # Run pytest with JSON report
-    # Environment variables are automatically inherited from os.environ
-    result = run_command(
-        [pytest_cmd, "-v", "--json-report", "--json-report-file=results.json"],
-        cwd=working_dir,
-        timeout=timeout_minutes * 60 + 30,
-        env=os.environ.copy()
-    )
 
     success = result.returncode == 0
 
@@ -140,8 +155,8 @@ def run_tests(working_dir: str, venv_path: str = "venv", timeout_minutes: int =
                 error_message=f"Failed to parse results: {str(e)}"
             ))
 
-    # If no results parsed, create a summary result
-    if not results and not success:
+    # If no results parsed, or the run was killed on timeout/hang, add a summary result
+    if not success and (not results or result.returncode == 124):
         results.append(TestResult(
             test_id="python-suite",
             name="Python Test Suite",
@@ -153,3 +168,51 @@ def run_tests(working_dir: str, venv_path: str = "venv", timeout_minutes: int =
         ))
 
     return results, success
+
+
+def _run_native(working_dir: str, mode: str, timeout_minutes: int,
+                idle_timeout_minutes: int, stats: Optional[Dict]) -> tuple[List[TestResult], bool]:
+    start_time = time.time()
+    if stats is not None:
+        stats["mode"] = mode
+    if mode == "inprocess":
+        results, error = python_native.run_in_process(working_dir)
+    else:
+        results, error = python_native.run_in_worker(
+            working_dir, timeout_minutes * 60 + DEADLINE_SLACK_SECONDS, idle_timeout_minutes * 60)
+
+    if error:
+        results.append(TestResult(
+            test_id="python-suite",
+            name="Python Test Suite",
+            category="runtime",
+            framework="python",
+            status="FAIL",
+            duration_seconds=time.time() - start_time,
+            error_message=error
+        ))
+    success = not error and all(r.status != "FAIL" for r in results)
+    return results, success
+
+
+def _prepare_local_venv(working_dir: str, venv_path: str) -> tuple:
+    """Create working_dir/venv_path if needed and install requirements into it."""
+    venv_root = os.path.join(working_dir, venv_path)
+    python_cmd = os.path.join(venv_root, "bin", "python")
+
+    if not os.path.exists(os.path.join(venv_root, "bin", "activate")):
+        print(f"    Creating Python virtual environment at {venv_path}...")
+        result = run_command(["python3", "-m", "venv", venv_path], cwd=working_dir, timeout=300)
+        if result.returncode != 0:
+            return python_cmd, f"Failed to create venv: {result.stderr}"
+
+    if os.path.exists(os.path.join(working_dir, "requirements.txt")):
+        print("    Installing dependencies from requirements.txt...")
+        result = run_command(
+            [python_cmd, "-m", "pip", "install", "-q", "-r", "requirements.txt"],
+            cwd=working_dir,
+            timeout=600
+        )
+        if result.returncode != 0:
+            return python_cmd, f"Failed to install dependencies: {result.stderr}"
+    return python_cmd, None
@@ -0,0 +1,88 @@
+"""Watch a results directory and hand back each JSON result once it is complete.
+
+Uses inotify (the optional ``inotify_simple`` package, ``pip install
+aks-spot-test[inotify]``) when available and falls back to polling the
+directory otherwise. Either way a file is only reported once it parses as
+JSON: writers that truncate and rewrite in place (``jq . > file``) can be
+seen half-written, so a file that fails to parse is retried whenever its
+size or mtime changes.
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
+# Aggregates written next to per-test results
+SKIP_PREFIXES = ("summary-", "trace-", "trials-")
+
+
+class ResultsWatcher:
+    """Report new or rewritten ``*.json`` files in results_dir."""
+
+    def __init__(self, results_dir: str, poll_interval: float = 1.0, use_inotify: bool = True):
+        self.results_dir = results_dir
+        self.poll_interval = poll_interval
+        os.makedirs(results_dir, exist_ok=True)
+        # path -> (mtime, size) of the version last seen (parsed or not)
+        self._seen: Dict[str, Tuple[float, int]] = {}
+        self._inotify = None
+        if use_inotify and inotify_simple is not None:
+            flags = inotify_simple.flags
+            self._inotify = inotify_simple.INotify()
+            self._inotify.add_watch(results_dir, flags.CLOSE_WRITE | flags.MOVED_TO)
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._inotify else "poll"
+
+    def wait(self, timeout: Optional[float] = None) -> List[Tuple[str, Any]]:
+        """Block up to timeout seconds for changes; return (path, data) per completed file."""
+        timeout = self.poll_interval if timeout is None else timeout
+        if self._inotify:
+            # Events only wake us up early; the directory scan below is the
+            # single source of truth (it also catches retries of partial files)
+            self._inotify.read(timeout=int(timeout * 1000))
+        else:
+            time.sleep(timeout)
+        return self.scan()
+
+    def scan(self) -> List[Tuple[str, Any]]:
+        """Parse every result file that changed since the last scan."""
+        completed = []
+        try:
+            names = sorted(os.listdir(self.results_dir))
+        except OSError:
+            return completed
+        for name in names:
+            if not name.endswith(".json") or name.startswith(SKIP_PREFIXES):
+                continue
+            path = os.path.join(self.results_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            version = (st.st_mtime, st.st_size)
+            if self._seen.get(path) == version:
+                continue
+            self._seen[path] = version
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                # Partial write: forget the version so any change is retried
+                # (and an unchanged file is retried on the next scan too)
+                self._seen.pop(path, None)
+                continue
+            completed.append((path, data))
+        return completed
+
+    def close(self):
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
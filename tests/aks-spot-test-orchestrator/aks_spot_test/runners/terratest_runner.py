@@ -1,76 +1,192 @@
 """Terratest (Go) test runner."""
 
+import json
 import os
+import re
 import time
-from typing import List
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Set, Tuple
+from .. import tracing
 from ..models import TestResult
-from ..utils import run_command
+from ..utils import StreamingCommand
 
+# Output lines kept per running test (and per package) for failure messages
+OUTPUT_TAIL_LINES = 100
+# Slack past timeout_minutes before go test is killed
+DEADLINE_SLACK_SECONDS = 30
+# Most the runner can take past timeout_minutes: the slack, then killing the
+# process group (the orchestrator adds its grace on top)
+OVERHEAD_SECONDS = DEADLINE_SLACK_SECONDS + 15
 
-def run_tests(working_dir: str, timeout_minutes: int = 10) -> tuple[List[TestResult], bool]:
+# go test framing lines that carry no failure information
+_FRAMING_RE = re.compile(r"^\s*(=== (RUN|PAUSE|CONT|NAME)|--- (PASS|SKIP))\b")
+
+_STATUS = {"pass": "PASS", "fail": "FAIL", "skip": "SKIP"}
+
+
+class GoTestAggregator:
+    """Turn a stream of ``go test -json`` events into TestResults.
+
+    Output is buffered per (package, test) in bounded deques and released as
+    soon as the test finishes, so memory stays flat however chatty the run.
+    Subtests ("TestFoo/case") are reported as their own results; a parent
+    that only failed because of its subtests names them. Package-level
+    failures (build errors, panics, go test -timeout) become a result for
+    the package when no test in it reported, and fail any test left running.
+    """
+
+    def __init__(self, tail_lines: int = OUTPUT_TAIL_LINES):
+        self.tail_lines = tail_lines
+        self._output: Dict[Tuple[str, str], Deque[str]] = {}
+        self._running: Dict[Tuple[str, str], float] = {}
+        self._failed_subtests: Dict[Tuple[str, str], List[str]] = {}
+        self._reported_packages: Set[str] = set()
+
+    def feed(self, event: dict) -> List[TestResult]:
+        """Consume one event and return the results it completed."""
+        action = event.get("Action")
+        package = event.get("Package", "")
+        test = event.get("Test", "")
+        key = (package, test)
+
+        if action == "output":
+            line = event.get("Output", "").rstrip("\n")
+            if line and not _FRAMING_RE.match(line):
+                self._buffer(key).append(line)
+            return []
+        if action == "run" and test:
+            self._running[key] = time.time()
+            return []
+        if action not in _STATUS:
+            return []
+        if test:
+            return [self._finish_test(key, _STATUS[action], event)]
+        return self._finish_package(package, _STATUS[action], event)
+
+    def finish(self) -> List[TestResult]:
+        """Fail every test still running when the stream ended (run killed)."""
+        results = []
+        for key in list(self._running):
+            results.append(self._finish_test(
+                key, "FAIL", {}, "Test did not complete (go test was killed or timed out)"))
+        self._output.clear()
+        return results
+
+    def _buffer(self, key: Tuple[str, str]) -> Deque[str]:
+        if key not in self._output:
+            self._output[key] = deque(maxlen=self.tail_lines)
+        return self._output[key]
+
+    def _finish_test(self, key: Tuple[str, str], status: str, event: dict,
+                     reason: str = "") -> TestResult:
+        package, test = key
+        started = self._running.pop(key, None)
+        output = self._output.pop(key, ())
+        failed_subtests = self._failed_subtests.pop(key, [])
+        self._reported_packages.add(package)
+
+        elapsed = event.get("Elapsed")
+        if elapsed is None:
+            elapsed = time.time() - started if started else 0.0
+
+        error_message = None
+        if status == "FAIL":
+            parts = [reason] if reason else []
+            if failed_subtests:
+                parts.append(f"Subtests failed: {', '.join(failed_subtests)}")
+            own_output = [line for line in output if not line.lstrip().startswith("--- FAIL")]
+            if own_output:
+                parts.append("\n".join(own_output))
+            error_message = "\n".join(parts) or "Test failed"
+
+        parent = test.rsplit("/", 1)[0] if "/" in test else ""
+        if parent and status == "FAIL":
+            self._failed_subtests.setdefault((package, parent), []).append(test)
+
+        evidence = {"package": package}
+        if parent:
+            evidence["parent"] = parent
+
+        if event:
+            _trace_test(event)
+        return TestResult(
+            test_id=test,
+            name=test,
+            category="infrastructure",
+            framework="terratest",
+            status=status,
+            duration_seconds=elapsed,
+            error_message=error_message,
+            evidence=evidence
+        )
+
+    def _finish_package(self, package: str, status: str, event: dict) -> List[TestResult]:
+        output = self._output.pop((package, ""), ())
+        results = []
+        if status == "FAIL":
+            detail = "\n".join(output) or "Package failed"
+            for key in [k for k in self._running if k[0] == package]:
+                results.append(self._finish_test(
+                    key, "FAIL", {}, f"Package {package} failed while the test was running"))
+                results[-1].error_message += f"\n{detail}"
+            if package not in self._reported_packages and not results:
+                results.append(TestResult(
+                    test_id=package,
+                    name=package,
+                    category="infrastructure",
+                    framework="terratest",
+                    status="FAIL",
+                    duration_seconds=event.get("Elapsed", 0.0),
+                    error_message=detail,
+                    evidence={"package": package}
+                ))
+        self._reported_packages.discard(package)
+        return results
+
+
+def run_tests(working_dir: str, timeout_minutes: int = 10,
+              idle_timeout_minutes: int = 0) -> tuple[List[TestResult], bool]:
     """Run Terratest (Go) tests and return results.
 
     Environment variables are inherited from orchestrator's loaded .env file.
+    go test -json events are aggregated as they are emitted and each result
+    is reported as soon as its test finishes; the run is killed if it prints
+    nothing for idle_timeout_minutes (0 disables hang detection).
     """
     results = []
     start_time = time.time()
+    aggregator = GoTestAggregator()
 
     # Run go test with JSON output
     # Environment variables are automatically inherited from os.environ
-    result = run_command(
+    proc = StreamingCommand(
         ["go", "test", "-v", "-timeout", f"{timeout_minutes}m", "-json", "./..."],
         cwd=working_dir,
-        timeout=timeout_minutes * 60 + 30,
-        env=os.environ.copy()
+        timeout=timeout_minutes * 60 + DEADLINE_SLACK_SECONDS,
+        env=os.environ.copy(),
+        idle_timeout=idle_timeout_minutes * 60
     )
 
+    for stream, line in proc:
+        line = line.strip()
+        if stream != "stdout" or not line.startswith("{"):
+            continue
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        for test_result in aggregator.feed(event):
+            results.append(test_result)
+            print(f"    [terratest] {test_result.status} {test_result.test_id} "
+                  f"({test_result.duration_seconds:.1f}s)")
+    results.extend(aggregator.finish())
+
+    result = proc.result
     success = result.returncode == 0
 
-    # Parse go test JSON output
-    if result.stdout:
-        for line in result.stdout.split('\n'):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                import json
-                event = json.loads(line)
-                action = event.get("Action")
-                test_name = event.get("Test", "")
-
-                if action == "pass" and test_name:
-                    results.append(TestResult(
-                        test_id=test_name,
-                        name=test_name,
-                        category="infrastructure",
-                        framework="terratest",
-                        status="PASS",
-                        duration_seconds=event.get("Elapsed", 0.0)
-                    ))
-                elif action == "fail" and test_name:
-                    results.append(TestResult(
-                        test_id=test_name,
-                        name=test_name,
-                        category="infrastructure",
-                        framework="terratest",
-                        status="FAIL",
-                        duration_seconds=event.get("Elapsed", 0.0),
-                        error_message=event.get("Output", "Test failed")
-                    ))
-                elif action == "skip" and test_name:
-                    results.append(TestResult(
-                        test_id=test_name,
-                        name=test_name,
-                        category="infrastructure",
-                        framework="terratest",
-                        status="SKIP",
-                        duration_seconds=event.get("Elapsed", 0.0)
-                    ))
-            except:
-                continue
-
-    # If no results parsed, create a summary result
-    if not results and not success:
+    # If no results parsed, or the run was killed on timeout/hang, add a summary result
+    if not success and (not results or result.returncode == 124):
         results.append(TestResult(
             test_id="terratest-suite",
             name="Terratest Suite",
@@ -82,3 +198,35 @@ def run_tests(working_dir: str, timeout_minutes: int = 10) -> tuple[List[TestRes
         ))
 
     return results, success
+
+
+def _parse_go_time(value: str) -> Optional[datetime]:
+    """Parse an RFC3339 timestamp from go test -json (nanosecond precision)."""
+    if not value:
+        return None
+    value = value.replace("Z", "+00:00")
+    # fromisoformat accepts at most microseconds
+    match = re.match(r"^([^.]+)\.(\d+)(.*)$", value)
+    if match:
+        head, frac, tz = match.groups()
+        value = f"{head}.{frac[:6].ljust(6, '0')}{tz}"
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _trace_test(event: dict):
+    """Emit a span for a finished go test, reconstructed from its end time and Elapsed."""
+    if not tracing.enabled():
+        return
+    end = _parse_go_time(event.get("Time", ""))
+    if not end:
+        return
+    end_ts = end.timestamp()
+    elapsed = float(event.get("Elapsed", 0.0) or 0.0)
+    tracing.emit(
+        event.get("Test", ""), "test", end_ts - elapsed, end_ts,
+        {"package": event.get("Package", ""), "status": event.get("Action", "")},
+        source="terratest", tid=0
+    )
@@ -0,0 +1,160 @@
+"""Dependency-hash cache of prebuilt virtual environments for the Python suite.
+
+A venv is keyed on sha256(requirements.txt + interpreter version), built once
+under the cache directory and reused until either input changes. The most
+recently used ``size`` venvs are kept; older ones are deleted. A ``.ready``
+marker is written only after pip succeeds, so a venv whose build was
+interrupted is rebuilt rather than used.
+
+Each venv has a ``<key>.lock`` file next to it. A build holds it exclusively;
+a run holds it shared for as long as it uses the venv. Eviction takes it
+exclusively without blocking and skips the venv if that fails, so a venv in
+use by a concurrent orchestrator run is never deleted under it.
+"""
+
+import fcntl
+import hashlib
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+from ..utils import run_command
+
+DEFAULT_CACHE_DIR = "~/.cache/aks-spot-test/venvs"
+DEFAULT_CACHE_SIZE = 3
+
+READY_MARKER = ".ready"
+
+
+def venv_key(requirements_file: str, base_python: str = "python3") -> Optional[str]:
+    """Hash the requirements file and the interpreter version; None if no interpreter."""
+    result = run_command([base_python, "-c", "import sys; print(sys.version)"], timeout=30)
+    if result.returncode != 0:
+        return None
+    digest = hashlib.sha256(result.stdout.strip().encode())
+    if os.path.exists(requirements_file):
+        with open(requirements_file, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+@contextmanager
+def use_venv(requirements_file: str, cache_dir: str = DEFAULT_CACHE_DIR,
+             size: int = DEFAULT_CACHE_SIZE, base_python: str = "python3",
+             stats: Optional[Dict] = None) -> Iterator[Tuple[str, Optional[str]]]:
+    """Yield (python executable, error) for a venv matching requirements_file.
+
+    The venv is locked against eviction until the with block exits. stats
+    (if given) receives the cache outcome ("warm"/"cold"), the key and the
+    setup time in seconds.
+    """
+    stats = stats if stats is not None else {}
+    start = time.time()
+    cache_dir = os.path.expanduser(cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    key = venv_key(requirements_file, base_python)
+    if not key:
+        yield "", f"Python interpreter '{base_python}' not available"
+        return
+    venv_root = os.path.join(cache_dir, key)
+    python_cmd = os.path.join(venv_root, "bin", "python")
+    marker = os.path.join(venv_root, READY_MARKER)
+    lock_path = os.path.join(cache_dir, f"{key}.lock")
+    stats["venv_key"] = key
+
+    built = False
+    while True:
+        # Serialise builds of the same key across concurrent orchestrator runs
+        lock = _lock(lock_path, fcntl.LOCK_EX)
+        if not os.path.exists(marker):
+            built = True
+            error = _build(venv_root, python_cmd, requirements_file, base_python)
+            if error:
+                shutil.rmtree(venv_root, ignore_errors=True)
+                lock.close()
+                stats["venv_cache"] = "cold"
+                stats["venv_setup_seconds"] = round(time.time() - start, 1)
+                yield "", error
+                return
+            with open(marker, "w") as f:
+                f.write(requirements_file + "\n")
+        # Marker mtime is the LRU timestamp
+        os.utime(marker)
+        # Downgrade to shared for the run; flock conversion is not atomic, so
+        # start over if the venv was evicted in between
+        fcntl.flock(lock, fcntl.LOCK_SH)
+        if _is_current(lock, lock_path) and os.path.exists(marker):
+            break
+        lock.close()
+
+    stats["venv_cache"] = "cold" if built else "warm"
+    try:
+        _evict(cache_dir, size, keep=key)
+        stats["venv_setup_seconds"] = round(time.time() - start, 1)
+        yield python_cmd, None
+    finally:
+        lock.close()
+
+
+def _lock(path: str, operation: int):
+    """Open path and flock it, retrying if it was deleted while we waited."""
+    while True:
+        f = open(path, "a")
+        fcntl.flock(f, operation)
+        if _is_current(f, path):
+            return f
+        f.close()
+
+
+def _is_current(f, path: str) -> bool:
+    """True if the open lock file f is still the file at path (not evicted)."""
+    try:
+        return os.fstat(f.fileno()).st_ino == os.stat(path).st_ino
+    except FileNotFoundError:
+        return False
+
+
+def _build(venv_root: str, python_cmd: str, requirements_file: str, base_python: str) -> Optional[str]:
+    shutil.rmtree(venv_root, ignore_errors=True)
+    print(f"    Building cached virtual environment {os.path.basename(venv_root)}...")
+    result = run_command([base_python, "-m", "venv", venv_root], timeout=300)
+    if result.returncode != 0:
+        return f"Failed to create venv: {result.stderr}"
+    if os.path.exists(requirements_file):
+        result = run_command(
+            [python_cmd, "-m", "pip", "install", "-q", "-r", requirements_file],
+            cwd=os.path.dirname(os.path.abspath(requirements_file)),
+            timeout=600
+        )
+        if result.returncode != 0:
+            return f"Failed to install dependencies: {result.stderr}"
+    return None
+
+
+def _evict(cache_dir: str, size: int, keep: str):
+    """Delete least recently used venvs beyond size.
+
+    A venv whose lock is held (in use or being built by any run) is skipped.
+    """
+    ready = []
+    for name in os.listdir(cache_dir):
+        marker = os.path.join(cache_dir, name, READY_MARKER)
+        if os.path.exists(marker):
+            ready.append((os.path.getmtime(marker), name))
+    ready.sort(reverse=True)
+    for _, name in ready[size:]:
+        if name == keep:
+            continue
+        lock_path = os.path.join(cache_dir, f"{name}.lock")
+        with open(lock_path, "a") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue
+            if not _is_current(lock, lock_path):
+                continue
+            shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+            # Removed while still locked; waiters notice and reopen
+            os.remove(lock_path)
@@ -0,0 +1,113 @@
+"""Run-wide span tracing in Chrome trace event format.
+
+When tracing is enabled the orchestrator points TRACE_DIR at a per-run
+directory. Every producer appends complete ("X") events to its own
+``<source>-<pid>.trace.jsonl`` file there: the orchestrator itself, the
+terratest runner (spans synthesised from ``go test -json``), the bash suite
+(``lib/common.sh``) and the Python suite (``lib/tracing.py``).
+``merge_traces`` folds them into a single file that opens in Perfetto.
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+_lock = threading.Lock()
+
+
+def trace_dir() -> str:
+    """Return the active trace directory, or "" when tracing is disabled."""
+    return os.environ.get("TRACE_DIR", "")
+
+
+def enabled() -> bool:
+    """Check if tracing is enabled for this process."""
+    return bool(trace_dir())
+
+
+def emit(name: str, cat: str, start: float, end: float,
+         args: Optional[Dict[str, Any]] = None, source: str = "orchestrator",
+         tid: Optional[int] = None):
+    """Append a complete event; start/end are epoch seconds."""
+    directory = trace_dir()
+    if not directory:
+        return
+    event = {
+        "name": name,
+        "cat": cat,
+        "ph": "X",
+        "ts": int(start * 1_000_000),
+        "dur": max(int((end - start) * 1_000_000), 0),
+        "pid": os.getpid(),
+        "tid": tid if tid is not None else threading.get_ident(),
+        "args": args or {},
+    }
+    line = json.dumps(event, default=str) + "\n"
+    path = os.path.join(directory, f"{source}-{os.getpid()}.trace.jsonl")
+    with _lock:
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "a") as f:
+            f.write(line)
+
+
+@contextmanager
+def span(name: str, cat: str = "orchestrator", **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """Time the enclosed block and emit it as a span.
+
+    Yields the span's attribute dict so callers can attach results
+    before the span closes.
+    """
+    if not enabled():
+        yield attrs
+        return
+    start = time.time()
+    try:
+        yield attrs
+    except BaseException as e:
+        attrs["error"] = repr(e)
+        raise
+    finally:
+        emit(name, cat, start, time.time(), attrs)
+
+
+def merge_traces(directory: str, output_path: str) -> int:
+    """Merge all span files in directory into one Chrome trace file.
+
+    Each (source, pid) pair becomes its own process track named after the
+    producer, so bash, python, terratest and orchestrator spans line up on
+    one timeline. Returns the number of span events written.
+    """
+    events = []
+    tracks: Dict[tuple, int] = {}
+
+    for path in sorted(glob.glob(os.path.join(directory, "*.trace.jsonl"))):
+        source = os.path.basename(path).split("-", 1)[0]
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                key = (source, event.get("pid", 0))
+                if key not in tracks:
+                    tracks[key] = len(tracks) + 1
+                event["pid"] = tracks[key]
+                events.append(event)
+
+    events.sort(key=lambda e: e.get("ts", 0))
+    metadata = [
+        {"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+         "args": {"name": f"{source} ({orig_pid})"}}
+        for (source, orig_pid), pid in tracks.items()
+    ]
+
+    with open(output_path, "w") as f:
+        json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+    return len(events)
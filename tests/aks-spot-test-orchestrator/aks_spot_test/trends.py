@@ -0,0 +1,264 @@
+"""Trend index across runs in the reports directory.
+
+``trends-index.json`` in reports.output_dir is maintained incrementally.
+``update_index`` loads only report files it has not seen, or that changed
+(matched by name, size and mtime), and appends per-run and per-test summaries:
+
+    {"format": "aks-spot-trends", "version": 1,
+     "files": {"test-report-<ts>.json": {"size": ..., "mtime": ..., "run_id": ...}},
+     "runs": [{"run_id", "timestamp", "cluster", "total", "passed", "failed",
+               "skipped", "pass_rate", "duration_seconds", "eviction_rate_per_hour",
+               "evictions", "remediations", "remediations_failed", "compacted"}],
+     "tests": {"<test_id>": {"name", "framework", "category",
+                             "history": [[timestamp, status, duration, run_id], ...],
+                             "compacted": {"runs", "passed", "failed", "skipped",
+                                           "duration_seconds"}}}}
+
+``compact`` enforces reports.retention_days. An expired run's report files
+(and its timeline and trace) are deleted only after the run is in the index.
+Its per-test history entries are folded into each test's "compacted" totals,
+and its run summary stays, marked compacted. Trends therefore cover every run
+ever made, while the directory and the index stay bounded. History entries
+are matched to runs by run_id, since runs from several clusters can share a
+timestamp. Entries indexed before run_id was stored have three items and are
+matched by timestamp.
+"""
+
+import json
+import os
+import shutil
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from .loader import load_report
+from .models import TestReport
+from .reporters.charts import sparkline
+
+INDEX_FILE = "trends-index.json"
+FORMAT = "aks-spot-trends"
+REPORT_PREFIX = "test-report-"
+# Merged reports repeat results of runs that are indexed on their own
+MERGED_PREFIX = "test-report-merged-"
+REPORT_EXTENSIONS = (".json", ".ndjson")
+# Other files a run leaves behind, by its timestamp string
+RUN_ARTIFACTS = ("test-report-{ts}.json", "test-report-{ts}.ndjson", "test-report-{ts}.html",
+                 "test-report-{ts}.md", "timeline-{ts}.json.gz", "trace-{ts}.json")
+
+
+def empty_index() -> Dict:
+    return {"format": FORMAT, "version": 1, "files": {}, "runs": [], "tests": {}}
+
+
+def load_index(reports_dir: str) -> Dict:
+    path = os.path.join(reports_dir, INDEX_FILE)
+    if not os.path.exists(path):
+        return empty_index()
+    with open(path) as f:
+        index = json.load(f)
+    return index if index.get("format") == FORMAT else empty_index()
+
+
+def save_index(index: Dict, reports_dir: str):
+    path = os.path.join(reports_dir, INDEX_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def _report_files(reports_dir: str) -> List[str]:
+    return sorted(
+        name for name in os.listdir(reports_dir)
+        if name.startswith(REPORT_PREFIX) and not name.startswith(MERGED_PREFIX)
+        and name.endswith(REPORT_EXTENSIONS)
+    )
+
+
+def add_run(index: Dict, report: TestReport, source: str = ""):
+    """Append one run's summary and per-test entries (skipped if the run is already indexed)."""
+    if any(run["run_id"] == report.run_id for run in index["runs"]):
+        return
+    timestamp = report.timestamp.isoformat()
+    results = report.test_results
+    passed = sum(1 for r in results if r.status == "PASS")
+    index["runs"].append({
+        "run_id": report.run_id,
+        "timestamp": timestamp,
+        "cluster": report.cluster_name,
+        "source": source,
+        "total": len(results),
+        "passed": passed,
+        "failed": sum(1 for r in results if r.status == "FAIL"),
+        "skipped": sum(1 for r in results if r.status == "SKIP"),
+        "pass_rate": round(passed / len(results) * 100, 2) if results else 0.0,
+        "duration_seconds": round(report.duration_seconds, 1),
+        "eviction_rate_per_hour": round(report.eviction_rate_per_hour, 2),
+        "evictions": len(report.eviction_events),
+        "remediations": sum(1 for a in report.remediation_actions if not a.dry_run),
+        "remediations_failed": sum(1 for a in report.remediation_actions if not a.dry_run and not a.success),
+        "compacted": False,
+    })
+    index["runs"].sort(key=lambda run: run["timestamp"])
+    for result in results:
+        test = index["tests"].setdefault(result.test_id, {"history": []})
+        test.update(name=result.name, framework=result.framework, category=result.category)
+        history = test["history"]
+        history.append([timestamp, result.status, round(result.duration_seconds, 2), report.run_id])
+        # Reports usually arrive in order; only an older backfill needs a sort
+        if len(history) > 1 and history[-2][0] > timestamp:
+            history.sort(key=lambda entry: entry[0])
+
+
+def update_index(reports_dir: str, index: Optional[Dict] = None) -> Tuple[Dict, int]:
+    """Ingest report files the index has not seen; returns (index, runs added)."""
+    index = index if index is not None else load_index(reports_dir)
+    added = 0
+    for name in _report_files(reports_dir):
+        path = os.path.join(reports_dir, name)
+        stat = os.stat(path)
+        seen = index["files"].get(name)
+        if seen and seen["size"] == stat.st_size and seen["mtime"] == stat.st_mtime:
+            continue
+        try:
+            report = load_report(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"  ⚠️  Skipping unreadable report {name}: {e}")
+            continue
+        before = len(index["runs"])
+        add_run(index, report, source=name)
+        added += len(index["runs"]) - before
+        index["files"][name] = {"size": stat.st_size, "mtime": stat.st_mtime, "run_id": report.run_id}
+    return index, added
+
+
+def compact(index: Dict, reports_dir: str, retention_days: int,
+            now: Optional[datetime] = None) -> int:
+    """Fold runs older than retention_days into the index and delete their files.
+
+    Returns the number of runs compacted. retention_days <= 0 keeps everything.
+    """
+    if retention_days <= 0:
+        return 0
+    cutoff = ((now or datetime.now()) - timedelta(days=retention_days)).isoformat()
+    expired = [run for run in index["runs"] if not run["compacted"] and run["timestamp"] < cutoff]
+    if not expired:
+        return 0
+    expired_ids = {run["run_id"] for run in expired}
+    # Legacy three-item entries carry no run_id, only their run's timestamp
+    expired_at = {run["timestamp"] for run in expired}
+
+    for test in index["tests"].values():
+        keep = []
+        for entry in test["history"]:
+            if len(entry) > 3:
+                is_expired = entry[3] in expired_ids
+            else:
+                is_expired = entry[0] in expired_at
+            if not is_expired:
+                keep.append(entry)
+                continue
+            totals = test.setdefault("compacted", {"runs": 0, "passed": 0, "failed": 0, "skipped": 0,
+                                                   "duration_seconds": 0.0})
+            totals["runs"] += 1
+            key = {"PASS": "passed", "FAIL": "failed", "SKIP": "skipped"}.get(entry[1])
+            if key:
+                totals[key] += 1
+            totals["duration_seconds"] = round(totals["duration_seconds"] + entry[2], 2)
+        test["history"] = keep
+
+    for run in expired:
+        run["compacted"] = True
+        source = run.get("source", "")
+        if source.startswith(REPORT_PREFIX):
+            ts = os.path.splitext(source)[0][len(REPORT_PREFIX):]
+            for pattern in RUN_ARTIFACTS:
+                path = os.path.join(reports_dir, pattern.format(ts=ts))
+                if os.path.exists(path):
+                    os.remove(path)
+            shutil.rmtree(os.path.join(reports_dir, f"trace-{ts}"), ignore_errors=True)
+        index["files"].pop(source, None)
+    return len(expired)
+
+
+def trend_report(index: Dict, output_path: str, window: int = 30):
+    """Write a Markdown trend report over the last ``window`` runs."""
+    runs = index["runs"][-window:]
+    lines = ["# AKS Spot Test Trends\n\n"]
+    compacted = sum(1 for run in index["runs"] if run["compacted"])
+    lines.append(f"**Runs indexed:** {len(index['runs'])} ({compacted} compacted) | "
+                 f"**Tests tracked:** {len(index['tests'])} | "
+                 f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+    if not runs:
+        lines.append("No runs indexed yet.\n")
+        _write(output_path, lines)
+        return
+
+    lines.append(f"## Last {len(runs)} Runs\n\n")
+    lines.append("| Series | First | Last | Min | Max | Trend |\n")
+    lines.append("|--------|-------|------|-----|-----|-------|\n")
+    for label, key, fmt in (("Pass rate %", "pass_rate", "{:.1f}"),
+                            ("Evictions/hour", "eviction_rate_per_hour", "{:.1f}"),
+                            ("Remediations", "remediations", "{}"),
+                            ("Tests", "total", "{}"),
+                            ("Duration (s)", "duration_seconds", "{:.0f}")):
+        values = [run[key] for run in runs]
+        lines.append(f"| {label} | {fmt.format(values[0])} | {fmt.format(values[-1])} | "
+                     f"{fmt.format(min(values))} | {fmt.format(max(values))} | `{sparkline(values)}` |\n")
+    lines.append("\n")
+
+    lines.append("| Date | Cluster | Tests | Pass Rate | Evictions/h | Remediations (failed) |\n")
+    lines.append("|------|---------|-------|-----------|-------------|-----------------------|\n")
+    for run in reversed(runs):
+        lines.append(f"| {run['timestamp'][:16].replace('T', ' ')} | {run['cluster']} | {run['total']} | "
+                     f"{run['pass_rate']:.1f}% | {run['eviction_rate_per_hour']:.1f} | "
+                     f"{run['remediations']} ({run['remediations_failed']}) |\n")
+    lines.append("\n")
+
+    since = runs[0]["timestamp"]
+    recent = {test_id: [entry for entry in test["history"] if entry[0] >= since]
+              for test_id, test in index["tests"].items()}
+
+    # Flaky: both passed and failed within the window
+    flaky = []
+    for test_id, history in recent.items():
+        statuses = [entry[1] for entry in history]
+        if "PASS" in statuses and "FAIL" in statuses:
+            flaky.append((statuses.count("FAIL") / len(statuses), test_id, statuses))
+    if flaky:
+        lines.append("## Flaky Tests\n\n")
+        lines.append("| Test | Name | Failure Rate | Recent |\n")
+        lines.append("|------|------|--------------|--------|\n")
+        for rate, test_id, statuses in sorted(flaky, reverse=True)[:20]:
+            recent_marks = "".join("✅" if s == "PASS" else "❌" if s == "FAIL" else "⏭️" for s in statuses[-10:])
+            lines.append(f"| {test_id} | {index['tests'][test_id]['name']} | {rate * 100:.0f}% | {recent_marks} |\n")
+        lines.append("\n")
+
+    # Slowest tests by latest duration, with their duration trend
+    timed = [(history[-1][2], test_id, [entry[2] for entry in history])
+             for test_id, history in recent.items() if history]
+    if timed:
+        lines.append("## Test Durations\n\n")
+        lines.append("| Test | Name | Latest | Mean | Trend |\n")
+        lines.append("|------|------|--------|------|-------|\n")
+        for latest, test_id, durations in sorted(timed, reverse=True)[:20]:
+            lines.append(f"| {test_id} | {index['tests'][test_id]['name']} | {latest:.1f}s | "
+                         f"{sum(durations) / len(durations):.1f}s | `{sparkline(durations, width=30)}` |\n")
+        lines.append("\n")
+
+    lines.append("---\n\n")
+    lines.append("*Generated by `aks-spot-test` v1.0.0*\n")
+    _write(output_path, lines)
+
+
+def _write(output_path: str, lines: List[str]):
+    with open(output_path, "w") as f:
+        f.writelines(lines)
+
+
+def refresh(reports_dir: str, retention_days: int = 0, window: int = 30,
+            output_path: Optional[str] = None) -> Dict[str, int]:
+    """Update the index, compact expired runs, save, and write the trend report."""
+    index, added = update_index(reports_dir)
+    compacted = compact(index, reports_dir, retention_days)
+    save_index(index, reports_dir)
+    trend_report(index, output_path or os.path.join(reports_dir, "trends.md"), window)
+    return {"added": added, "compacted": compacted, "runs": len(index["runs"]), "tests": len(index["tests"])}
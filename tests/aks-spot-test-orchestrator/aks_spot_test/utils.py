@@ -1,9 +1,18 @@
 """Common utility functions."""
 
 import os
+import queue
+import signal
 import subprocess
 import json
-from typing import Any, List, Optional
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+from . import metrics, tracing
+
+# Lines of stdout/stderr kept for error messages when streaming
+STREAM_TAIL_LINES = 200
 
 
 def run_command(cmd: List[str], cwd: Optional[str] = None, timeout: int = 300, env: Optional[dict] = None) -> subprocess.CompletedProcess:
@@ -18,22 +27,181 @@ def run_command(cmd: List[str], cwd: Optional[str] = None, timeout: int = 300, e
     Returns:
         CompletedProcess instance
     """
-    try:
-        return subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            cwd=cwd,
-            env=env or os.environ.copy()
+    start = time.time()
+    with tracing.span(" ".join(cmd[:2]), cmd[0], args=" ".join(cmd)) as attrs:
+        try:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                cwd=cwd,
+                env=env or os.environ.copy()
+            )
+        except subprocess.TimeoutExpired:
+            result = subprocess.CompletedProcess(
+                args=cmd,
+                returncode=124,
+                stdout="",
+                stderr=f"Command timed out after {timeout}s"
+            )
+        attrs["returncode"] = result.returncode
+    metrics.record_command(cmd, time.time() - start, result.returncode)
+    return result
+
+
+class StreamingCommand:
+    """Run a command and iterate over its output lines as they are written.
+
+    Iterating yields ("stdout" | "stderr", line) tuples. Only the last
+    tail_lines lines of each stream are kept, so memory stays flat for long,
+    chatty suites. The command is killed when it exceeds timeout, or when it
+    writes nothing for idle_timeout seconds (a likely hang). After iteration,
+    ``result`` holds a CompletedProcess whose stdout/stderr are the tails.
+
+    Usage:
+        proc = StreamingCommand(["./run-all-tests.sh"], cwd=..., timeout=1200)
+        for stream, line in proc:
+            ...
+        result = proc.result
+    """
+
+    def __init__(self, cmd: List[str], cwd: Optional[str] = None, timeout: int = 300,
+                 env: Optional[dict] = None, idle_timeout: Optional[int] = None,
+                 tail_lines: int = STREAM_TAIL_LINES):
+        self.cmd = cmd
+        self.cwd = cwd
+        self.timeout = timeout
+        self.env = env
+        self.idle_timeout = idle_timeout or None
+        self.stdout_tail: deque = deque(maxlen=tail_lines)
+        self.stderr_tail: deque = deque(maxlen=tail_lines)
+        self.timed_out = False
+        self.hung = False
+        self.lines = 0
+        self.result: Optional[subprocess.CompletedProcess] = None
+        self._proc: Optional[subprocess.Popen] = None
+
+    def terminate(self):
+        """Kill the running command from another thread; iteration then ends."""
+        if self._proc and self._proc.poll() is None:
+            _kill(self._proc)
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        with tracing.span(" ".join(self.cmd[:2]), self.cmd[0], args=" ".join(self.cmd),
+                          streaming=True) as attrs:
+            yield from self._stream()
+            attrs.update(returncode=self.result.returncode, lines=self.lines,
+                         timed_out=self.timed_out, hung=self.hung)
+
+    def _stream(self) -> Iterator[Tuple[str, str]]:
+        try:
+            proc = subprocess.Popen(
+                self.cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                text=True, bufsize=1, cwd=self.cwd, env=self.env or os.environ.copy(),
+                start_new_session=True
+            )
+        except OSError as e:
+            self.result = subprocess.CompletedProcess(self.cmd, 127, "", str(e))
+            return
+        self._proc = proc
+
+        lines: queue.Queue = queue.Queue()
+        readers = [
+            threading.Thread(target=_pump, args=(proc.stdout, "stdout", lines), daemon=True),
+            threading.Thread(target=_pump, args=(proc.stderr, "stderr", lines), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        start = last_output = time.time()
+        open_streams = 2
+        try:
+            while open_streams:
+                now = time.time()
+                wait_for = self.timeout - (now - start)
+                if self.idle_timeout:
+                    wait_for = min(wait_for, self.idle_timeout - (now - last_output))
+                if wait_for <= 0:
+                    if now - start >= self.timeout:
+                        self.timed_out = True
+                    else:
+                        self.hung = True
+                    _kill(proc)
+                    break
+                try:
+                    stream, line = lines.get(timeout=min(wait_for, 1.0))
+                except queue.Empty:
+                    continue
+                if line is None:
+                    open_streams -= 1
+                    continue
+                last_output = time.time()
+                self.lines += 1
+                (self.stdout_tail if stream == "stdout" else self.stderr_tail).append(line)
+                yield stream, line
+
+            # Both pipes closed, but the command may still be running
+            try:
+                proc.wait(timeout=max(self.timeout - (time.time() - start), 0))
+            except subprocess.TimeoutExpired:
+                self.timed_out = True
+                _kill(proc)
+        finally:
+            # Also reached when the consumer stops iterating early
+            if proc.poll() is None:
+                _kill(proc)
+        returncode = proc.returncode if proc.returncode is not None else -signal.SIGKILL
+        stderr = "\n".join(self.stderr_tail)
+        if self.timed_out:
+            returncode = 124
+            stderr += f"\nCommand timed out after {self.timeout}s"
+        elif self.hung:
+            returncode = 124
+            stderr += f"\nNo output for {self.idle_timeout}s, command looks hung and was killed"
+        self.result = subprocess.CompletedProcess(
+            self.cmd, returncode, "\n".join(self.stdout_tail), stderr.strip()
         )
+
+
+def _pump(pipe, name: str, lines: queue.Queue):
+    """Reader thread: forward lines from a pipe, then a None sentinel."""
+    try:
+        for line in pipe:
+            lines.put((name, line.rstrip("\n")))
+    finally:
+        pipe.close()
+        lines.put((name, None))
+
+
+def _kill(proc: subprocess.Popen):
+    """Terminate the command's whole process group (kubectl/az children included)."""
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait(timeout=10)
     except subprocess.TimeoutExpired:
-        return subprocess.CompletedProcess(
-            args=cmd,
-            returncode=124,
-            stdout="",
-            stderr=f"Command timed out after {timeout}s"
-        )
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.wait(timeout=5)
+        except (ProcessLookupError, subprocess.TimeoutExpired):
+            pass
+    except ProcessLookupError:
+        pass
+
+
+def run_command_streaming(cmd: List[str], cwd: Optional[str] = None, timeout: int = 300,
+                          env: Optional[dict] = None, idle_timeout: Optional[int] = None,
+                          on_line: Optional[Callable[[str, str], None]] = None) -> subprocess.CompletedProcess:
+    """Run command, calling on_line(stream, line) for each line as it arrives.
+
+    Returns a CompletedProcess with the tail of stdout/stderr (see
+    StreamingCommand); returncode is 124 on timeout or hang.
+    """
+    proc = StreamingCommand(cmd, cwd=cwd, timeout=timeout, env=env, idle_timeout=idle_timeout)
+    for stream, line in proc:
+        if on_line:
+            on_line(stream, line)
+    return proc.result
 
 
 def run_kubectl(args: List[str], namespace: Optional[str] = None, output_json: bool = False) -> Any:
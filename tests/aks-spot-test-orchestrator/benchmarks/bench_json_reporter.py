@@ -0,0 +1,113 @@
+"""Benchmark json_reporter on a synthetic report.
+
+Compares the previous encoder (dataclasses.asdict + recursive datetime
+conversion + json.dump) with the streaming encoder in each mode. Reports
+wall time, then peak traced memory from a second, traced run (tracemalloc
+slows encoding down several times, so it is kept out of the timing), and
+file size. --no-memory skips the traced run.
+
+    python benchmarks/bench_json_reporter.py              # 100k results
+    python benchmarks/bench_json_reporter.py --results 20000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aks_spot_test.models import ClusterSnapshot, RemediationAction, TestReport, TestResult  # noqa: E402
+from aks_spot_test.reporters import json_reporter  # noqa: E402
+
+
+def synthetic_report(results: int, seed: int = 42) -> TestReport:
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1, 12, 0, 0)
+    report = TestReport(cluster_name="aks-spot-bench", timestamp=start, duration_seconds=3600)
+    for i in range(results):
+        status = rng.choices(["PASS", "FAIL", "SKIP"], weights=[90, 7, 3])[0]
+        report.test_results.append(TestResult(
+            test_id=f"{rng.choice(['BASH', 'PY', 'TT'])}-{i:06d}",
+            name=f"synthetic test {i}",
+            category=f"{i % 10:02d}-category",
+            framework=rng.choice(["bash", "python", "terratest"]),
+            status=status,
+            duration_seconds=rng.random() * 30,
+            error_message="assertion failed: expected 3 spot nodes, got 2\nat step 4" if status == "FAIL" else None,
+            assertions=[{"name": "nodes_ready", "passed": status != "FAIL", "checked_at": start.isoformat()}],
+            evidence={"nodes": [f"aks-spot-{n}" for n in range(rng.randint(0, 5))],
+                      "pods": {"pending": rng.randint(0, 3), "running": rng.randint(0, 50)}},
+            reproduce_commands=[f"kubectl get pods -n test-{i % 50}"]
+        ))
+    for i in range(200):
+        report.remediation_actions.append(RemediationAction(
+            timestamp=start + timedelta(seconds=i), action_type="delete_stuck_node",
+            target=f"aks-spot-{i}", success=True, details="Node NotReady for 6.0 minutes",
+            duration_seconds=1.2, attempts=1))
+    report.initial_state = ClusterSnapshot(start, 40, 40, 30, 900, 0, {"spotpool1": 30, "system": 10})
+    report.final_state = ClusterSnapshot(start + timedelta(hours=1), 38, 37, 28, 880, 4,
+                                         {"spotpool1": 28, "system": 10})
+    report.calculate_summary()
+    return report
+
+
+def legacy_generate_report(report: TestReport, output_path: str):
+    """The encoder json_reporter used before streaming."""
+    report_dict = asdict(report)
+
+    def convert_datetime(obj):
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        elif isinstance(obj, dict):
+            return {k: convert_datetime(v) for k, v in obj.items()}
+        elif isinstance(obj, list):
+            return [convert_datetime(item) for item in obj]
+        return obj
+
+    report_dict = convert_datetime(report_dict)
+    with open(output_path, 'w') as f:
+        json.dump(report_dict, f, indent=2)
+
+
+def measure(label: str, fn, report: TestReport, path: str, memory: bool):
+    started = time.perf_counter()
+    fn(report, path)
+    elapsed = time.perf_counter() - started
+    peak_text = "-"
+    if memory:
+        tracemalloc.start()
+        fn(report, path)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_text = f"{peak / 2**20:.1f} MiB"
+    print(f"{label:<18} {elapsed:8.2f}s {peak_text:>14} {os.path.getsize(path) / 2**20:10.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--results", type=int, default=100_000, help="Synthetic test results in the report")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the traced peak-memory run")
+    args = parser.parse_args()
+
+    print(f"Building synthetic report with {args.results} results...")
+    report = synthetic_report(args.results)
+
+    print(f"\n{'encoder':<18} {'time':>9} {'peak mem':>14} {'file size':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        measure("legacy (asdict)", legacy_generate_report, report, os.path.join(tmp, "legacy.json"),
+                not args.no_memory)
+        for mode in json_reporter.MODES:
+            measure(f"streaming {mode}",
+                    lambda r, p, mode=mode: json_reporter.generate_report(r, p, mode=mode),
+                    report, os.path.join(tmp, f"{mode}.json"), not args.no_memory)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,10 @@ setup(
         "click>=8.0.0",
         "pyyaml>=6.0",
     ],
+    extras_require={
+        # Event-driven result ingestion for the bash suite (polls otherwise)
+        "inotify": ["inotify_simple>=1.3"],
+    },
     entry_points={
         "console_scripts": [
             "aks-spot-test=aks_spot_test.cli:cli",
@@ -18,11 +18,12 @@ from lib.result_writer import ResultWriter
 def test_dist_001(config: TestConfig, writer: ResultWriter):
     """Stateless services run on spot nodes."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("DIST-001", "Stateless services on spot nodes", "pod-distribution")
 
     results = {}
+    node_index = nodes.index()
     for svc in config.stateless_services:
         svc_pods = pods.get_service_pods(svc)
         if not svc_pods:
@@ -30,11 +31,8 @@ def test_dist_001(config: TestConfig, writer: ResultWriter):
             continue
         on_spot = 0
         for pod in svc_pods:
-            node_name = pods.get_pod_node(pod)
-            if not node_name:
-                continue
-            node = kube.get_node(node_name)
-            if node and nodes.is_spot(node):
+            node = node_index.get(pods.get_pod_node(pod))
+            if node and nodes.get_role(node) == "spot":
                 on_spot += 1
         results[svc] = {"total": len(svc_pods), "on_spot": on_spot}
         writer.assert_gt(
@@ -52,11 +50,12 @@ test_dist_001.test_id = "DIST-001"
 def test_dist_002(config: TestConfig, writer: ResultWriter):
     """Stateful services NOT on spot nodes."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("DIST-002", "Stateful services off spot nodes", "pod-distribution")
 
     results = {}
+    node_index = nodes.index()
     for svc in config.stateful_services:
         svc_pods = pods.get_service_pods(svc)
         if not svc_pods:
@@ -64,11 +63,8 @@ def test_dist_002(config: TestConfig, writer: ResultWriter):
             continue
         on_spot = 0
         for pod in svc_pods:
-            node_name = pods.get_pod_node(pod)
-            if not node_name:
-                continue
-            node = kube.get_node(node_name)
-            if node and nodes.is_spot(node):
+            node = node_index.get(pods.get_pod_node(pod))
+            if node and nodes.get_role(node) == "spot":
                 on_spot += 1
         results[svc] = {"total": len(svc_pods), "on_spot": on_spot}
         writer.assert_eq(
@@ -86,7 +82,7 @@ test_dist_002.test_id = "DIST-002"
 def test_dist_003(config: TestConfig, writer: ResultWriter):
     """Spot tolerations present on stateless services."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("DIST-003", "Spot tolerations present", "pod-distribution")
 
@@ -126,7 +122,7 @@ test_dist_003.test_id = "DIST-003"
 def test_dist_004(config: TestConfig, writer: ResultWriter):
     """Node affinity preference weight 100 for spot."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("DIST-004", "Node affinity preference weight 100 for spot", "pod-distribution")
 
@@ -166,7 +162,7 @@ test_dist_004.test_id = "DIST-004"
 def test_dist_005(config: TestConfig, writer: ResultWriter):
     """Stateful services have required anti-spot affinity."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("DIST-005", "Stateful anti-spot required affinity", "pod-distribution")
 
@@ -207,7 +203,7 @@ test_dist_005.test_id = "DIST-005"
 def test_dist_006(config: TestConfig, writer: ResultWriter):
     """System pool protected from user workloads."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("DIST-006", "System pool protected from user workloads", "pod-distribution")
 
@@ -247,7 +243,7 @@ test_dist_006.test_id = "DIST-006"
 def test_dist_007(config: TestConfig, writer: ResultWriter):
     """Pods distributed across multiple spot pools."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("DIST-007", "Pod diversity across spot pools", "pod-distribution")
 
@@ -255,15 +251,13 @@ def test_dist_007(config: TestConfig, writer: ResultWriter):
     pool_pod_counts = {}
 
     all_pods = kube.get_pods()
+    node_index = nodes.index()
     for pod in all_pods:
-        node_name = pods.get_pod_node(pod)
-        if not node_name:
-            continue
-        node = kube.get_node(node_name)
+        node = node_index.get(pods.get_pod_node(pod))
         if not node:
             continue
         pool = nodes.get_pool_name(node)
-        if pool in config.spot_pools:
+        if pool in config.spot_pool_set:
             pools_with_pods.add(pool)
             pool_pod_counts[pool] = pool_pod_counts.get(pool, 0) + 1
 
@@ -282,31 +276,41 @@ test_dist_007.test_id = "DIST-007"
 def test_dist_008(config: TestConfig, writer: ResultWriter):
     """Pods spread across at least 2 zones, no zone exceeds 60%."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("DIST-008", "Zone spread distribution", "pod-distribution")
 
     zone_counts = {}
+    zone_ids = set()
     total_pods = 0
+    misplaced = 0
 
     all_pods = kube.get_pods()
+    node_index = nodes.index()
     for pod in all_pods:
         if not pods.is_running(pod):
             continue
-        node_name = pods.get_pod_node(pod)
-        if not node_name:
-            continue
-        node = kube.get_node(node_name)
+        node = node_index.get(pods.get_pod_node(pod))
         if not node:
             continue
         zone = nodes.get_zone(node)
         if zone:
             zone_counts[zone] = zone_counts.get(zone, 0) + 1
             total_pods += 1
+            zone_ids.add(nodes.get_zone_id(node))
+            if not nodes.in_configured_zone(node):
+                misplaced += 1
 
+    # A layout with a single configured zone cannot spread further
+    configured = nodes.configured_zones
+    min_zones = min(2, len(configured)) if configured else 2
     writer.assert_gte(
-        "Pods in at least 2 zones",
-        len(zone_counts), 2
+        f"Pods in at least {min_zones} zones",
+        len(zone_counts), min_zones
+    )
+    writer.assert_eq(
+        "No pods on nodes outside their pool's configured zones",
+        misplaced, 0
     )
 
     if total_pods > 0:
@@ -320,6 +324,8 @@ def test_dist_008(config: TestConfig, writer: ResultWriter):
 
     writer.add_evidence("zone_counts", zone_counts)
     writer.add_evidence("total_pods", total_pods)
+    writer.add_evidence("configured_zones", sorted(configured))
+    writer.add_evidence("empty_configured_zones", sorted(configured - zone_ids))
     writer.finish_test()
 
 
@@ -329,7 +335,7 @@ test_dist_008.test_id = "DIST-008"
 def test_dist_009(config: TestConfig, writer: ResultWriter):
     """Topology spread constraints present with ScheduleAnyway."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("DIST-009", "Topology spread constraints configured", "pod-distribution")
 
@@ -374,7 +380,7 @@ test_dist_009.test_id = "DIST-009"
 def test_dist_010(config: TestConfig, writer: ResultWriter):
     """Spot ratio >= 50% of user workload pods."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("DIST-010", "Spot ratio >= 50% of user workload pods", "pod-distribution")
 
@@ -382,20 +388,18 @@ def test_dist_010(config: TestConfig, writer: ResultWriter):
     spot_pods = 0
 
     all_pods = kube.get_pods()
+    node_index = nodes.index()
     for pod in all_pods:
         if not pods.is_running(pod):
             continue
-        node_name = pods.get_pod_node(pod)
-        if not node_name:
-            continue
-        node = kube.get_node(node_name)
+        node = node_index.get(pods.get_pod_node(pod))
         if not node:
             continue
-        pool = nodes.get_pool_name(node)
-        if pool == config.system_pool:
+        role = nodes.get_role(node)
+        if role == "system":
             continue
         total_user_pods += 1
-        if nodes.is_spot(node):
+        if role == "spot":
             spot_pods += 1
 
     ratio = (spot_pods / total_user_pods * 100) if total_user_pods > 0 else 0
@@ -14,12 +14,13 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from config import TestConfig
 from lib.test_helpers import KubeCommand, NodeHelper, PodHelper, VMSSHelper
 from lib.result_writer import ResultWriter
+from lib.timeline import RecoveryTimeline, drain_and_observe
 
 
 def test_evict_001(config: TestConfig, writer: ResultWriter):
     """Single node drain reschedules pods."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("EVICT-001", "Single node drain reschedules pods", "eviction-behavior")
 
@@ -41,9 +42,16 @@ def test_evict_001(config: TestConfig, writer: ResultWriter):
     writer.add_evidence("target_pool", target_pool)
     writer.add_evidence("pods_on_target_before_drain", pod_names_before)
 
+    timeline = RecoveryTimeline()
     try:
-        drain_ok = nodes.drain(target, timeout=config.drain_timeout)
+        timeline.mark("node_cordoned")
+        # Poll the node during the drain: its pods' deletion times are gone once it returns
+        drain_ok = drain_and_observe(
+            lambda: nodes.drain(target, timeout=config.drain_timeout),
+            lambda: kube.get_pods(field_selector=f"spec.nodeName={target}"),
+            timeline)
         writer.assert_eq("Drain completed successfully", drain_ok, True)
+        timeline.observe_cordon(kube.get_node(target))
 
         # Wait for pods to reschedule
         time.sleep(30)
@@ -55,11 +63,12 @@ def test_evict_001(config: TestConfig, writer: ResultWriter):
 
         # Count how many pods are now on spot nodes (excluding drained node)
         on_other_spot = 0
+        node_index = nodes.index()
         for p in running_after:
             n = pods.get_pod_node(p)
             if n and n != target:
-                node_obj = kube.get_node(n)
-                if node_obj and nodes.is_spot(node_obj):
+                node_obj = node_index.get(n)
+                if node_obj and nodes.get_role(node_obj) == "spot":
                     on_other_spot += 1
 
         writer.assert_gt(
@@ -68,6 +77,10 @@ def test_evict_001(config: TestConfig, writer: ResultWriter):
         )
         writer.add_evidence("running_pods_on_other_spot_after", on_other_spot)
         writer.add_evidence("total_running_after", len(running_after))
+
+        timeline.observe_replacements(all_pods_after, exclude_node=target)
+        for key, value in timeline.phase_durations().items():
+            writer.add_evidence(key, value)
     finally:
         nodes.uncordon(target)
 
@@ -80,7 +93,7 @@ test_evict_001.test_id = "EVICT-001"
 def test_evict_002(config: TestConfig, writer: ResultWriter):
     """Graceful termination period set to 35s on pods."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("EVICT-002", "Graceful termination period configured", "eviction-behavior")
 
@@ -108,7 +121,7 @@ test_evict_002.test_id = "EVICT-002"
 def test_evict_003(config: TestConfig, writer: ResultWriter):
     """PreStop hook configured on stateless service pods."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("EVICT-003", "PreStop hook configured", "eviction-behavior")
 
@@ -146,7 +159,7 @@ test_evict_003.test_id = "EVICT-003"
 def test_evict_004(config: TestConfig, writer: ResultWriter):
     """Multi-node drain from different pools reschedules pods."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("EVICT-004", "Multi-node drain from different pools", "eviction-behavior")
 
@@ -201,7 +214,7 @@ test_evict_004.test_id = "EVICT-004"
 def test_evict_005(config: TestConfig, writer: ResultWriter):
     """Pod eviction respects PDBs."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("EVICT-005", "Pod eviction respects PDBs", "eviction-behavior")
 
@@ -269,7 +282,7 @@ test_evict_005.test_id = "EVICT-005"
 def test_evict_006(config: TestConfig, writer: ResultWriter):
     """Service endpoint removal before termination."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("EVICT-006", "Service endpoint removal before termination", "eviction-behavior")
 
@@ -316,7 +329,7 @@ test_evict_006.test_id = "EVICT-006"
 def test_evict_007(config: TestConfig, writer: ResultWriter):
     """DaemonSet pods survive node drain (--ignore-daemonsets)."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("EVICT-007", "DaemonSet survival during drain", "eviction-behavior")
 
@@ -369,7 +382,7 @@ test_evict_007.test_id = "EVICT-007"
 def test_evict_008(config: TestConfig, writer: ResultWriter):
     """Eviction during deployment rollout."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("EVICT-008", "Eviction during deployment rollout", "eviction-behavior")
 
@@ -432,7 +445,7 @@ test_evict_008.test_id = "EVICT-008"
 def test_evict_009(config: TestConfig, writer: ResultWriter):
     """Empty node drain causes no disruption."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("EVICT-009", "Empty node drain no disruption", "eviction-behavior")
 
@@ -486,7 +499,7 @@ test_evict_009.test_id = "EVICT-009"
 def test_evict_010(config: TestConfig, writer: ResultWriter):
     """Simultaneous multi-pool drain (1 node from each of 3 pools)."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("EVICT-010", "Simultaneous multi-pool drain", "eviction-behavior")
 
@@ -124,7 +124,7 @@ test_pdb_003.test_id = "PDB-003"
 def test_pdb_004(config: TestConfig, writer: ResultWriter):
     """PDB blocks drain when service is at minimum replicas."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("PDB-004", "PDB blocks drain when at minimum replicas", "pdb-enforcement")
 
@@ -136,10 +136,11 @@ def test_pdb_004(config: TestConfig, writer: ResultWriter):
         running = [p for p in svc_pods if pods.is_running(p)]
         if len(running) < 2:
             continue
+        node_index = nodes.index()
         for p in running:
             node_name = pods.get_pod_node(p)
-            node = kube.get_node(node_name) if node_name else None
-            if node and nodes.is_spot(node):
+            node = node_index.get(node_name) if node_name else None
+            if node and nodes.get_role(node) == "spot":
                 target_svc = svc
                 target_node = node_name
                 break
@@ -209,21 +210,22 @@ test_pdb_004.test_id = "PDB-004"
 def test_pdb_005(config: TestConfig, writer: ResultWriter):
     """PDB allows drain with sufficient headroom."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("PDB-005", "PDB allows drain with headroom", "pdb-enforcement")
 
     # Find a service with >=2 running replicas on spot
     target_svc = None
     target_node = None
+    node_index = nodes.index()
     for svc in config.pdb_services:
         running = pods.count_running_for_service(svc)
         if running >= 2:
             svc_pods = pods.get_service_pods(svc)
             for p in svc_pods:
                 node_name = pods.get_pod_node(p)
-                node = kube.get_node(node_name) if node_name else None
-                if node and nodes.is_spot(node):
+                node = node_index.get(node_name) if node_name else None
+                if node and nodes.get_role(node) == "spot":
                     target_svc = svc
                     target_node = node_name
                     break
@@ -262,7 +264,7 @@ test_pdb_005.test_id = "PDB-005"
 def test_pdb_006(config: TestConfig, writer: ResultWriter):
     """PDB label selectors match actual pod labels."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("PDB-006", "PDB selector matches pods", "pdb-enforcement")
 
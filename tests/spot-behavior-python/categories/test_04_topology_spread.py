@@ -18,7 +18,7 @@ from lib.result_writer import ResultWriter
 def test_topo_001(config: TestConfig, writer: ResultWriter):
     """Zone spread constraint present - 3 TSCs on stateless pods."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("TOPO-001", "Zone spread constraint present (3 TSCs)", "topology-spread")
 
@@ -67,7 +67,7 @@ test_topo_001.test_id = "TOPO-001"
 def test_topo_002(config: TestConfig, writer: ResultWriter):
     """Zone maxSkew=1 enforced."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("TOPO-002", "Zone maxSkew=1 enforced", "topology-spread")
 
@@ -102,7 +102,7 @@ test_topo_002.test_id = "TOPO-002"
 def test_topo_003(config: TestConfig, writer: ResultWriter):
     """Priority type spread maxSkew=2."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("TOPO-003", "Priority type spread maxSkew=2", "topology-spread")
 
@@ -137,7 +137,7 @@ test_topo_003.test_id = "TOPO-003"
 def test_topo_004(config: TestConfig, writer: ResultWriter):
     """Hostname spread maxSkew=1."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("TOPO-004", "Hostname spread maxSkew=1", "topology-spread")
 
@@ -172,7 +172,7 @@ test_topo_004.test_id = "TOPO-004"
 def test_topo_005(config: TestConfig, writer: ResultWriter):
     """Spread approximately maintained after disruption."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("TOPO-005", "Spread after disruption", "topology-spread")
 
@@ -203,16 +203,22 @@ def test_topo_005(config: TestConfig, writer: ResultWriter):
         svc_pods = pods.get_service_pods(svc)
         running = [p for p in svc_pods if pods.is_running(p)]
         zone_counts = {}
+        zone_ids = set()
+        node_index = nodes.index()
         for p in running:
             node_name = pods.get_pod_node(p)
             if node_name:
-                node = kube.get_node(node_name)
+                node = node_index.get(node_name)
                 if node:
                     z = nodes.get_zone(node)
                     if z:
                         zone_counts[z] = zone_counts.get(z, 0) + 1
+                        zone_ids.add(nodes.get_zone_id(node))
 
         writer.add_evidence("post_drain_zone_counts", zone_counts)
+        # Zones that have a pool but lost all of this service's pods
+        writer.add_evidence("post_drain_empty_zones",
+                            sorted(nodes.configured_zones - zone_ids))
 
         if len(zone_counts) > 0 and sum(zone_counts.values()) > 0:
             total = sum(zone_counts.values())
@@ -14,12 +14,13 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from config import TestConfig
 from lib.test_helpers import KubeCommand, NodeHelper, PodHelper, VMSSHelper
 from lib.result_writer import ResultWriter
+from lib.timeline import RecoveryTimeline, drain_and_observe
 
 
 def test_recv_001(config: TestConfig, writer: ResultWriter):
     """Pod reschedule time after spot node drain."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("RECV-001", "Pod reschedule time measurement", "recovery-rescheduling")
 
@@ -44,9 +45,16 @@ def test_recv_001(config: TestConfig, writer: ResultWriter):
     writer.add_evidence("pods_on_target", pod_count_before)
     writer.add_evidence("total_running_before", total_running_before)
 
+    timeline = RecoveryTimeline()
     try:
         start_time = time.time()
-        nodes.drain(target, timeout=config.drain_timeout)
+        timeline.mark("node_cordoned", start_time)
+        # Poll the node during the drain: its pods' deletion times are gone once it returns
+        drain_and_observe(
+            lambda: nodes.drain(target, timeout=config.drain_timeout),
+            lambda: kube.get_pods(field_selector=f"spec.nodeName={target}"),
+            timeline)
+        timeline.observe_cordon(kube.get_node(target))
 
         # Poll until all pods are Running again (up to pod_ready_timeout)
         recovered = False
@@ -54,12 +62,20 @@ def test_recv_001(config: TestConfig, writer: ResultWriter):
         while elapsed < config.pod_ready_timeout:
             time.sleep(5)
             elapsed = time.time() - start_time
-            current_running = len([p for p in kube.get_pods() if pods.is_running(p)])
+            current_pods = kube.get_pods()
+            current_running = len([p for p in current_pods if pods.is_running(p)])
             if current_running >= total_running_before:
                 recovered = True
                 break
 
-        reschedule_time = round(elapsed, 1)
+        # Exact phase durations from the replacement pods' own timestamps
+        timeline.observe_replacements(kube.get_pods(), exclude_node=target)
+        phases = timeline.phase_durations()
+        for key, value in phases.items():
+            writer.add_evidence(key, value)
+        writer.add_evidence("recovery_timeline", timeline.to_evidence())
+
+        reschedule_time = phases.get("eviction_to_ready_seconds", round(elapsed, 1))
         writer.add_evidence("reschedule_time_seconds", reschedule_time)
         writer.add_evidence("recovered", recovered)
 
@@ -80,7 +96,7 @@ test_recv_001.test_id = "RECV-001"
 def test_recv_002(config: TestConfig, writer: ResultWriter):
     """Service continuity - running replicas never drop below PDB minAvailable."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("RECV-002", "Service continuity during drain", "recovery-rescheduling")
 
@@ -96,10 +112,11 @@ def test_recv_002(config: TestConfig, writer: ResultWriter):
         running = pods.count_running_for_service(svc)
         if running >= 2:
             svc_pods = pods.get_service_pods(svc)
+            node_index = nodes.index()
             for p in svc_pods:
                 n = pods.get_pod_node(p)
-                node = kube.get_node(n) if n else None
-                if node and nodes.is_spot(node):
+                node = node_index.get(n) if n else None
+                if node and nodes.get_role(node) == "spot":
                     target_svc = svc
                     target_node = n
                     break
@@ -155,7 +172,7 @@ test_recv_002.test_id = "RECV-002"
 def test_recv_003(config: TestConfig, writer: ResultWriter):
     """Replacement pods prefer spot pools after drain."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("RECV-003", "Replacement pool selection prefers spot", "recovery-rescheduling")
 
@@ -178,6 +195,7 @@ def test_recv_003(config: TestConfig, writer: ResultWriter):
 
         # Check where new pods landed
         new_pods = kube.get_pods()
+        node_index = nodes.index()
         on_spot = 0
         on_standard = 0
         for p in new_pods:
@@ -186,13 +204,13 @@ def test_recv_003(config: TestConfig, writer: ResultWriter):
             n = pods.get_pod_node(p)
             if not n or n == target:
                 continue
-            node = kube.get_node(n)
+            node = node_index.get(n)
             if not node:
                 continue
-            pool = nodes.get_pool_name(node)
-            if pool in config.spot_pools:
+            role = nodes.get_role(node)
+            if role == "spot":
                 on_spot += 1
-            elif pool == config.standard_pool:
+            elif role == "standard":
                 on_standard += 1
 
         total = on_spot + on_standard
@@ -218,7 +236,7 @@ test_recv_003.test_id = "RECV-003"
 def test_recv_004(config: TestConfig, writer: ResultWriter):
     """Autoscaler provisions replacement node after drain."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("RECV-004", "Node replacement provisioning", "recovery-rescheduling")
 
@@ -235,17 +253,21 @@ def test_recv_004(config: TestConfig, writer: ResultWriter):
     writer.add_evidence("target_pool", target_pool)
     writer.add_evidence("pre_drain_pool_count", pre_count)
 
+    timeline = RecoveryTimeline()
     try:
+        start_time = time.time()
+        timeline.mark("node_cordoned", start_time)
         nodes.drain(target, timeout=config.drain_timeout)
+        timeline.observe_cordon(kube.get_node(target))
 
-        # Wait for autoscaler to provision replacement (up to node_ready_timeout)
+        # Wait for autoscaler to provision replacement (up to node_ready_timeout).
+        # The poll only decides when to stop waiting; timings come from the
+        # node objects' own timestamps.
         replacement_found = False
-        elapsed = 0
         poll_interval = 15
-        while elapsed < config.node_ready_timeout:
+        pool_nodes = []
+        while time.time() - start_time < config.node_ready_timeout:
             time.sleep(poll_interval)
-            elapsed += poll_interval
-            current_count = nodes.count_ready_in_pool(target_pool)
             # Count should recover (replacement node provisioned)
             # Drained node may still be counted but NotReady
             pool_nodes = nodes.get_pool_nodes(target_pool)
@@ -255,8 +277,14 @@ def test_recv_004(config: TestConfig, writer: ResultWriter):
                 replacement_found = True
                 break
 
+        timeline.observe_new_nodes(pool_nodes)
+        timeline.observe_replacements(kube.get_pods(), exclude_node=target)
+        for key, value in timeline.phase_durations().items():
+            writer.add_evidence(key, value)
+        writer.add_evidence("recovery_timeline", timeline.to_evidence())
+
         writer.add_evidence("replacement_found", replacement_found)
-        writer.add_evidence("wait_time_seconds", elapsed)
+        writer.add_evidence("wait_time_seconds", round(time.time() - start_time, 1))
 
         # This test may not trigger scale-up if other pools absorb the load
         # so we check if the cluster has sufficient capacity overall
@@ -278,7 +306,7 @@ test_recv_004.test_id = "RECV-004"
 def test_recv_005(config: TestConfig, writer: ResultWriter):
     """Multi-service recovery after draining a shared node."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("RECV-005", "Multi-service recovery", "recovery-rescheduling")
 
@@ -357,7 +385,7 @@ test_recv_005.test_id = "RECV-005"
 def test_recv_006(config: TestConfig, writer: ResultWriter):
     """Rapid sequential drains (2 nodes, 30s apart) with full recovery."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("RECV-006", "Rapid sequential drains", "recovery-rescheduling")
 
@@ -16,10 +16,23 @@ from lib.test_helpers import KubeCommand, NodeHelper, PodHelper, VMSSHelper
 from lib.result_writer import ResultWriter
 
 
+def _count_running_on_standard(kube: KubeCommand, nodes: NodeHelper, pods: PodHelper) -> int:
+    """Count running pods whose node belongs to a standard (on-demand) pool."""
+    node_index = nodes.index()
+    count = 0
+    for p in kube.get_pods():
+        if not pods.is_running(p):
+            continue
+        node = node_index.get(pods.get_pod_node(p))
+        if node and nodes.get_role(node) == "standard":
+            count += 1
+    return count
+
+
 def test_stick_001(config: TestConfig, writer: ResultWriter):
     """Fallback to standard pool after spot pool drain."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("STICK-001", "Fallback to standard pool", "sticky-fallback")
 
@@ -36,16 +49,7 @@ def test_stick_001(config: TestConfig, writer: ResultWriter):
     writer.add_evidence("pool_nodes", node_names)
 
     # Count pods on standard before drain
-    pre_std_pods = 0
-    all_pods = kube.get_pods()
-    for p in all_pods:
-        if not pods.is_running(p):
-            continue
-        n = pods.get_pod_node(p)
-        if n:
-            node = kube.get_node(n)
-            if node and nodes.get_pool_name(node) == config.standard_pool:
-                pre_std_pods += 1
+    pre_std_pods = _count_running_on_standard(kube, nodes, pods)
 
     writer.add_evidence("pre_drain_standard_pods", pre_std_pods)
 
@@ -56,16 +60,7 @@ def test_stick_001(config: TestConfig, writer: ResultWriter):
         time.sleep(30)
 
         # Count pods on standard after drain
-        post_std_pods = 0
-        all_pods_after = kube.get_pods()
-        for p in all_pods_after:
-            if not pods.is_running(p):
-                continue
-            n = pods.get_pod_node(p)
-            if n:
-                node = kube.get_node(n)
-                if node and nodes.get_pool_name(node) == config.standard_pool:
-                    post_std_pods += 1
+        post_std_pods = _count_running_on_standard(kube, nodes, pods)
 
         writer.add_evidence("post_drain_standard_pods", post_std_pods)
         writer.assert_gt(
@@ -85,7 +80,7 @@ test_stick_001.test_id = "STICK-001"
 def test_stick_002(config: TestConfig, writer: ResultWriter):
     """Pods stay on standard pool after fallback (sticky behavior)."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("STICK-002", "Pods stay on standard (sticky fallback)", "sticky-fallback")
 
@@ -106,15 +101,7 @@ def test_stick_002(config: TestConfig, writer: ResultWriter):
         time.sleep(15)
 
         # Count pods on standard immediately after drain
-        std_pods_after_drain = 0
-        for p in kube.get_pods():
-            if not pods.is_running(p):
-                continue
-            n = pods.get_pod_node(p)
-            if n:
-                node = kube.get_node(n)
-                if node and nodes.get_pool_name(node) == config.standard_pool:
-                    std_pods_after_drain += 1
+        std_pods_after_drain = _count_running_on_standard(kube, nodes, pods)
 
         writer.add_evidence("std_pods_after_drain", std_pods_after_drain)
 
@@ -125,15 +112,7 @@ def test_stick_002(config: TestConfig, writer: ResultWriter):
         # Wait 60 seconds - pods should NOT move back automatically
         time.sleep(60)
 
-        std_pods_after_wait = 0
-        for p in kube.get_pods():
-            if not pods.is_running(p):
-                continue
-            n = pods.get_pod_node(p)
-            if n:
-                node = kube.get_node(n)
-                if node and nodes.get_pool_name(node) == config.standard_pool:
-                    std_pods_after_wait += 1
+        std_pods_after_wait = _count_running_on_standard(kube, nodes, pods)
 
         writer.add_evidence("std_pods_after_60s_wait", std_pods_after_wait)
 
@@ -293,7 +272,7 @@ test_stick_004.test_id = "STICK-004"
 def test_stick_005(config: TestConfig, writer: ResultWriter):
     """Manual spot return simulation - new pods prefer spot nodes."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("STICK-005", "Manual spot return simulation", "sticky-fallback")
 
@@ -70,7 +70,7 @@ def test_vmss_002(config: TestConfig, writer: ResultWriter):
 
     results = {}
     for pool in config.all_pools:
-        expected_zones = config.pool_zones.get(pool, [])
+        expected_zones = sorted(config.pool_zone_set.get(pool, ()))
         vmss_list = vmss.get_vmss_for_pool(pool)
         if not vmss_list:
             results[pool] = {"error": "VMSS not found", "expected": expected_zones}
@@ -88,7 +88,7 @@ def test_vmss_002(config: TestConfig, writer: ResultWriter):
         }
         writer.assert_eq(
             f"{pool} zones match config",
-            actual_zones, sorted(expected_zones)
+            actual_zones, expected_zones
         )
 
     writer.add_evidence("zone_alignment", results)
@@ -192,19 +192,17 @@ test_vmss_004.test_id = "VMSS-004"
 def test_vmss_005(config: TestConfig, writer: ResultWriter):
     """Node labels match expected values."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     writer.start_test("VMSS-005", "Node labels match expected values", "vmss-node-pool")
 
     results = {}
     # Build expected labels dynamically based on pool type
-    expected_labels = {}
-    for pool in config.all_pools:
-        if pool == config.system_pool:
-            expected_labels[pool] = {"workload-type": "standard", "priority": "system"}
-        elif pool == config.standard_pool:
-            expected_labels[pool] = {"workload-type": "standard", "priority": "on-demand"}
-        elif pool in config.spot_pools:
-            expected_labels[pool] = {"workload-type": "spot", "priority": "spot"}
+    role_labels = {
+        "system": {"workload-type": "standard", "priority": "system"},
+        "standard": {"workload-type": "standard", "priority": "on-demand"},
+        "spot": {"workload-type": "spot", "priority": "spot"},
+    }
+    expected_labels = {pool: role_labels[role] for pool, role in config.pool_role.items()}
 
     for pool, expected in expected_labels.items():
         pool_nodes = nodes.get_pool_nodes(pool)
@@ -229,7 +227,7 @@ def test_vmss_005(config: TestConfig, writer: ResultWriter):
             )
 
         # Check Azure-managed spot label
-        if pool in config.spot_pools:
+        if pool in config.spot_pool_set:
             azure_priority = labels.get("kubernetes.azure.com/scalesetpriority", "")
             writer.assert_eq(
                 f"{pool} azure scalesetpriority=spot",
@@ -246,7 +244,7 @@ test_vmss_005.test_id = "VMSS-005"
 def test_vmss_006(config: TestConfig, writer: ResultWriter):
     """All spot nodes have NoSchedule taint."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     writer.start_test("VMSS-006", "Spot nodes have NoSchedule taint", "vmss-node-pool")
 
     spot_nodes = nodes.get_spot_nodes()
@@ -14,6 +14,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from config import TestConfig
 from lib.test_helpers import KubeCommand, NodeHelper, PodHelper, VMSSHelper
 from lib.result_writer import ResultWriter
+from lib.timeline import RecoveryTimeline
 
 
 def test_auto_001(config: TestConfig, writer: ResultWriter):
@@ -51,7 +52,7 @@ def test_auto_001(config: TestConfig, writer: ResultWriter):
     # Verify memory pools at priority 5 (dynamically from config)
     for pool in config.spot_pools:
         # Check if this pool has priority 5 (memory-optimized pools)
-        if config.pool_priority.get(pool, 10) == 5:
+        if config.pool_tier.get(pool, 10) == 5:
             if pool in priorities_raw:
                 # Check it's associated with priority 5
                 writer.add_evidence(f"{pool}_in_configmap", True)
@@ -123,7 +124,7 @@ test_auto_002.test_id = "AUTO-002"
 def test_auto_003(config: TestConfig, writer: ResultWriter):
     """Scale-up trigger: pending pods cause autoscaler to add a node."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("AUTO-003", "Scale-up trigger on pending pods", "autoscaler")
 
@@ -194,7 +195,27 @@ def test_auto_003(config: TestConfig, writer: ResultWriter):
 
             if current_nodes > pre_nodes or len(running) >= 3:
                 scale_up_detected = True
-                writer.add_evidence("scale_up_time_seconds", (i + 1) * 15)
+                # Measure from the test pods' creation to the first new node
+                # Ready (or, without a scale-up, to the pods being scheduled)
+                # using API timestamps rather than the 15s poll count.
+                timeline = RecoveryTimeline()
+                timeline.observe_replacements(kube.get_pods(label="app=autoscaler-test"))
+                created = [e["pod_created"] for e in timeline.pods.values() if "pod_created" in e]
+                if created:
+                    timeline.mark("disruption_started", min(created))
+                timeline.observe_new_nodes(kube.get_nodes())
+                phases = timeline.phase_durations()
+                scale_up_time = phases.get(
+                    "eviction_to_node_ready_seconds",
+                    phases.get("eviction_to_scheduled_seconds")
+                )
+                # Without API timestamps the poll count is only an upper
+                # bound, so no time is recorded rather than an estimate
+                if scale_up_time is not None:
+                    writer.add_evidence("scale_up_time_seconds", scale_up_time)
+                else:
+                    print(f"[WARN]  No API timestamps for the scale-up; detected within {(i + 1) * 15}s")
+                writer.add_evidence("recovery_timeline", timeline.to_evidence())
                 break
 
         writer.assert_eq(
@@ -216,7 +237,7 @@ test_auto_003.test_id = "AUTO-003"
 def test_auto_004(config: TestConfig, writer: ResultWriter):
     """Scale-down on underutilization (verify setting, not actual scale-down)."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     vmss = VMSSHelper(config.resource_group, config.cluster_name, config.location)
     writer.start_test("AUTO-004", "Scale-down underutilization config", "autoscaler")
 
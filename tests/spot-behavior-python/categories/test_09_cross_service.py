@@ -44,7 +44,7 @@ def _run_connectivity_check(kube: KubeCommand, namespace: str,
 def test_dep_001(config: TestConfig, writer: ResultWriter):
     """Frontend-backend connectivity after spot node eviction."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("DEP-001", "Frontend-backend connectivity after eviction", "cross-service")
 
@@ -114,7 +114,7 @@ test_dep_001.test_id = "DEP-001"
 def test_dep_002(config: TestConfig, writer: ResultWriter):
     """Database connectivity after node drain."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("DEP-002", "Database connectivity after node drain", "cross-service")
 
@@ -177,7 +177,7 @@ test_dep_002.test_id = "DEP-002"
 def test_dep_003(config: TestConfig, writer: ResultWriter):
     """Queue service resilience after spot node drain."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("DEP-003", "Queue service resilience", "cross-service")
 
@@ -250,7 +250,7 @@ test_dep_003.test_id = "DEP-003"
 def test_dep_004(config: TestConfig, writer: ResultWriter):
     """Cart data persistence across spot node eviction via Redis."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("DEP-004", "Cart persistence across eviction", "cross-service")
 
@@ -320,7 +320,7 @@ test_dep_004.test_id = "DEP-004"
 def test_dep_005(config: TestConfig, writer: ResultWriter):
     """Full service mesh health after drain and recovery."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("DEP-005", "Full service mesh health post-recovery", "cross-service")
 
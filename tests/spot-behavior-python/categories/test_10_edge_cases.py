@@ -19,7 +19,7 @@ from lib.result_writer import ResultWriter
 def test_edge_001(config: TestConfig, writer: ResultWriter):
     """All spot nodes cordoned - pending pods trigger standard pool scale-up."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("EDGE-001", "All spot nodes cordoned", "edge-cases")
 
@@ -79,7 +79,7 @@ test_edge_001.test_id = "EDGE-001"
 def test_edge_002(config: TestConfig, writer: ResultWriter):
     """Rapid cordon/uncordon cycling (3 times) on same node."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("EDGE-002", "Rapid cordon/uncordon cycling", "edge-cases")
 
@@ -139,7 +139,7 @@ test_edge_002.test_id = "EDGE-002"
 def test_edge_003(config: TestConfig, writer: ResultWriter):
     """Zero spot capacity - 100% fallback to standard, then recovery."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("EDGE-003", "Zero spot capacity fallback", "edge-cases")
 
@@ -167,20 +167,19 @@ def test_edge_003(config: TestConfig, writer: ResultWriter):
 
         # All workload pods should now be on standard or system nodes
         all_pods_after = kube.get_pods()
+        node_index = nodes.index()
         spot_pod_count = 0
         std_pod_count = 0
         for p in all_pods_after:
             if not pods.is_running(p):
                 continue
-            n = pods.get_pod_node(p)
-            if not n:
-                continue
-            node = kube.get_node(n)
+            node = node_index.get(pods.get_pod_node(p))
             if not node:
                 continue
-            if nodes.is_spot(node):
+            role = nodes.get_role(node)
+            if role == "spot":
                 spot_pod_count += 1
-            elif nodes.get_pool_name(node) == config.standard_pool:
+            elif role == "standard":
                 std_pod_count += 1
 
         writer.assert_eq("Zero pods on spot nodes", spot_pod_count, 0)
@@ -216,7 +215,7 @@ test_edge_003.test_id = "EDGE-003"
 def test_edge_004(config: TestConfig, writer: ResultWriter):
     """PDB respected even when topology constraints are violated."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("EDGE-004", "PDB + topology interaction", "edge-cases")
 
@@ -236,10 +235,11 @@ def test_edge_004(config: TestConfig, writer: ResultWriter):
             pod = running[0]
             tscs = pod.get("spec", {}).get("topologySpreadConstraints", [])
             if tscs:
+                node_index = nodes.index()
                 for p in running:
                     n = pods.get_pod_node(p)
-                    node = kube.get_node(n) if n else None
-                    if node and nodes.is_spot(node):
+                    node = node_index.get(n) if n else None
+                    if node and nodes.get_role(node) == "spot":
                         target_svc = svc
                         target_node = n
                         break
@@ -252,10 +252,11 @@ def test_edge_004(config: TestConfig, writer: ResultWriter):
             running_count = pods.count_running_for_service(svc)
             if running_count >= 2:
                 svc_pods = pods.get_service_pods(svc)
+                node_index = nodes.index()
                 for p in svc_pods:
                     n = pods.get_pod_node(p)
-                    node = kube.get_node(n) if n else None
-                    if node and nodes.is_spot(node):
+                    node = node_index.get(n) if n else None
+                    if node and nodes.get_role(node) == "spot":
                         target_svc = svc
                         target_node = n
                         break
@@ -308,7 +309,7 @@ test_edge_004.test_id = "EDGE-004"
 def test_edge_005(config: TestConfig, writer: ResultWriter):
     """Resource pressure on standard pool when spot is unavailable."""
     kube = KubeCommand(config.namespace)
-    nodes = NodeHelper(kube)
+    nodes = NodeHelper(kube, config)
     pods = PodHelper(kube, nodes)
     writer.start_test("EDGE-005", "Resource pressure on standard pool", "edge-cases")
 
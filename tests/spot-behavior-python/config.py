@@ -12,7 +12,8 @@ Customize via .env file for your specific cluster.
 
 import os
 from dataclasses import dataclass, field
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, Mapping
 
 
 # Default values for known pool names
@@ -156,6 +157,15 @@ class TestConfig:
     pool_min: Dict[str, int] = field(default_factory=dict)
     pool_max: Dict[str, int] = field(default_factory=dict)
 
+    # ── Frozen lookup tables (compiled in _compile_lookups) ──────────
+    # pool -> "system" | "standard" | "spot", pool -> zones, pool -> priority
+    # tier and zone -> pools, so placement checks are dict/set lookups
+    pool_role: Mapping[str, str] = field(default_factory=dict, init=False, repr=False)
+    pool_zone_set: Mapping[str, FrozenSet[str]] = field(default_factory=dict, init=False, repr=False)
+    pool_tier: Mapping[str, int] = field(default_factory=dict, init=False, repr=False)
+    zone_pools: Mapping[str, FrozenSet[str]] = field(default_factory=dict, init=False, repr=False)
+    spot_pool_set: FrozenSet[str] = field(default_factory=frozenset, init=False, repr=False)
+
     # ── Robot-Shop services (customize via .env file) ────────────────
     # Override via: STATELESS_SERVICES="web,cart,catalogue" etc.
     stateless_services: List[str] = field(
@@ -215,6 +225,29 @@ class TestConfig:
         os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
     ))
 
+    # ── Evidence storage (customize via .env file) ───────────────────
+    # Evidence larger than EVIDENCE_INLINE_BYTES is stored once, compressed and
+    # content-addressed, under EVIDENCE_BLOB_DIR (default: <results_dir>/blobs);
+    # lists longer than EVIDENCE_LIST_CAP are sampled.
+    evidence_blob_dir: str = field(
+        default_factory=lambda: os.environ.get("EVIDENCE_BLOB_DIR", "")
+    )
+    evidence_inline_bytes: int = field(
+        default_factory=lambda: int(os.environ.get("EVIDENCE_INLINE_BYTES", "512"))
+    )
+    evidence_list_cap: int = field(
+        default_factory=lambda: int(os.environ.get("EVIDENCE_LIST_CAP", "200"))
+    )
+
+    # ── Cluster discovery cache (used by TestConfig.from_cluster) ────
+    cluster_config_cache: str = field(default_factory=lambda: os.environ.get(
+        "CLUSTER_CONFIG_CACHE",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cluster-config.json")
+    ))
+    cluster_config_ttl: int = field(
+        default_factory=lambda: int(os.environ.get("CLUSTER_CONFIG_TTL", "3600"))
+    )
+
     def __post_init__(self):
         """Build dynamic dictionaries based on actual pool names after initialization."""
         # Collect all pool names (system, standard, and spot pools)
@@ -254,6 +287,62 @@ class TestConfig:
             all_pools, "POOL_MAX", max_defaults, 20
         )
 
+        self._compile_lookups()
+
+    def _compile_lookups(self):
+        """Build the read-only lookup tables from the pool names and dicts."""
+        roles = {self.system_pool: "system", self.standard_pool: "standard"}
+        for pool in self.spot_pools:
+            roles.setdefault(pool, "spot")
+        self.pool_role = MappingProxyType(roles)
+        self.spot_pool_set = frozenset(self.spot_pools)
+        self.pool_zone_set = MappingProxyType(
+            {pool: frozenset(zones) for pool, zones in self.pool_zones.items()}
+        )
+        self.pool_tier = MappingProxyType(dict(self.pool_priority))
+
+        zone_pools: Dict[str, set] = {}
+        for pool, zones in self.pool_zones.items():
+            for zone in zones:
+                zone_pools.setdefault(zone, set()).add(pool)
+        self.zone_pools = MappingProxyType(
+            {zone: frozenset(pools) for zone, pools in zone_pools.items()}
+        )
+
+    @classmethod
+    def from_cluster(cls, refresh: bool = False) -> "TestConfig":
+        """Build a config whose pool layout is discovered from the live cluster.
+
+        Pool names, roles, VM sizes and zones come from node labels and agent
+        pool data, priorities from the priority expander configmap and min/max
+        from the agent pool autoscaler settings. Values the cluster does not
+        report keep their environment/default values. The discovery is cached
+        in CLUSTER_CONFIG_CACHE for CLUSTER_CONFIG_TTL seconds.
+        """
+        from lib.cluster_discovery import discover_cached
+
+        config = cls()
+        layout = discover_cached(
+            config.cluster_name, config.resource_group, config.location,
+            config.cluster_config_cache, config.cluster_config_ttl, refresh
+        )
+        config.apply_layout(layout)
+        return config
+
+    def apply_layout(self, layout: Dict[str, Any]):
+        """Override pool names and per-pool values with a discovered layout."""
+        self.system_pool = layout.get("system_pool", self.system_pool)
+        self.standard_pool = layout.get("standard_pool", self.standard_pool)
+        self.spot_pools = layout.get("spot_pools") or self.spot_pools
+        # Rebuild defaults for the new pool names, then apply what was discovered
+        self.__post_init__()
+        self.pool_vm_size.update(layout.get("pool_vm_size", {}))
+        self.pool_zones.update(layout.get("pool_zones", {}))
+        self.pool_priority.update(layout.get("pool_priority", {}))
+        self.pool_min.update(layout.get("pool_min", {}))
+        self.pool_max.update(layout.get("pool_max", {}))
+        self._compile_lookups()
+
     @property
     def all_services(self) -> List[str]:
         """Return combined list of stateless and stateful services."""
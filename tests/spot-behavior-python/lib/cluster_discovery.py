@@ -0,0 +1,204 @@
+"""Discover node pool layout from the live cluster for TestConfig.from_cluster().
+
+One discovery pass issues three independent reads in parallel:
+
+    nodes              kubectl get nodes (pool, role, zone and SKU labels)
+    priority expander  cluster-autoscaler-priority-expander configmap
+    agent pools        az aks nodepool list (mode, priority, zones, min/max)
+
+Agent pool data covers pools that are scaled to zero; node labels cover
+clusters where az is unavailable. The result is cached on disk per
+kube context/cluster with a TTL, so repeated runs start instantly.
+"""
+
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from lib import tracing
+from lib.test_helpers import KubeCommand, VMSSHelper
+
+PRIORITY_EXPANDER_CONFIGMAP = "cluster-autoscaler-priority-expander"
+
+_PRIORITY_RE = re.compile(r"^(\d+):\s*$")
+_ITEM_RE = re.compile(r"^\s+-\s*(.+?)\s*$")
+
+
+def parse_priorities(text: str) -> Dict[int, List[str]]:
+    """Parse the priority expander's ``priorities`` YAML (priority -> regexes)."""
+    priorities: Dict[int, List[str]] = {}
+    current: Optional[int] = None
+    for line in text.splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        match = _PRIORITY_RE.match(line)
+        if match:
+            current = int(match.group(1))
+            priorities.setdefault(current, [])
+            continue
+        match = _ITEM_RE.match(line)
+        if match and current is not None:
+            priorities[current].append(match.group(1).strip("'\""))
+    return priorities
+
+
+def pool_priority(pool: str, priorities: Dict[int, List[str]]) -> Optional[int]:
+    """Return the highest priority whose patterns match the pool name."""
+    matched = [prio for prio, patterns in priorities.items()
+               if any(re.search(p, pool) for p in patterns)]
+    return max(matched) if matched else None
+
+
+def _zone_suffix(zone: str) -> str:
+    """Map "australiaeast-2" to "2" (the form used in pool_zones)."""
+    return zone.rsplit("-", 1)[-1] if zone else ""
+
+
+def _pools_from_nodes(nodes: List[Dict]) -> Dict[str, Dict[str, Any]]:
+    pools: Dict[str, Dict[str, Any]] = {}
+    for node in nodes:
+        labels = node.get("metadata", {}).get("labels", {})
+        name = labels.get("kubernetes.azure.com/agentpool") or labels.get("agentpool")
+        if not name:
+            continue
+        pool = pools.setdefault(name, {"zones": set()})
+        if labels.get("kubernetes.azure.com/scalesetpriority") == "spot":
+            pool["spot"] = True
+        if labels.get("kubernetes.azure.com/mode") == "system":
+            pool["system"] = True
+        if labels.get("node.kubernetes.io/instance-type"):
+            pool["vm_size"] = labels["node.kubernetes.io/instance-type"]
+        zone = _zone_suffix(labels.get("topology.kubernetes.io/zone", ""))
+        if zone and zone != "0":
+            pool["zones"].add(zone)
+    return pools
+
+
+def _pools_from_agent_pools(agent_pools: List[Dict]) -> Dict[str, Dict[str, Any]]:
+    pools: Dict[str, Dict[str, Any]] = {}
+    for ap in agent_pools:
+        pool: Dict[str, Any] = {
+            "spot": (ap.get("scaleSetPriority") or "").lower() == "spot",
+            "system": (ap.get("mode") or "").lower() == "system",
+            "zones": set(ap.get("availabilityZones") or []),
+        }
+        if ap.get("vmSize"):
+            pool["vm_size"] = ap["vmSize"]
+        if ap.get("enableAutoScaling"):
+            pool["min"], pool["max"] = ap.get("minCount"), ap.get("maxCount")
+        elif ap.get("count") is not None:
+            pool["min"] = pool["max"] = ap["count"]
+        pools[ap["name"]] = pool
+    return pools
+
+
+def build_layout(nodes: List[Dict], priorities: Dict[int, List[str]],
+                 agent_pools: List[Dict]) -> Dict[str, Any]:
+    """Combine the three sources into TestConfig pool fields.
+
+    Agent pool data wins where both sources know a value; node labels fill in
+    the rest.
+    """
+    pools = _pools_from_nodes(nodes)
+    for name, ap in _pools_from_agent_pools(agent_pools).items():
+        pool = pools.setdefault(name, {"zones": set()})
+        zones = ap.pop("zones")
+        pool.update({k: v for k, v in ap.items() if v is not None})
+        if zones:
+            pool["zones"] = zones
+
+    system = sorted(n for n, p in pools.items() if p.get("system"))
+    spot = sorted(n for n, p in pools.items() if p.get("spot"))
+    standard = sorted(n for n, p in pools.items() if not p.get("system") and not p.get("spot"))
+
+    layout: Dict[str, Any] = {
+        "spot_pools": spot,
+        "pool_vm_size": {n: p["vm_size"] for n, p in pools.items() if p.get("vm_size")},
+        "pool_zones": {n: sorted(p["zones"]) for n, p in pools.items() if p["zones"]},
+        "pool_priority": {},
+        "pool_min": {n: p["min"] for n, p in pools.items() if p.get("min") is not None},
+        "pool_max": {n: p["max"] for n, p in pools.items() if p.get("max") is not None},
+    }
+    if system:
+        layout["system_pool"] = system[0]
+    if standard:
+        layout["standard_pool"] = standard[0]
+    for name in pools:
+        prio = pool_priority(name, priorities)
+        if prio is not None:
+            layout["pool_priority"][name] = prio
+    return layout
+
+
+def discover(cluster_name: str, resource_group: str, location: str,
+             kube: Optional[KubeCommand] = None) -> Dict[str, Any]:
+    """Fetch nodes, priorities and agent pools in parallel and build the layout."""
+    kube = kube or KubeCommand()
+    az = VMSSHelper(resource_group, cluster_name, location)
+
+    def fetch_configmap() -> Dict[int, List[str]]:
+        cm = kube.get_configmap(PRIORITY_EXPANDER_CONFIGMAP)
+        return parse_priorities((cm or {}).get("data", {}).get("priorities", ""))
+
+    def fetch_agent_pools() -> List[Dict]:
+        return az.run_az(["aks", "nodepool", "list", "--cluster-name", cluster_name,
+                          "--resource-group", resource_group], timeout=60) or []
+
+    with tracing.span("cluster_discovery", "config", cluster=cluster_name) as attrs:
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            nodes_f = pool.submit(kube.get_nodes)
+            prio_f = pool.submit(fetch_configmap)
+            ap_f = pool.submit(fetch_agent_pools)
+            nodes, priorities, agent_pools = nodes_f.result(), prio_f.result(), ap_f.result()
+        attrs.update(nodes=len(nodes), priorities=len(priorities), agent_pools=len(agent_pools))
+
+    layout = build_layout(nodes, priorities, agent_pools)
+    layout["sources"] = {
+        "nodes": bool(nodes),
+        "priority_expander": bool(priorities),
+        "agent_pools": bool(agent_pools),
+    }
+    return layout
+
+
+def current_context(kube: Optional[KubeCommand] = None) -> str:
+    result = (kube or KubeCommand()).run(["config", "current-context"], timeout=10)
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+def discover_cached(cluster_name: str, resource_group: str, location: str,
+                    cache_path: str, ttl: int, refresh: bool = False) -> Dict[str, Any]:
+    """Return the cached layout for this context/cluster, rediscovering when stale.
+
+    Raises RuntimeError if nothing could be discovered (no nodes and no agent
+    pools), so callers never silently fall back to a wrong layout.
+    """
+    kube = KubeCommand()
+    key = f"{current_context(kube)}/{resource_group}/{cluster_name}"
+
+    cache: Dict[str, Any] = {}
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path) as f:
+                cache = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            cache = {}
+
+    entry = cache.get(key)
+    if entry and not refresh and time.time() - entry.get("discovered_at", 0) < ttl:
+        return entry["layout"]
+
+    layout = discover(cluster_name, resource_group, location, kube)
+    if not layout["sources"]["nodes"] and not layout["sources"]["agent_pools"]:
+        raise RuntimeError(f"Could not discover node pools for {key}")
+
+    cache[key] = {"discovered_at": time.time(), "layout": layout}
+    os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, cache_path)
+    return layout
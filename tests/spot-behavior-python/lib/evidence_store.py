@@ -0,0 +1,143 @@
+"""Content-addressed, compressed storage for large evidence values.
+
+Result files keep small evidence inline. Lists and dicts whose canonical JSON
+exceeds ``inline_limit`` bytes are written once to
+``<blob_dir>/<hh>/<sha256>.json.gz`` and replaced by a reference::
+
+    {"$blob": "sha256:<hex>", "bytes": <uncompressed size>}
+
+Identical values (the same toleration block for every service, every run)
+hash to the same blob, so they are stored once. Lists longer than
+``list_cap`` are sampled down before hashing::
+
+    {"$sampled": <original length>, "items": [...]}
+
+``resolve`` expands references again for readers that need full values.
+
+``prune`` deletes blobs no result or summary refers to any more. Writing a
+blob that already exists refreshes its mtime, and blobs younger than
+PRUNE_GRACE_SECONDS are kept, so a blob a running test has just referenced
+(but not yet written a result file for) is not pruned.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, Set
+
+DEFAULT_INLINE_LIMIT = 512
+DEFAULT_LIST_CAP = 200
+PRUNE_GRACE_SECONDS = 3600
+
+
+class EvidenceStore:
+    """Deduplicating blob store for evidence values."""
+
+    def __init__(self, blob_dir: str, inline_limit: int = DEFAULT_INLINE_LIMIT,
+                 list_cap: int = DEFAULT_LIST_CAP):
+        self.blob_dir = blob_dir
+        self.inline_limit = inline_limit
+        self.list_cap = list_cap
+
+    def compact(self, evidence: Dict[str, Any]) -> Dict[str, Any]:
+        """Return evidence with large values replaced by blob references."""
+        return {key: self._compact_value(value) for key, value in evidence.items()}
+
+    def _compact_value(self, value: Any) -> Any:
+        if not isinstance(value, (list, dict)):
+            return value
+        if isinstance(value, list) and self.list_cap and len(value) > self.list_cap:
+            value = {"$sampled": len(value), "items": _sample(value, self.list_cap)}
+
+        payload = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+        data = payload.encode()
+        if len(data) <= self.inline_limit:
+            return value
+        digest = hashlib.sha256(data).hexdigest()
+        self._write_blob(digest, data)
+        return {"$blob": f"sha256:{digest}", "bytes": len(data)}
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], f"{digest}.json.gz")
+
+    def _write_blob(self, digest: str, data: bytes):
+        path = self._blob_path(digest)
+        if os.path.exists(path):
+            # Mark as recently referenced for prune
+            os.utime(path)
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        # mtime=0 keeps the compressed bytes identical for identical content
+        with open(tmp_path, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+                f.write(data)
+        os.replace(tmp_path, path)
+
+    def load(self, ref: str) -> Any:
+        """Load a blob by its "sha256:<hex>" reference."""
+        digest = ref.split(":", 1)[-1]
+        with gzip.open(self._blob_path(digest), "rt") as f:
+            return json.load(f)
+
+    def resolve(self, value: Any) -> Any:
+        """Recursively expand blob references in an evidence value."""
+        if isinstance(value, dict):
+            if "$blob" in value:
+                return self.resolve(self.load(value["$blob"]))
+            return {k: self.resolve(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(v) for v in value]
+        return value
+
+    def prune(self, referenced: Iterable[str], grace_seconds: int = PRUNE_GRACE_SECONDS) -> int:
+        """Delete blobs whose digest is not in referenced; returns the count removed."""
+        keep = {ref.split(":", 1)[-1] for ref in referenced}
+        cutoff = time.time() - grace_seconds
+        removed = 0
+        if not os.path.isdir(self.blob_dir):
+            return 0
+        for prefix in os.listdir(self.blob_dir):
+            sub_dir = os.path.join(self.blob_dir, prefix)
+            if not os.path.isdir(sub_dir):
+                continue
+            for fname in os.listdir(sub_dir):
+                digest = fname.split(".", 1)[0]
+                path = os.path.join(sub_dir, fname)
+                if digest in keep or not fname.endswith(".json.gz"):
+                    continue
+                try:
+                    if os.path.getmtime(path) > cutoff:
+                        continue
+                    os.remove(path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+            try:
+                os.rmdir(sub_dir)
+            except OSError:
+                pass
+        return removed
+
+
+def blob_refs(value: Any, refs: Set[str]) -> Set[str]:
+    """Add every blob reference found in value to refs and return refs."""
+    if isinstance(value, dict):
+        if "$blob" in value:
+            refs.add(value["$blob"])
+        for v in value.values():
+            blob_refs(v, refs)
+    elif isinstance(value, list):
+        for v in value:
+            blob_refs(v, refs)
+    return refs
+
+
+def _sample(items: list, cap: int) -> list:
+    """Deterministic, evenly spaced sample keeping the first and last items."""
+    if cap <= 1:
+        return items[:cap]
+    step = (len(items) - 1) / (cap - 1)
+    return [items[round(i * step)] for i in range(cap)]
@@ -8,6 +8,9 @@ from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+from lib import tracing
+from lib.evidence_store import DEFAULT_INLINE_LIMIT, DEFAULT_LIST_CAP, EvidenceStore, blob_refs
+
 
 @dataclass
 class Assertion:
@@ -39,9 +42,14 @@ class TestResult:
 class ResultWriter:
     """Manages test lifecycle and writes JSON results."""
 
-    def __init__(self, results_dir: str):
+    def __init__(self, results_dir: str, blob_dir: str = "",
+                 inline_limit: int = DEFAULT_INLINE_LIMIT, list_cap: int = DEFAULT_LIST_CAP):
         self.results_dir = results_dir
         os.makedirs(results_dir, exist_ok=True)
+        # Large evidence goes to a content-addressed store that outlives the
+        # per-run cleanup of results/*.json, so blobs dedupe across runs too
+        self.evidence_store = EvidenceStore(
+            blob_dir or os.path.join(results_dir, "blobs"), inline_limit, list_cap)
         self._current: Optional[TestResult] = None
         self._start_ts: float = 0.0
 
@@ -93,6 +101,11 @@ class ResultWriter:
     def assert_not_empty(self, desc: str, value: Any):
         self.add_assertion(desc, "non-empty", f"{len(str(value))} chars", bool(value))
 
+    @property
+    def last_result(self) -> Optional[TestResult]:
+        """The most recently started test's result (finished once the test returns)."""
+        return self._current
+
     def add_evidence(self, key: str, value: Any):
         self._current.evidence[key] = value
 
@@ -113,13 +126,21 @@ class ResultWriter:
         self._current.end_time = now.isoformat()
         self._current.duration_seconds = round(time.time() - self._start_ts, 1)
 
+        # In-memory evidence keeps full values; the file holds blob references
+        out = self._current.to_dict()
+        out["evidence"] = self.evidence_store.compact(out["evidence"])
         out_path = os.path.join(self.results_dir, f"{self._current.test_id}.json")
         with open(out_path, "w") as f:
-            json.dump(self._current.to_dict(), f, indent=2, default=str)
+            json.dump(out, f, separators=(",", ":"), default=str)
 
         status = self._current.status
         dur = self._current.duration_seconds
         tid = self._current.test_id
+        tracing.emit(tid, "test", self._start_ts, time.time(), {
+            "test_name": self._current.test_name,
+            "category": self._current.category,
+            "status": status,
+        })
         if status == "pass":
             print(f"[INFO]  ✓ {tid} PASSED ({dur}s)")
         elif status == "fail":
@@ -130,20 +151,67 @@ class ResultWriter:
             print(f"[ERROR] ! {tid} ERROR: {self._current.error_message}")
 
 
-def aggregate_results(results_dir: str) -> Dict:
-    """Read all individual result files and produce a summary."""
-    run_id = f"run-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+def load_results(results_dir: str) -> List[Dict]:
+    """Read all individual result files in a results directory."""
     results = []
-    categories: Dict[str, Dict] = {}
-    failed_tests = []
-
     for fname in sorted(os.listdir(results_dir)):
-        if not fname.endswith(".json") or fname.startswith("summary-"):
+        if not fname.endswith(".json") or fname.startswith(("summary-", "trace-", "trials-")):
             continue
         with open(os.path.join(results_dir, fname)) as f:
-            result = json.load(f)
-        results.append(result)
+            results.append(json.load(f))
+    return results
+
+
+def aggregate_results(results_dir: str, prune_blobs: bool = True) -> Dict:
+    """Read all individual result files and produce a summary.
+
+    With prune_blobs, blobs in <results_dir>/blobs that no result or summary
+    file in results_dir refers to are deleted afterwards.
+    """
+    return _write_summary(load_results(results_dir), results_dir, prune_blobs)
+
+
+def merge_results(shard_dirs: Dict[str, str], results_dir: str, prune_blobs: bool = True) -> Dict:
+    """Merge the results of several shards into one summary.
+
+    Args:
+        shard_dirs: Shard name (kube context) -> that shard's results directory
+        results_dir: Directory to write the merged summary to
+        prune_blobs: Prune <results_dir>/blobs as in aggregate_results
+    """
+    results = []
+    for shard, shard_dir in sorted(shard_dirs.items()):
+        if not os.path.isdir(shard_dir):
+            continue
+        for result in load_results(shard_dir):
+            result["shard"] = shard
+            results.append(result)
+    return _write_summary(results, results_dir, prune_blobs)
+
+
+def prune_evidence_blobs(results_dir: str) -> int:
+    """Delete blobs in <results_dir>/blobs not referenced by any JSON file in results_dir."""
+    refs: set = set()
+    for fname in os.listdir(results_dir):
+        if not fname.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(results_dir, fname)) as f:
+                blob_refs(json.load(f), refs)
+        except (OSError, ValueError) as e:
+            # An unreadable file may still reference blobs: keep them all
+            print(f"[WARN]  Not pruning evidence blobs, cannot read {fname}: {e}")
+            return 0
+    return EvidenceStore(os.path.join(results_dir, "blobs")).prune(refs)
+
+
+def _write_summary(results: List[Dict], results_dir: str, prune: bool = False) -> Dict:
+    """Summarise results, write summary-<run_id>.json and print the run summary."""
+    run_id = f"run-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    categories: Dict[str, Dict] = {}
+    failed_tests = []
 
+    for result in results:
         cat = result.get("category", "unknown")
         if cat not in categories:
             categories[cat] = {"name": cat, "total": 0, "passed": 0, "failed": 0, "skipped": 0}
@@ -195,4 +263,8 @@ def aggregate_results(results_dir: str) -> Dict:
             print(f"  ✗ {ft['test_id']}: {ft['error_message']}")
 
     print(f"\nResults saved to: {out_path}")
+    if prune:
+        removed = prune_evidence_blobs(results_dir)
+        if removed:
+            print(f"Pruned {removed} unreferenced evidence blob(s)")
     return summary
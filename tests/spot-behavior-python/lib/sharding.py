@@ -0,0 +1,96 @@
+"""Category sharding by historical duration.
+
+Categories are the unit of distribution: they are packed into n shards with
+the longest-processing-time-first heuristic so each shard gets roughly
+total/n of the historical runtime. Durations are kept in a small JSON file
+that is updated after every run.
+"""
+
+import json
+import os
+from typing import Dict, Iterable, List, Tuple
+
+# Assumed per-test runtime for categories that have never been timed
+DEFAULT_TEST_SECONDS = 60.0
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse "i/n" (1-based) into (index, count)."""
+    try:
+        index_str, count_str = value.split("/", 1)
+        index, count = int(index_str), int(count_str)
+    except ValueError:
+        raise ValueError(f"Invalid shard '{value}', expected i/n (e.g. 2/3)")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{value}', need 1 <= i <= n")
+    return index, count
+
+
+def load_durations(path: str) -> Dict[str, float]:
+    """Load category -> seconds from the history file (empty if missing)."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return {k: float(v) for k, v in data.get("categories", {}).items()}
+
+
+def update_durations(path: str, results: Iterable[Dict]):
+    """Record the per-category runtime of a finished run.
+
+    Only categories present in results are updated, so partial and sharded
+    runs refine the history instead of replacing it.
+    """
+    totals: Dict[str, float] = {}
+    for result in results:
+        cat = result.get("category", "")
+        if cat:
+            totals[cat] = totals.get(cat, 0.0) + float(result.get("duration_seconds", 0.0) or 0.0)
+    if not totals:
+        return
+
+    durations = load_durations(path)
+    durations.update({k: round(v, 1) for k, v in totals.items()})
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"categories": durations}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def partition(weights: Dict[str, float], count: int) -> List[List[str]]:
+    """Split keys into count bins with roughly equal total weight (LPT)."""
+    bins: List[List[str]] = [[] for _ in range(count)]
+    loads = [0.0] * count
+    for key in sorted(weights, key=lambda k: (-weights[k], k)):
+        target = min(range(count), key=lambda i: (loads[i], i))
+        bins[target].append(key)
+        loads[target] += weights[key]
+    return bins
+
+
+def category_weights(tests: List[Tuple], durations: Dict[str, float]) -> Dict[str, float]:
+    """Weight each category in a discovered test list by its historical runtime."""
+    counts: Dict[str, int] = {}
+    for cat_key, *_ in tests:
+        counts[cat_key] = counts.get(cat_key, 0) + 1
+    return {
+        cat: durations.get(_category_name(cat), n * DEFAULT_TEST_SECONDS)
+        for cat, n in counts.items()
+    }
+
+
+def select_shard(tests: List[Tuple], index: int, count: int,
+                 durations: Dict[str, float]) -> List[Tuple]:
+    """Return the tests belonging to shard index (1-based) of count."""
+    bins = partition(category_weights(tests, durations), count)
+    selected = set(bins[index - 1])
+    return [t for t in tests if t[0] in selected]
+
+
+def _category_name(cat_key: str) -> str:
+    """Map "05-recovery-rescheduling" to the result category "recovery-rescheduling"."""
+    prefix, _, rest = cat_key.partition("-")
+    return rest if prefix.isdigit() else cat_key
@@ -3,7 +3,9 @@
 import json
 import subprocess
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, Iterator, List, Mapping, Optional, Tuple
+
+from lib import tracing
 
 
 class KubeCommand:
@@ -14,7 +16,11 @@ class KubeCommand:
 
     def run(self, args: List[str], timeout: int = 30) -> subprocess.CompletedProcess:
         cmd = ["kubectl"] + args
-        return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        with tracing.span(f"kubectl {args[0] if args else ''}", "kubectl",
+                          args=" ".join(args)) as attrs:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+            attrs["returncode"] = result.returncode
+        return result
 
     def run_json(self, args: List[str], timeout: int = 30) -> Any:
         result = self.run(args + ["-o", "json"], timeout=timeout)
@@ -56,18 +62,66 @@ class KubeCommand:
 
 
 class NodeHelper:
-    """Node inspection and manipulation."""
+    """Node inspection and manipulation.
+
+    With a TestConfig, pool roles come from its precompiled ``pool_role``
+    table; pools it does not know (and helpers built without a config) fall
+    back to the node's Azure priority/mode labels. Zone placement is checked
+    against its ``zone_pools`` table.
+    """
 
-    def __init__(self, kube: KubeCommand):
+    def __init__(self, kube: KubeCommand, config: Any = None):
         self.kube = kube
+        self.pool_role: Mapping[str, str] = config.pool_role if config is not None else {}
+        self.pool_zone_set: Mapping[str, FrozenSet[str]] = (
+            config.pool_zone_set if config is not None else {})
+        self.zone_pools: Mapping[str, FrozenSet[str]] = (
+            config.zone_pools if config is not None else {})
 
     def get_pool_name(self, node: Dict) -> str:
         return node.get("metadata", {}).get("labels", {}).get("agentpool", "")
 
+    def get_role(self, node: Dict) -> str:
+        """Return "system", "standard" or "spot" for a node."""
+        role = self.pool_role.get(self.get_pool_name(node))
+        if role:
+            return role
+        labels = node.get("metadata", {}).get("labels", {})
+        if labels.get("kubernetes.azure.com/scalesetpriority") == "spot":
+            return "spot"
+        if labels.get("kubernetes.azure.com/mode") == "system":
+            return "system"
+        return "standard"
+
+    def index(self, label: str = "") -> Dict[str, Dict]:
+        """Fetch nodes once and index them by name for per-pod lookups."""
+        return {n.get("metadata", {}).get("name", ""): n for n in self.kube.get_nodes(label)}
+
     def get_zone(self, node: Dict) -> str:
         return node.get("metadata", {}).get("labels", {}).get(
             "topology.kubernetes.io/zone", "")
 
+    def get_zone_id(self, node: Dict) -> str:
+        """Zone number as used in pool_zones ("eastus-2" -> "2")."""
+        return self.get_zone(node).rsplit("-", 1)[-1]
+
+    @property
+    def configured_zones(self) -> FrozenSet[str]:
+        """Zones the config places at least one pool in (empty without a config)."""
+        return frozenset(self.zone_pools)
+
+    def in_configured_zone(self, node: Dict) -> bool:
+        """True if the config places the node's pool in the node's zone.
+
+        Nodes are accepted when there is no zone table, or when the pool or
+        zone is not in it (not zonal in the config).
+        """
+        zone = self.get_zone_id(node)
+        pool = self.get_pool_name(node)
+        if not zone or zone not in self.zone_pools or not self.pool_zone_set.get(pool):
+            return True
+        return pool in self.zone_pools[zone]
+
     def is_spot(self, node: Dict) -> bool:
         return node.get("metadata", {}).get("labels", {}).get(
             "kubernetes.azure.com/scalesetpriority") == "spot"
@@ -89,22 +143,28 @@ class NodeHelper:
         return sum(1 for n in nodes if self.is_ready(n))
 
     def drain(self, node_name: str, timeout: int = 60) -> bool:
-        result = self.kube.run([
-            "drain", node_name,
-            "--ignore-daemonsets",
-            "--delete-emptydir-data",
-            f"--grace-period={timeout}",
-            f"--timeout={timeout}s",
-            "--force"
-        ], timeout=timeout + 30)
+        with tracing.span("drain", "node", node=node_name, timeout=timeout) as attrs:
+            result = self.kube.run([
+                "drain", node_name,
+                "--ignore-daemonsets",
+                "--delete-emptydir-data",
+                f"--grace-period={timeout}",
+                f"--timeout={timeout}s",
+                "--force"
+            ], timeout=timeout + 30)
+            attrs["ok"] = result.returncode == 0
         return result.returncode == 0
 
     def cordon(self, node_name: str) -> bool:
-        result = self.kube.run(["cordon", node_name])
+        with tracing.span("cordon", "node", node=node_name) as attrs:
+            result = self.kube.run(["cordon", node_name])
+            attrs["ok"] = result.returncode == 0
         return result.returncode == 0
 
     def uncordon(self, node_name: str) -> bool:
-        result = self.kube.run(["uncordon", node_name])
+        with tracing.span("uncordon", "node", node=node_name) as attrs:
+            result = self.kube.run(["uncordon", node_name])
+            attrs["ok"] = result.returncode == 0
         return result.returncode == 0
 
 
@@ -131,54 +191,42 @@ class PodHelper:
         pods = self.get_service_pods(service)
         return sum(1 for p in pods if self.is_running(p))
 
-    def get_pods_on_spot(self, service: str) -> List[Dict]:
+    def pods_with_nodes(self, service: str) -> Iterator[Tuple[Dict, Dict]]:
+        """Yield (pod, node) for a service's scheduled pods using one node fetch."""
         pods = self.get_service_pods(service)
-        result = []
+        if not pods:
+            return
+        node_index = self.nodes.index()
         for pod in pods:
-            node_name = self.get_pod_node(pod)
-            if not node_name:
-                continue
-            node = self.kube.get_node(node_name)
-            if node and self.nodes.is_spot(node):
-                result.append(pod)
-        return result
+            node = node_index.get(self.get_pod_node(pod))
+            if node:
+                yield pod, node
+
+    def get_pods_on_spot(self, service: str) -> List[Dict]:
+        return [pod for pod, node in self.pods_with_nodes(service)
+                if self.nodes.get_role(node) == "spot"]
 
     def get_pods_on_standard(self, service: str) -> List[Dict]:
-        pods = self.get_service_pods(service)
-        result = []
-        for pod in pods:
-            node_name = self.get_pod_node(pod)
-            if not node_name:
-                continue
-            node = self.kube.get_node(node_name)
-            if node and not self.nodes.is_spot(node):
-                pool = self.nodes.get_pool_name(node)
-                if pool not in ("system",):
-                    result.append(pod)
-        return result
+        return [pod for pod, node in self.pods_with_nodes(service)
+                if self.nodes.get_role(node) == "standard"]
 
     def get_pod_zones(self, service: str) -> List[str]:
-        pods = self.get_service_pods(service)
-        zones = set()
-        for pod in pods:
-            node_name = self.get_pod_node(pod)
-            if node_name:
-                node = self.kube.get_node(node_name)
-                if node:
-                    zone = self.nodes.get_zone(node)
-                    if zone:
-                        zones.add(zone)
+        zones = {self.nodes.get_zone(node) for _, node in self.pods_with_nodes(service)}
+        zones.discard("")
         return sorted(zones)
 
     def wait_for_ready(self, label: str, timeout: int = 120) -> bool:
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            pods = self.kube.get_pods(label=label)
-            not_ready = sum(1 for p in pods if not self.is_running(p))
-            if not_ready == 0 and pods:
-                return True
-            time.sleep(5)
-        return False
+        with tracing.span("wait_for_ready", "wait", label=label, timeout=timeout) as attrs:
+            deadline = time.time() + timeout
+            while time.time() < deadline:
+                pods = self.kube.get_pods(label=label)
+                not_ready = sum(1 for p in pods if not self.is_running(p))
+                if not_ready == 0 and pods:
+                    attrs["ready"] = True
+                    return True
+                time.sleep(5)
+            attrs["ready"] = False
+            return False
 
 
 class VMSSHelper:
@@ -196,7 +244,9 @@ class VMSSHelper:
 
     def run_az(self, args: List[str], timeout: int = 30) -> Any:
         cmd = ["az"] + args + ["-o", "json"]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        with tracing.span(f"az {' '.join(args[:2])}", "az", args=" ".join(args)) as attrs:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+            attrs["returncode"] = result.returncode
         if result.returncode != 0:
             return None
         return json.loads(result.stdout)
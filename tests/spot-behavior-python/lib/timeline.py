@@ -0,0 +1,273 @@
+"""Event timestamps and phase durations for eviction and recovery tests.
+
+Poll loops only tell us *that* something happened between two polls. The API
+server records *when* it happened, so RecoveryTimeline reads the timestamps
+off the objects themselves:
+
+    node_cordoned    managedFields entry written by ``kubectl cordon``/``drain``
+                     (falls back to the local time the drain was issued)
+    pod_deleted      earliest deletionTimestamp of the evicted pods, seen by
+                     polling the node while the drain runs (drain_and_observe),
+                     else the creationTimestamp of the first replacement
+    pod_gone         when the last evicted pod disappeared from the API
+                     (local poll time, so accurate to the poll interval)
+    pod_scheduled    PodScheduled condition lastTransitionTime
+    container_started  containerStatuses[].state.running.startedAt (latest)
+    pod_ready        Ready condition lastTransitionTime
+    node_added       Node creationTimestamp
+    node_ready       Node Ready condition lastTransitionTime
+
+Kubernetes timestamps have one-second resolution, so phase durations are
+accurate to about a second regardless of how often the test polls.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+CORDON_MANAGERS = ("kubectl-cordon", "kubectl-drain", "kubectl")
+
+
+def parse_k8s_time(value: Optional[str]) -> Optional[float]:
+    """Parse an RFC3339 API timestamp into epoch seconds."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _condition_time(obj: Dict, cond_type: str) -> Optional[float]:
+    for cond in obj.get("status", {}).get("conditions", []):
+        if cond.get("type") == cond_type and cond.get("status") == "True":
+            return parse_k8s_time(cond.get("lastTransitionTime"))
+    return None
+
+
+def pod_events(pod: Dict) -> Dict[str, float]:
+    """Return the lifecycle timestamps recorded on a pod."""
+    events = {}
+    created = parse_k8s_time(pod.get("metadata", {}).get("creationTimestamp"))
+    if created is not None:
+        events["pod_created"] = created
+    deleted = parse_k8s_time(pod.get("metadata", {}).get("deletionTimestamp"))
+    if deleted is not None:
+        events["pod_deleted"] = deleted
+    scheduled = _condition_time(pod, "PodScheduled")
+    if scheduled is not None:
+        events["pod_scheduled"] = scheduled
+    started = [
+        parse_k8s_time(cs.get("state", {}).get("running", {}).get("startedAt"))
+        for cs in pod.get("status", {}).get("containerStatuses", [])
+    ]
+    started = [s for s in started if s is not None]
+    if started:
+        events["container_started"] = max(started)
+    ready = _condition_time(pod, "Ready")
+    if ready is not None:
+        events["pod_ready"] = ready
+    return events
+
+
+def node_events(node: Dict) -> Dict[str, float]:
+    """Return the lifecycle timestamps recorded on a node."""
+    events = {}
+    added = parse_k8s_time(node.get("metadata", {}).get("creationTimestamp"))
+    if added is not None:
+        events["node_added"] = added
+    ready = _condition_time(node, "Ready")
+    if ready is not None:
+        events["node_ready"] = ready
+    return events
+
+
+def cordon_time(node: Dict) -> Optional[float]:
+    """Server-side time of the latest cordon, from the node's managedFields."""
+    latest = None
+    for entry in node.get("metadata", {}).get("managedFields", []):
+        if entry.get("manager") not in CORDON_MANAGERS:
+            continue
+        if "f:unschedulable" not in str(entry.get("fieldsV1", {}).get("f:spec", {})):
+            continue
+        ts = parse_k8s_time(entry.get("time"))
+        if ts is not None and (latest is None or ts > latest):
+            latest = ts
+    return latest
+
+
+def drain_and_observe(drain: Callable[[], bool], list_pods: Callable[[], List[Dict]],
+                      timeline: "RecoveryTimeline", interval: float = 2.0) -> bool:
+    """Run drain() while polling the node's pods; return drain()'s result.
+
+    ``kubectl drain`` only returns once the evicted pods are deleted, so their
+    deletionTimestamp has to be read while it runs. list_pods returns the pods
+    on the drained node. Each poll records the deletion times of terminating
+    pods, and which pods of the pre-drain snapshot have disappeared.
+    """
+    before = {p.get("metadata", {}).get("name", "") for p in list_pods()}
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(drain)
+        while True:
+            done = future.done()
+            current = list_pods()
+            timeline.observe_evicted(current)
+            present = {p.get("metadata", {}).get("name", "") for p in current}
+            timeline.observe_gone(sorted(before - present))
+            if done:
+                return future.result()
+            time.sleep(interval)
+
+
+def _median(values: List[float]) -> float:
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[mid]
+    return (ordered[mid - 1] + ordered[mid]) / 2
+
+
+class RecoveryTimeline:
+    """Collects event timestamps for one disruption and derives phase durations."""
+
+    def __init__(self):
+        self.events: Dict[str, float] = {}
+        self.pods: Dict[str, Dict[str, float]] = {}
+        self.nodes: Dict[str, Dict[str, float]] = {}
+        # evicted pod name -> {"pod_deleted", "pod_gone"}
+        self.evicted: Dict[str, Dict[str, float]] = {}
+
+    def mark(self, event: str, ts: Optional[float] = None):
+        """Record a test-side event (first occurrence wins)."""
+        self.events.setdefault(event, ts if ts is not None else time.time())
+
+    def observe_cordon(self, node: Optional[Dict]):
+        """Prefer the API server's cordon time over the local mark."""
+        ts = cordon_time(node) if node else None
+        if ts is not None:
+            self.events["node_cordoned"] = ts
+
+    def observe_evicted(self, pods: List[Dict]):
+        """Record deletion timestamps of evicted pods that are still terminating."""
+        for pod in pods:
+            deleted = pod_events(pod).get("pod_deleted")
+            if deleted is None:
+                continue
+            name = pod.get("metadata", {}).get("name", "")
+            self.evicted.setdefault(name, {}).setdefault("pod_deleted", deleted)
+            self.events["pod_deleted"] = min(deleted, self.events.get("pod_deleted", deleted))
+
+    def observe_gone(self, names: List[str], ts: Optional[float] = None):
+        """Record evicted pods that no longer exist (first sighting wins)."""
+        ts = ts if ts is not None else time.time()
+        for name in names:
+            self.evicted.setdefault(name, {}).setdefault("pod_gone", ts)
+        gone = [e["pod_gone"] for e in self.evicted.values() if "pod_gone" in e]
+        if gone:
+            self.events["pod_gone"] = max(gone)
+
+    def observe_replacements(self, pods: List[Dict], exclude_node: str = ""):
+        """Record replacement pods: created after the eviction started, not on exclude_node."""
+        since = self._anchor()
+        for pod in pods:
+            events = pod_events(pod)
+            created = events.get("pod_created")
+            if created is None or (since is not None and created < since - 1):
+                continue
+            if exclude_node and pod.get("spec", {}).get("nodeName") == exclude_node:
+                continue
+            self.pods[pod.get("metadata", {}).get("name", "")] = events
+        if self.pods and "pod_deleted" not in self.events:
+            # A controller creates the replacement as soon as the old pod is deleted
+            self.events["pod_deleted"] = min(e["pod_created"] for e in self.pods.values())
+
+    def observe_new_nodes(self, nodes: List[Dict]):
+        """Record nodes added after the eviction started."""
+        since = self._anchor()
+        for node in nodes:
+            events = node_events(node)
+            added = events.get("node_added")
+            if added is None or (since is not None and added < since - 1):
+                continue
+            self.nodes[node.get("metadata", {}).get("name", "")] = events
+
+    def _anchor(self) -> Optional[float]:
+        return self.events.get("node_cordoned", self.events.get("disruption_started"))
+
+    def phase_durations(self) -> Dict[str, float]:
+        """Derive phase durations in seconds.
+
+        Pod phases are reported for the slowest replacement (when recovery is
+        complete) with the median alongside as ``*_p50_seconds``.
+        """
+        phases: Dict[str, float] = {}
+        anchor = self._anchor()
+
+        def per_pod(start_key: Optional[str], end_key: str) -> List[float]:
+            values = []
+            for events in self.pods.values():
+                start = anchor if start_key is None else events.get(start_key)
+                end = events.get(end_key)
+                if start is not None and end is not None:
+                    values.append(max(end - start, 0.0))
+            return values
+
+        pairs = {
+            "eviction_to_scheduled": (None, "pod_scheduled"),
+            "scheduled_to_started": ("pod_scheduled", "container_started"),
+            "started_to_ready": ("container_started", "pod_ready"),
+            "scheduled_to_ready": ("pod_scheduled", "pod_ready"),
+            "eviction_to_ready": (None, "pod_ready"),
+        }
+        for name, (start_key, end_key) in pairs.items():
+            values = per_pod(start_key, end_key)
+            if values:
+                phases[f"{name}_seconds"] = round(max(values), 1)
+                phases[f"{name}_p50_seconds"] = round(_median(values), 1)
+
+        if anchor is not None and "pod_deleted" in self.events:
+            phases["cordon_to_pod_deleted_seconds"] = round(
+                max(self.events["pod_deleted"] - anchor, 0.0), 1)
+        terminating = [e["pod_gone"] - e["pod_deleted"] for e in self.evicted.values()
+                       if "pod_gone" in e and "pod_deleted" in e]
+        if terminating:
+            phases["pod_termination_seconds"] = round(max(max(terminating), 0.0), 1)
+
+        added = [e["node_added"] for e in self.nodes.values() if "node_added" in e]
+        if anchor is not None and added:
+            phases["eviction_to_node_added_seconds"] = round(max(min(added) - anchor, 0.0), 1)
+        node_ready = [e["node_ready"] - e["node_added"] for e in self.nodes.values()
+                      if "node_ready" in e and "node_added" in e]
+        if node_ready:
+            phases["node_added_to_ready_seconds"] = round(max(min(node_ready), 0.0), 1)
+        first_ready = [e["node_ready"] for e in self.nodes.values() if "node_ready" in e]
+        if anchor is not None and first_ready:
+            phases["eviction_to_node_ready_seconds"] = round(max(min(first_ready) - anchor, 0.0), 1)
+
+        return phases
+
+    def to_evidence(self) -> Dict:
+        """Timestamps (ISO-8601 UTC) and phase durations for add_evidence."""
+        def iso(ts: float) -> str:
+            return datetime.utcfromtimestamp(ts).isoformat() + "Z"
+
+        # Pod events: when the last replacement got there; node events: the first new node
+        events = dict(self.events)
+        for key in ("pod_scheduled", "container_started", "pod_ready"):
+            values = [e[key] for e in self.pods.values() if key in e]
+            if values:
+                events[key] = max(values)
+        for key in ("node_added", "node_ready"):
+            values = [e[key] for e in self.nodes.values() if key in e]
+            if values:
+                events[key] = min(values)
+
+        return {
+            "events": {k: iso(v) for k, v in sorted(events.items(), key=lambda kv: kv[1])},
+            "evicted_pods": {name: {k: iso(v) for k, v in e.items()}
+                             for name, e in sorted(self.evicted.items())},
+            "replacement_pods": len(self.pods),
+            "new_nodes": sorted(self.nodes),
+            "phases": self.phase_durations(),
+        }
@@ -0,0 +1,92 @@
+"""Span tracing in Chrome trace event format.
+
+Tracing is enabled by setting TRACE_DIR. Each process appends complete ("X")
+events, one JSON object per line, to ``$TRACE_DIR/python-<pid>.trace.jsonl``.
+The orchestrator merges these with the bash, terratest and orchestrator spans
+into a single trace; standalone runs use ``write_chrome_trace`` to produce a
+file that opens in Perfetto or chrome://tracing.
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+_lock = threading.Lock()
+
+
+def trace_dir() -> str:
+    """Return the active trace directory, or "" when tracing is disabled."""
+    return os.environ.get("TRACE_DIR", "")
+
+
+def enabled() -> bool:
+    return bool(trace_dir())
+
+
+def emit(name: str, cat: str, start: float, end: float,
+         args: Optional[Dict[str, Any]] = None, source: str = "python"):
+    """Append one complete event; start/end are epoch seconds."""
+    directory = trace_dir()
+    if not directory:
+        return
+    event = {
+        "name": name,
+        "cat": cat,
+        "ph": "X",
+        "ts": int(start * 1_000_000),
+        "dur": max(int((end - start) * 1_000_000), 0),
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+        "args": args or {},
+    }
+    line = json.dumps(event, default=str) + "\n"
+    path = os.path.join(directory, f"{source}-{os.getpid()}.trace.jsonl")
+    with _lock:
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "a") as f:
+            f.write(line)
+
+
+@contextmanager
+def span(name: str, cat: str = "python", **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """Time the enclosed block and emit it as a span.
+
+    Yields the span's attribute dict so callers can attach results
+    (return codes, counts) before the span closes.
+    """
+    if not enabled():
+        yield attrs
+        return
+    start = time.time()
+    try:
+        yield attrs
+    except BaseException as e:
+        attrs["error"] = repr(e)
+        raise
+    finally:
+        emit(name, cat, start, time.time(), attrs)
+
+
+def write_chrome_trace(directory: str, out_path: str) -> int:
+    """Merge every ``*.trace.jsonl`` in directory into one Chrome trace file.
+
+    Returns the number of events written.
+    """
+    events = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.trace.jsonl"))):
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        events.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+    events.sort(key=lambda e: e.get("ts", 0))
+    with open(out_path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return len(events)
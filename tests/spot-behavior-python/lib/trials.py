@@ -0,0 +1,223 @@
+"""Repeated-trial support: convergence waits, summary statistics and baselines.
+
+A single disruptive run is one sample of a noisy process. ``run_all_tests.py
+--trials N`` runs each selected test N times, waits for the cluster to return
+to its pre-trial baseline in between, and summarises every numeric evidence
+value across trials (p50/p90/p99, mean with a 95% confidence interval).
+Distributions can be stored as a baseline and later runs are compared against
+it with a one-sided Mann-Whitney U test.
+"""
+
+import json
+import math
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from lib.test_helpers import KubeCommand, NodeHelper, PodHelper
+
+# Two-sided 95% Student-t critical values for df = 1..30
+_T95 = [
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+]
+
+# Evidence keys where a larger value is worse (used for regression direction)
+_HIGHER_IS_WORSE = re.compile(r"(_seconds|_time|_ms)$")
+
+
+# ── Convergence ──────────────────────────────────────────────────
+
+def capture_baseline(kube: KubeCommand, config: Any = None) -> Dict[str, int]:
+    """Record the cluster state trials must converge back to."""
+    nodes = NodeHelper(kube, config)
+    pods = PodHelper(kube, nodes)
+    node_list = kube.get_nodes()
+    return {
+        "ready_nodes": sum(1 for n in node_list if nodes.is_ready(n)),
+        "running_pods": sum(1 for p in kube.get_pods() if pods.is_running(p)),
+    }
+
+
+def wait_for_convergence(kube: KubeCommand, baseline: Dict[str, int],
+                         timeout: int, poll_interval: int = 10,
+                         config: Any = None) -> Tuple[bool, float]:
+    """Wait until no node is cordoned and pod/node counts are back to baseline.
+
+    Returns (converged, seconds waited).
+    """
+    nodes = NodeHelper(kube, config)
+    pods = PodHelper(kube, nodes)
+    start = time.time()
+    while True:
+        node_list = kube.get_nodes()
+        cordoned = sum(1 for n in node_list if n.get("spec", {}).get("unschedulable"))
+        ready = sum(1 for n in node_list if nodes.is_ready(n))
+        running = sum(1 for p in kube.get_pods() if pods.is_running(p))
+        if (cordoned == 0 and ready >= baseline["ready_nodes"]
+                and running >= baseline["running_pods"]):
+            return True, round(time.time() - start, 1)
+        if time.time() - start >= timeout:
+            return False, round(time.time() - start, 1)
+        time.sleep(poll_interval)
+
+
+# ── Statistics ───────────────────────────────────────────────────
+
+def numeric_evidence(evidence: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """Flatten numeric evidence values (nested dicts become dotted keys)."""
+    values: Dict[str, float] = {}
+    for key, value in evidence.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, (int, float)):
+            values[name] = float(value)
+        elif isinstance(value, dict):
+            values.update(numeric_evidence(value, f"{name}."))
+    return values
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Linear-interpolated percentile, q in [0, 100]."""
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    pos = (len(ordered) - 1) * q / 100
+    lower = math.floor(pos)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+
+def summarise(values: List[float]) -> Dict[str, float]:
+    """Percentiles plus mean with a 95% confidence interval."""
+    n = len(values)
+    mean = sum(values) / n
+    stdev = math.sqrt(sum((v - mean) ** 2 for v in values) / (n - 1)) if n > 1 else 0.0
+    t = _T95[n - 2] if 2 <= n <= 31 else 1.96
+    margin = t * stdev / math.sqrt(n) if n > 1 else 0.0
+    return {
+        "n": n,
+        "min": round(min(values), 3),
+        "max": round(max(values), 3),
+        "mean": round(mean, 3),
+        "stdev": round(stdev, 3),
+        "ci95_low": round(mean - margin, 3),
+        "ci95_high": round(mean + margin, 3),
+        "p50": round(percentile(values, 50), 3),
+        "p90": round(percentile(values, 90), 3),
+        "p99": round(percentile(values, 99), 3),
+    }
+
+
+def mann_whitney_greater(a: List[float], b: List[float]) -> float:
+    """One-sided p-value that a is stochastically greater than b (normal approx.)."""
+    combined = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    ranks = [0.0] * len(combined)
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        i = j + 1
+    rank_a = sum(r for r, (_, group) in zip(ranks, combined) if group == 0)
+    n_a, n_b = len(a), len(b)
+    u_a = rank_a - n_a * (n_a + 1) / 2
+    sigma = math.sqrt(n_a * n_b * (n_a + n_b + 1) / 12)
+    if sigma == 0:
+        return 1.0
+    z = (u_a - n_a * n_b / 2 - 0.5) / sigma
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare_to_baseline(current: Dict[str, List[float]], baseline: Dict[str, List[float]],
+                        alpha: float = 0.05) -> Dict[str, Dict]:
+    """Flag metrics whose distribution shifted in the worse direction."""
+    comparison = {}
+    for key, values in current.items():
+        base = baseline.get(key)
+        if not base or len(values) < 2 or len(base) < 2:
+            continue
+        higher_is_worse = bool(_HIGHER_IS_WORSE.search(key))
+        worse, better = (values, base) if higher_is_worse else (base, values)
+        p_value = mann_whitney_greater(worse, better)
+        comparison[key] = {
+            "baseline_p50": round(percentile(base, 50), 3),
+            "current_p50": round(percentile(values, 50), 3),
+            "p_value": round(p_value, 4),
+            "regression": p_value < alpha,
+        }
+    return comparison
+
+
+# ── SLOs and baselines ───────────────────────────────────────────
+
+_SLO_RE = re.compile(r"^(?P<key>[\w.]+):p(?P<q>\d{1,2})(?P<op><=|<)(?P<limit>[\d.]+)$")
+
+
+def parse_slo(spec: str) -> Tuple[str, int, str, float]:
+    """Parse "eviction_to_ready_seconds:p90<=60" into its parts."""
+    match = _SLO_RE.match(spec.strip())
+    if not match:
+        raise ValueError(f"Invalid SLO '{spec}', expected KEY:pNN<=VALUE")
+    return match["key"], int(match["q"]), match["op"], float(match["limit"])
+
+
+def check_slo(values: List[float], q: int, op: str, limit: float) -> Tuple[bool, float]:
+    actual = percentile(values, q)
+    return (actual <= limit if op == "<=" else actual < limit), round(actual, 3)
+
+
+def load_baselines(path: str) -> Dict[str, Dict[str, List[float]]]:
+    """Load test_id -> metric -> samples from the baseline file."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, test_id: str, samples: Dict[str, List[float]]):
+    baselines = load_baselines(path)
+    baselines[test_id] = samples
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def build_trial_report(test_id: str, trials: List[Dict],
+                       baseline: Optional[Dict[str, List[float]]] = None,
+                       slos: Optional[List[Tuple[str, int, str, float]]] = None) -> Dict:
+    """Aggregate per-trial records into the trials-<TEST_ID>.json document."""
+    samples: Dict[str, List[float]] = {}
+    for trial in trials:
+        for key, value in trial["metrics"].items():
+            samples.setdefault(key, []).append(value)
+
+    report = {
+        "test_id": test_id,
+        "trials": len(trials),
+        "status_counts": {},
+        "trial_results": trials,
+        "metrics": {key: summarise(values) for key, values in sorted(samples.items())},
+        "samples": samples,
+        "baseline_comparison": compare_to_baseline(samples, baseline) if baseline else {},
+        "slo": [],
+    }
+    for trial in trials:
+        report["status_counts"][trial["status"]] = report["status_counts"].get(trial["status"], 0) + 1
+
+    for key, q, op, limit in slos or []:
+        entry = {"metric": key, "percentile": q, "limit": f"{op}{limit}"}
+        if key not in samples:
+            # Not measured (or a misspelt key): an SLO that was never checked fails
+            entry.update(actual=None, passed=False, missing=True)
+        else:
+            ok, actual = check_slo(samples[key], q, op, limit)
+            entry.update(actual=actual, passed=ok)
+        report["slo"].append(entry)
+    return report
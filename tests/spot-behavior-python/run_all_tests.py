@@ -13,17 +13,41 @@ Usage:
     python run_all_tests.py --category pod-dist      # Run one category
     python run_all_tests.py --test DIST-001          # Run one test
     python run_all_tests.py --dry-run                # List tests without executing
+    python run_all_tests.py --trace                  # Write a Chrome/Perfetto trace
+    python run_all_tests.py --shard 2/3              # Run the 2nd of 3 duration-balanced shards
+    python run_all_tests.py --contexts stg1,stg2     # Spread categories across kube contexts
+    python run_all_tests.py --test RECV-001 --trials 10 --slo eviction_to_ready_seconds:p90<=60
+    python run_all_tests.py --from-cluster           # Discover pool layout from the cluster
 """
 
 import argparse
+import difflib
 import importlib
+import json
 import os
+import shutil
+import subprocess
 import sys
+import tempfile
+from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from config import TestConfig
-from lib.result_writer import ResultWriter, aggregate_results
+from lib import tracing
+from lib.result_writer import ResultWriter, aggregate_results, merge_results
+from lib.sharding import load_durations, parse_shard, select_shard, update_durations
+from lib.test_helpers import KubeCommand
+from lib import trials as trial_stats
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Per-category runtime history used to balance shards (kept outside results/,
+# which is cleared at the start of every run)
+DEFAULT_DURATIONS_FILE = os.path.join(BASE_DIR, ".test-durations.json")
+
+# Stored per-test metric distributions for --trials regression checks
+DEFAULT_BASELINE_FILE = os.path.join(BASE_DIR, ".trial-baselines.json")
 
 # Category module mapping
 CATEGORY_MODULES = {
@@ -65,15 +89,279 @@ def discover_tests(category_filter: str = "", test_filter: str = ""):
     return tests
 
 
+def _load_env_file(path: str) -> dict:
+    """Parse KEY=VALUE lines from an optional per-context .env file."""
+    values = {}
+    if not os.path.exists(path):
+        return values
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                key, value = line.split("=", 1)
+                values[key.strip()] = value.strip()
+    return values
+
+
+def _context_kubeconfig(context: str, directory: str) -> str:
+    """Write a standalone kubeconfig for one context so a shard can't drift to another."""
+    result = subprocess.run(
+        ["kubectl", "config", "view", "--minify", "--flatten", "--context", context],
+        capture_output=True, text=True, timeout=30
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Cannot read kubeconfig for context '{context}': {result.stderr.strip()}")
+    path = os.path.join(directory, f"{context}.kubeconfig")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(result.stdout)
+    return path
+
+
+def run_multi_context(args) -> int:
+    """Run one shard per kube context in parallel and merge the results.
+
+    Each context gets shard i/n of the categories, its own TestConfig (from
+    the environment plus an optional .env.<context> file) and its own results
+    directory under results/shards/<context>.
+    """
+    contexts = [c.strip() for c in args.contexts.split(",") if c.strip()]
+    config = TestConfig()
+    durations = load_durations(args.durations_file)
+
+    if args.dry_run:
+        tests = discover_tests(args.category, args.test)
+        for i, ctx in enumerate(contexts, 1):
+            shard = select_shard(tests, i, len(contexts), durations)
+            cats = sorted({t[0] for t in shard})
+            print(f"[DRY-RUN] {ctx} (shard {i}/{len(contexts)}): {', '.join(cats) or '-'}")
+        return 0
+
+    shards_root = os.path.join(config.results_dir, "shards")
+    shard_dirs = {ctx: os.path.join(shards_root, ctx) for ctx in contexts}
+    kube_dir = tempfile.mkdtemp(prefix="spot-shards-")
+    procs = {}
+    failed_shards = []
+
+    try:
+        # Resolve every context before starting any shard, so a bad context
+        # fails the run before destructive tests are running anywhere
+        kubeconfigs = {ctx: _context_kubeconfig(ctx, kube_dir) for ctx in contexts}
+
+        for i, ctx in enumerate(contexts, 1):
+            os.makedirs(shard_dirs[ctx], exist_ok=True)
+            env = os.environ.copy()
+            env.update(_load_env_file(os.path.join(BASE_DIR, f".env.{ctx}")))
+            env["RESULTS_DIR"] = shard_dirs[ctx]
+            env["KUBECONFIG"] = kubeconfigs[ctx]
+
+            cmd = [sys.executable, os.path.join(BASE_DIR, "run_all_tests.py"),
+                   "--shard", f"{i}/{len(contexts)}",
+                   "--durations-file", args.durations_file,
+                   "--no-record-durations"]
+            if args.category:
+                cmd += ["--category", args.category]
+            if args.test:
+                cmd += ["--test", args.test]
+            if args.trace:
+                cmd += ["--trace"]
+            if args.trials > 1:
+                cmd += ["--trials", str(args.trials), "--baseline-file", args.baseline_file]
+                for spec in args.slo:
+                    cmd += ["--slo", spec]
+            if args.from_cluster:
+                cmd += ["--from-cluster"]
+            if args.refresh_cluster_config:
+                cmd += ["--refresh-cluster-config"]
+
+            log_path = os.path.join(shard_dirs[ctx], "run.log")
+            log = open(log_path, "w")
+            procs[ctx] = (subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT, env=env), log)
+            print(f"Started shard {i}/{len(contexts)} on {ctx} (log: {log_path})")
+
+        for ctx, (proc, log) in procs.items():
+            returncode = proc.wait()
+            if returncode != 0:
+                failed_shards.append(ctx)
+            print(f"Shard on {ctx} finished (exit {returncode})")
+    finally:
+        # On an error or Ctrl+C, stop shards that are still running before
+        # their kubeconfigs are removed
+        for ctx, (proc, log) in procs.items():
+            if proc.poll() is None:
+                print(f"Stopping shard on {ctx}")
+                proc.terminate()
+                try:
+                    proc.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    proc.wait()
+            log.close()
+        shutil.rmtree(kube_dir, ignore_errors=True)
+
+    summary = merge_results(shard_dirs, config.results_dir,
+                            prune_blobs=not config.evidence_blob_dir)
+    if not args.no_record_durations:
+        update_durations(args.durations_file, summary["results"])
+
+    if failed_shards:
+        print(f"\n[WARN] Shards exited with errors: {', '.join(failed_shards)}")
+        return 1
+    return 0
+
+
+def execute_test(config: TestConfig, writer: ResultWriter, test_id: str, func_name: str, func):
+    """Run one test function, containing any exception it raises."""
+    print(f"\n{'═' * 51}")
+    print(f"  Executing: {test_id} ({func_name})")
+    print(f"{'═' * 51}")
+
+    try:
+        func(config, writer)
+    except Exception as e:
+        print(f"[ERROR] {test_id} raised exception: {e}")
+
+
+def run_trials(args, config: TestConfig, writer: ResultWriter, tests):
+    """Run each test args.trials times and write trials-<TEST_ID>.json summaries.
+
+    Between trials the cluster must converge back to the state captured
+    before the first one (no cordoned nodes, ready node and running pod
+    counts restored), so each trial starts from the same baseline.
+    """
+    kube = KubeCommand(config.namespace)
+    baselines = trial_stats.load_baselines(args.baseline_file)
+    slos = [trial_stats.parse_slo(spec) for spec in args.slo]
+    cluster_baseline = trial_stats.capture_baseline(kube, config)
+    print(f"Cluster baseline: {cluster_baseline}")
+    seen_metrics = set()
+
+    for cat_key, test_id, func_name, func in tests:
+        records = []
+        for trial in range(1, args.trials + 1):
+            print(f"\n── {test_id} trial {trial}/{args.trials} ──")
+            execute_test(config, writer, test_id, func_name, func)
+            result = writer.last_result
+            if result is None or result.test_id != test_id:
+                records.append({"trial": trial, "status": "error", "duration_seconds": 0.0,
+                                "metrics": {}})
+            else:
+                records.append({
+                    "trial": trial,
+                    "status": result.status,
+                    "duration_seconds": result.duration_seconds,
+                    "metrics": trial_stats.numeric_evidence(result.evidence),
+                })
+
+            if trial < args.trials:
+                converged, waited = trial_stats.wait_for_convergence(
+                    kube, cluster_baseline, timeout=config.node_ready_timeout, config=config)
+                records[-1]["convergence_wait_seconds"] = waited
+                if not converged:
+                    print(f"[WARN]  Cluster did not converge to baseline after {waited}s")
+                    records[-1]["converged"] = False
+
+        report = trial_stats.build_trial_report(test_id, records, baselines.get(test_id), slos)
+        seen_metrics.update(report["metrics"])
+        out_path = os.path.join(config.results_dir, f"trials-{test_id}.json")
+        with open(out_path, "w") as f:
+            json.dump(report, f, indent=2)
+        _print_trial_report(report)
+
+        if args.save_baseline:
+            trial_stats.save_baseline(args.baseline_file, test_id, report["samples"])
+            print(f"Baseline for {test_id} saved to {args.baseline_file}")
+
+    # A metric no test produced is most likely a typo in --slo
+    for key, q, op, limit in slos:
+        if key not in seen_metrics:
+            close = difflib.get_close_matches(key, seen_metrics, n=1)
+            hint = f" (did you mean {close[0]}?)" if close else ""
+            print(f"[WARN]  SLO metric '{key}' was not in any test's evidence{hint}")
+
+
+def _print_trial_report(report: dict):
+    print(f"\n{'═' * 51}")
+    print(f"  {report['test_id']}: {report['trials']} trials {report['status_counts']}")
+    print(f"{'═' * 51}")
+    for key, stats in report["metrics"].items():
+        flag = ""
+        cmp = report["baseline_comparison"].get(key)
+        if cmp and cmp["regression"]:
+            flag = f"  ⚠ REGRESSION vs baseline p50 {cmp['baseline_p50']} (p={cmp['p_value']})"
+        print(f"  {key}: p50={stats['p50']} p90={stats['p90']} p99={stats['p99']} "
+              f"mean={stats['mean']} [{stats['ci95_low']}, {stats['ci95_high']}]{flag}")
+    for slo in report["slo"]:
+        mark = "✓" if slo["passed"] else "✗"
+        actual = "metric not in evidence" if slo.get("missing") else f"actual {slo['actual']}"
+        print(f"  {mark} SLO {slo['metric']} p{slo['percentile']}{slo['limit']} ({actual})")
+
+
 def main():
     parser = argparse.ArgumentParser(description="AKS Spot Behavior Tests")
     parser.add_argument("--category", default="", help="Filter by category name")
     parser.add_argument("--test", default="", help="Filter by test ID (e.g. DIST-001)")
     parser.add_argument("--dry-run", action="store_true", help="List tests without executing")
+    parser.add_argument("--trace", action="store_true",
+                        help="Record spans and write a Chrome trace (opens in Perfetto)")
+    parser.add_argument("--shard", default="",
+                        help="Run only shard i/n of the categories, balanced by historical duration")
+    parser.add_argument("--contexts", default="",
+                        help="Comma-separated kube contexts; run one shard per context and merge")
+    parser.add_argument("--durations-file",
+                        default=os.environ.get("DURATIONS_FILE", DEFAULT_DURATIONS_FILE),
+                        help="Per-category duration history used for sharding")
+    parser.add_argument("--no-record-durations", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--trials", type=int, default=1,
+                        help="Run each selected test N times and report statistics")
+    parser.add_argument("--baseline-file",
+                        default=os.environ.get("TRIAL_BASELINE_FILE", DEFAULT_BASELINE_FILE),
+                        help="Stored metric distributions to compare trials against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store this run's trial distributions as the new baseline")
+    parser.add_argument("--slo", action="append", default=[],
+                        help="Percentile target checked across trials, e.g. eviction_to_ready_seconds:p90<=60")
+    parser.add_argument("--from-cluster", action="store_true",
+                        default=os.environ.get("CONFIG_FROM_CLUSTER", "") == "1",
+                        help="Discover pools, zones, SKUs, priorities and min/max from the cluster")
+    parser.add_argument("--refresh-cluster-config", action="store_true",
+                        help="Ignore the cached cluster discovery and fetch it again")
     args = parser.parse_args()
 
-    config = TestConfig()
-    writer = ResultWriter(config.results_dir)
+    if args.trials < 1:
+        parser.error("--trials must be >= 1")
+    for spec in args.slo:
+        try:
+            trial_stats.parse_slo(spec)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.contexts:
+        if args.save_baseline:
+            parser.error("--save-baseline cannot be used with --contexts "
+                         "(shards would overwrite the same baseline file)")
+        sys.exit(run_multi_context(args))
+
+    if args.from_cluster and not args.dry_run:
+        try:
+            config = TestConfig.from_cluster(refresh=args.refresh_cluster_config)
+        except RuntimeError as e:
+            print(f"[ERROR] {e}")
+            sys.exit(1)
+        print(f"Pool layout from cluster: system={config.system_pool} "
+              f"standard={config.standard_pool} spot={','.join(config.spot_pools)}")
+    else:
+        config = TestConfig()
+    writer = ResultWriter(config.results_dir, config.evidence_blob_dir,
+                          config.evidence_inline_bytes, config.evidence_list_cap)
+
+    # Standalone tracing: spans go to a per-run directory and are merged at the
+    # end. Under the orchestrator TRACE_DIR is already set and it does the merge.
+    trace_out = ""
+    if args.trace and not args.dry_run and not tracing.enabled():
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        os.environ["TRACE_DIR"] = os.path.join(config.results_dir, f"trace-{stamp}")
+        trace_out = os.path.join(config.results_dir, f"trace-{stamp}.json")
 
     # Clear previous results unless running a single test
     if not args.test and not args.dry_run:
@@ -86,24 +374,38 @@ def main():
         print(f"No tests found (category={args.category}, test={args.test})")
         sys.exit(1)
 
-    print(f"Found {len(tests)} test(s) to execute\n")
-
-    for cat_key, test_id, func_name, func in tests:
-        if args.dry_run:
-            print(f"[DRY-RUN] {test_id} ({cat_key}/{func_name})")
-            continue
+    if args.shard:
+        try:
+            index, count = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+        tests = select_shard(tests, index, count, load_durations(args.durations_file))
+        cats = sorted({t[0] for t in tests})
+        print(f"Shard {index}/{count}: {', '.join(cats) or 'no categories'}")
+        if not tests:
+            # More shards than categories: an empty shard is not an error
+            return
 
-        print(f"\n{'═' * 51}")
-        print(f"  Executing: {test_id} ({func_name})")
-        print(f"{'═' * 51}")
+    print(f"Found {len(tests)} test(s) to execute\n")
 
-        try:
-            func(config, writer)
-        except Exception as e:
-            print(f"[ERROR] {test_id} raised exception: {e}")
+    if args.trials > 1 and not args.dry_run:
+        run_trials(args, config, writer, tests)
+    else:
+        for cat_key, test_id, func_name, func in tests:
+            if args.dry_run:
+                print(f"[DRY-RUN] {test_id} ({cat_key}/{func_name})")
+                continue
+            execute_test(config, writer, test_id, func_name, func)
 
     if not args.dry_run:
-        aggregate_results(config.results_dir)
+        # A custom EVIDENCE_BLOB_DIR may be shared with other results dirs
+        summary = aggregate_results(config.results_dir, prune_blobs=not config.evidence_blob_dir)
+        if not args.no_record_durations:
+            update_durations(args.durations_file, summary["results"])
+
+    if trace_out:
+        count = tracing.write_chrome_trace(tracing.trace_dir(), trace_out)
+        print(f"Trace ({count} spans) saved to: {trace_out}")
 
 
 if __name__ == "__main__":
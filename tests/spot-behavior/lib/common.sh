@@ -14,6 +14,7 @@ _TEST_NAME=""
 _TEST_CATEGORY=""
 _TEST_STATUS="error"
 _TEST_START=""
+_TEST_START_US=""
 _TEST_ASSERTIONS='[]'
 _TEST_EVIDENCE='{}'
 _TEST_ERROR=""
@@ -25,6 +26,33 @@ log_warn()  { echo "[WARN]  $(date +%H:%M:%S) $*" >&2; }
 log_error() { echo "[ERROR] $(date +%H:%M:%S) $*" >&2; }
 log_step()  { echo "  ➤ $*"; }
 
+# ── Tracing (Chrome trace events, enabled when TRACE_DIR is set) ─
+
+_trace_now_us() { date +%s%6N; }
+
+# trace_event <name> <cat> <start_us> <end_us> [key value]...
+trace_event() {
+  [[ -n "${TRACE_DIR:-}" ]] || return 0
+  local name="$1" cat="$2" start_us="$3" end_us="$4"
+  shift 4
+  local args='{}'
+  while [[ $# -ge 2 ]]; do
+    args=$(jq -c --arg k "$1" --arg v "$2" '. + {($k): $v}' <<< "$args")
+    shift 2
+  done
+  mkdir -p "$TRACE_DIR"
+  jq -cn \
+    --arg n "$name" \
+    --arg c "$cat" \
+    --argjson ts "$start_us" \
+    --argjson te "$end_us" \
+    --argjson pid "${TRACE_PID:-$$}" \
+    --argjson tid "$$" \
+    --argjson a "$args" \
+    '{name: $n, cat: $c, ph: "X", ts: $ts, dur: ($te - $ts), pid: $pid, tid: $tid, args: $a}' \
+    >> "${TRACE_DIR}/bash-${TRACE_PID:-$$}.trace.jsonl"
+}
+
 # ── Test lifecycle ───────────────────────────────────────────────
 
 init_test() {
@@ -34,6 +62,7 @@ init_test() {
   _TEST_CATEGORY="$category"
   _TEST_STATUS="error"
   _TEST_START="$(date -u +%Y-%m-%dT%H:%M:%SZ)"
+  _TEST_START_US="$(_trace_now_us)"
   _TEST_ASSERTIONS='[]'
   _TEST_EVIDENCE='{}'
   _TEST_ERROR=""
@@ -108,6 +137,9 @@ finish_test() {
   local outfile="${RESULTS_DIR}/${_TEST_ID}.json"
   echo "$result" | jq . > "$outfile"
 
+  trace_event "$_TEST_ID" "test" "$_TEST_START_US" "$(_trace_now_us)" \
+    test_name "$_TEST_NAME" category "$_TEST_CATEGORY" status "$_TEST_STATUS"
+
   if [[ "$_TEST_STATUS" == "pass" ]]; then
     log_info "✓ ${_TEST_ID} PASSED (${duration}s)"
   elif [[ "$_TEST_STATUS" == "fail" ]]; then
@@ -219,7 +251,11 @@ add_evidence_str() {
 # ── kubectl wrappers ─────────────────────────────────────────────
 
 kubectl_json() {
-  kubectl "$@" -o json 2>/dev/null
+  local t0 rc=0
+  t0=$(_trace_now_us)
+  kubectl "$@" -o json 2>/dev/null || rc=$?
+  trace_event "kubectl ${1:-}" "kubectl" "$t0" "$(_trace_now_us)" args "$*" returncode "$rc"
+  return "$rc"
 }
 
 get_pods_on_node() {
@@ -274,25 +310,35 @@ drain_node() {
   local node="$1"
   log_step "Draining node $node ..."
   _CLEANUP_NODES+=("$node")
+  local t0
+  t0=$(_trace_now_us)
   kubectl drain "$node" \
     --ignore-daemonsets \
     --delete-emptydir-data \
     --grace-period="$DRAIN_TIMEOUT" \
     --timeout="${DRAIN_TIMEOUT}s" \
     --force 2>&1 || true
+  trace_event "drain" "node" "$t0" "$(_trace_now_us)" node "$node"
 }
 
 cordon_node() {
   local node="$1"
   log_step "Cordoning node $node ..."
   _CLEANUP_NODES+=("$node")
-  kubectl cordon "$node" 2>&1
+  local t0 rc=0
+  t0=$(_trace_now_us)
+  kubectl cordon "$node" 2>&1 || rc=$?
+  trace_event "cordon" "node" "$t0" "$(_trace_now_us)" node "$node" returncode "$rc"
+  return "$rc"
 }
 
 uncordon_node() {
   local node="$1"
   log_step "Uncordoning node $node ..."
+  local t0
+  t0=$(_trace_now_us)
   kubectl uncordon "$node" 2>&1 || true
+  trace_event "uncordon" "node" "$t0" "$(_trace_now_us)" node "$node"
 }
 
 # ── Cleanup trap ─────────────────────────────────────────────────
@@ -311,6 +357,8 @@ cleanup_nodes() {
 wait_for_pods_ready() {
   local label="$1" timeout="${2:-$POD_READY_TIMEOUT}"
   log_step "Waiting up to ${timeout}s for pods ($label) to be ready..."
+  local t0
+  t0=$(_trace_now_us)
   local end_time=$(( $(date +%s) + timeout ))
   while (( $(date +%s) < end_time )); do
     local not_ready
@@ -318,35 +366,45 @@ wait_for_pods_ready() {
       | grep -cv "Running\|Completed" || echo 0)
     if [[ "$not_ready" -eq 0 ]]; then
       log_step "All pods ready"
+      trace_event "wait_for_pods_ready" "wait" "$t0" "$(_trace_now_us)" label "$label" ready "true"
       return 0
     fi
     sleep 5
   done
   log_warn "Timeout waiting for pods ($label)"
+  trace_event "wait_for_pods_ready" "wait" "$t0" "$(_trace_now_us)" label "$label" ready "false"
   return 1
 }
 
 wait_for_node_count() {
   local pool="$1" min_count="$2" timeout="${3:-$NODE_READY_TIMEOUT}"
   log_step "Waiting up to ${timeout}s for pool $pool to have >=$min_count ready nodes..."
+  local t0
+  t0=$(_trace_now_us)
   local end_time=$(( $(date +%s) + timeout ))
   while (( $(date +%s) < end_time )); do
     local count
     count=$(count_ready_nodes_in_pool "$pool")
     if (( count >= min_count )); then
       log_step "Pool $pool has $count nodes (>= $min_count)"
+      trace_event "wait_for_node_count" "wait" "$t0" "$(_trace_now_us)" pool "$pool" ready "true"
       return 0
     fi
     sleep 10
   done
   log_warn "Timeout: pool $pool has $(count_ready_nodes_in_pool "$pool") nodes (wanted >= $min_count)"
+  trace_event "wait_for_node_count" "wait" "$t0" "$(_trace_now_us)" pool "$pool" ready "false"
   return 1
 }
 
 # ── az CLI wrappers ──────────────────────────────────────────────
 
 az_json() {
-  az "$@" -o json 2>/dev/null
+  local t0 rc=0
+  t0=$(_trace_now_us)
+  az "$@" -o json 2>/dev/null || rc=$?
+  trace_event "az ${1:-} ${2:-}" "az" "$t0" "$(_trace_now_us)" args "$*" returncode "$rc"
+  return "$rc"
 }
 
 get_vmss_for_pool() {
@@ -14,23 +14,40 @@
 #   ./run-all-tests.sh --test DIST-001          # Run one test
 #   ./run-all-tests.sh --dry-run                # List tests without executing
 #   ./run-all-tests.sh --category eviction --dry-run
+#   ./run-all-tests.sh --category 01-pod-distribution --no-clean --no-aggregate
+#                                               # One unit of a parallel run
+#   ./run-all-tests.sh --aggregate-only         # Summarise existing results
 
 set -euo pipefail
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 source "${SCRIPT_DIR}/lib/test_runner.sh"
 
+# Group every test script's spans under this run's process in the trace
+export TRACE_PID="${TRACE_PID:-$$}"
+
 CATEGORY=""
 TEST=""
 DRY_RUN="false"
+CLEAN="true"
+AGGREGATE="true"
+AGGREGATE_ONLY="false"
 
 while [[ $# -gt 0 ]]; do
   case "$1" in
     --category) CATEGORY="$2"; shift 2 ;;
     --test)     TEST="$2"; shift 2 ;;
     --dry-run)  DRY_RUN="true"; shift ;;
+    --no-clean) CLEAN="false"; shift ;;
+    --no-aggregate)   AGGREGATE="false"; shift ;;
+    --aggregate-only) AGGREGATE_ONLY="true"; shift ;;
     -h|--help)
       echo "Usage: $0 [--category <name>] [--test <TEST-ID>] [--dry-run]"
+      echo "          [--no-clean] [--no-aggregate] [--aggregate-only]"
+      echo ""
+      echo "  --no-clean        Keep existing results/*.json"
+      echo "  --no-aggregate    Don't write the run summary (for concurrent category runs)"
+      echo "  --aggregate-only  Only write the run summary from existing results"
       echo ""
       echo "Categories:"
       echo "  01-pod-distribution    DIST-001..010  (read-only)"
@@ -49,8 +66,13 @@ while [[ $# -gt 0 ]]; do
   esac
 done
 
+if [[ "$AGGREGATE_ONLY" == "true" ]]; then
+  aggregate_results
+  exit 0
+fi
+
 # Clear previous results (unless running a single test)
-if [[ -z "$TEST" && "$DRY_RUN" == "false" ]]; then
+if [[ -z "$TEST" && "$DRY_RUN" == "false" && "$CLEAN" == "true" ]]; then
   rm -f "${RESULTS_DIR}"/*.json 2>/dev/null || true
 fi
 
@@ -70,6 +92,6 @@ for script in "${TESTS[@]}"; do
 done
 
 # Aggregate if we actually ran tests
-if [[ "$DRY_RUN" == "false" ]]; then
+if [[ "$DRY_RUN" == "false" && "$AGGREGATE" == "true" ]]; then
   aggregate_results
 fi